@@ -5,7 +5,10 @@ import os
 import logging
 import requests
 from datetime import datetime, timedelta
+from api_clients.records import Repo
 from utils.cache import cache_response
+from utils import http
+from utils.pagination import paginate
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +17,15 @@ class GitHubClient:
     
     BASE_URL = "https://api.github.com"
     
+    # Repositories sampled for language statistics by default. Each 100 cost
+    # one search request, and the search API allows 10 requests per minute
+    # without a token (30 with one), so unauthenticated sampling leaves most
+    # of the budget for the other searches of a report
+    LANGUAGE_SAMPLE_SIZE = 200
+    AUTHENTICATED_LANGUAGE_SAMPLE_SIZE = 1000
+    
     def __init__(self):
+        self.BASE_URL = http.base_url("github", self.BASE_URL)
         self.api_key = os.getenv("GITHUB_API_KEY", "")
         self.headers = {}
         if self.api_key:
@@ -54,7 +65,7 @@ class GitHubClient:
             query_params["q"] += f" language:{language}"
         
         try:
-            response = requests.get(
+            response = http.get(
                 f"{self.BASE_URL}/search/repositories", 
                 params=query_params,
                 headers=self.headers,
@@ -64,66 +75,110 @@ class GitHubClient:
             data = response.json()
             
             # Extract relevant information
-            repositories = []
-            for repo in data["items"][:limit]:
-                repositories.append({
-                    "name": repo["full_name"],
-                    "url": repo["html_url"],
-                    "description": repo["description"],
-                    "language": repo["language"],
-                    "stars": repo["stargazers_count"],
-                    "forks": repo["forks_count"],
-                    "created_at": repo["created_at"],
-                    "topics": repo.get("topics", [])
-                })
-            
-            return repositories
+            return [self._format_repository(repo) for repo in data["items"][:limit]]
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching trending repositories from GitHub: {e}")
             return []
             
     @cache_response(expires=3600)
-    def get_language_stats(self, limit=20):
+    def get_language_stats(self, limit=20, sample_size=None, deadline=30):
         """
         Get statistics about programming languages from recent repositories.
         
         Args:
             limit (int): Maximum number of languages to return
+            sample_size (int, optional): Number of repositories to sample (the
+                search API serves at most 1000 results per query); defaults to
+                a sample that fits the search rate limit, larger with a token
+            deadline (float): Time budget in seconds for paging through results
             
         Returns:
             dict: Dictionary with language statistics
         """
+        if sample_size is None:
+            sample_size = self.AUTHENTICATED_LANGUAGE_SAMPLE_SIZE if self.api_key else self.LANGUAGE_SAMPLE_SIZE
+        
         # Get repositories created in the last week
         date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-        query_params = {
-            "q": f"created:>{date}",
-            "sort": "stars",
+        
+        # Count languages while streaming through the result pages
+        language_counts = {}
+        for repo in self._iter_search_results(f"created:>{date}", sample_size=sample_size, deadline=deadline):
+            language = repo["language"]
+            if language:
+                language_counts[language] = language_counts.get(language, 0) + 1
+        
+        # Sort by count and limit
+        sorted_languages = sorted(language_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+        return dict(sorted_languages)
+    
+    def iter_repositories(self, query, sort="stars", sample_size=None, deadline=None):
+        """
+        Lazily iterate over repository search results, following ``Link`` headers.
+        
+        Args:
+            query (str): GitHub search query, e.g. 'created:>2024-01-01 language:Go'
+            sort (str): Sort field for the search
+            sample_size (int, optional): Maximum number of repositories to yield
+            deadline (float, optional): Time budget in seconds for fetching pages
+            
+        Yields:
+            dict: Repository metadata, in search order
+        """
+        for repo in self._iter_search_results(query, sort=sort, sample_size=sample_size, deadline=deadline):
+            yield self._format_repository(repo)
+    
+    def _iter_search_results(self, query, sort="stars", sample_size=None, deadline=None):
+        """Lazily iterate over raw repository search results (see ``iter_repositories``)."""
+        first_page = (f"{self.BASE_URL}/search/repositories", {
+            "q": query,
+            "sort": sort,
             "order": "desc",
-            "per_page": 100  # Get a larger sample for better stats
-        }
+            "per_page": 100
+        })
+        return paginate(self._fetch_repository_page, first_page, sample_size=sample_size, deadline=deadline)
+    
+    def _fetch_repository_page(self, cursor):
+        """
+        Fetch one page of repository search results.
         
+        Args:
+            cursor (tuple): URL and query parameters of the page
+            
+        Returns:
+            tuple: List of raw search results and the cursor of the next page (or None)
+        """
+        url, params = cursor
         try:
-            response = requests.get(
-                f"{self.BASE_URL}/search/repositories", 
-                params=query_params,
+            response = http.get(
+                url,
+                params=params,
                 headers=self.headers,
                 timeout=10
             )
             response.raise_for_status()
             data = response.json()
-            
-            # Count languages
-            language_counts = {}
-            for repo in data["items"]:
-                language = repo["language"]
-                if language:
-                    language_counts[language] = language_counts.get(language, 0) + 1
-            
-            # Sort by count and limit
-            sorted_languages = sorted(language_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
-            return dict(sorted_languages)
-            
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching language statistics from GitHub: {e}")
-            return {}
+            logger.error(f"Error fetching repository page from GitHub: {e}")
+            return [], None
+        
+        # The next page URL already carries the query parameters
+        next_link = response.links.get("next")
+        next_cursor = (next_link["url"], None) if next_link else None
+        
+        return data.get("items", []), next_cursor
+    
+    @staticmethod
+    def _format_repository(repo):
+        """Extract the fields we use from a repository search result."""
+        return Repo(
+            name=repo["full_name"],
+            url=repo["html_url"],
+            description=repo["description"],
+            language=repo["language"],
+            stars=repo["stargazers_count"],
+            forks=repo["forks_count"],
+            created_at=repo["created_at"],
+            topics=repo.get("topics", [])
+        )
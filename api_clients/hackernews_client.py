@@ -3,7 +3,11 @@ HackerNews API client for fetching top stories and related data.
 """
 import logging
 import requests
+from api_clients.records import Story
 from utils.cache import cache_response
+from utils import http
+from utils.lexicon import Lexicon
+from utils.text import text_pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +16,23 @@ class HackerNewsClient:
     
     BASE_URL = "https://hacker-news.firebaseio.com/v0"
     
+    # Tech-related keywords to filter stories by, matched as whole words
+    TECH_KEYWORDS = Lexicon([
+        "ai", "algorithm", "api", "app", "application", "artificial intelligence", 
+        "cloud", "code", "computer", "crypto", "data", "developer", "development", 
+        "digital", "framework", "github", "google", "hardware", "javascript", 
+        "language", "linux", "machine learning", "microsoft", "neural", "open source", 
+        "program", "programming", "python", "software", "tech", "technology", "web"
+    ], aliases={
+        "algorithm": ["algorithms"], "app": ["apps"], "application": ["applications"],
+        "computer": ["computers", "computing"], "developer": ["developers"], "framework": ["frameworks"],
+        "language": ["languages"], "program": ["programs"], "open source": ["open-source", "opensource"],
+        "javascript": ["js"], "machine learning": ["ml"], "tech": ["technical"], "technology": ["technologies"]
+    })
+    
+    def __init__(self):
+        self.BASE_URL = http.base_url("hackernews", self.BASE_URL)
+    
     @cache_response(expires=1800)  # Cache for 30 minutes
     def get_top_stories(self, limit=10):
         """
@@ -25,7 +46,7 @@ class HackerNewsClient:
         """
         try:
             # Get list of top story IDs
-            response = requests.get(
+            response = http.get(
                 f"{self.BASE_URL}/topstories.json",
                 timeout=10
             )
@@ -37,16 +58,16 @@ class HackerNewsClient:
             for story_id in story_ids:
                 story = self._get_item(story_id)
                 if story and story.get("type") == "story":
-                    stories.append({
-                        "id": story["id"],
-                        "title": story.get("title", ""),
-                        "url": story.get("url", f"https://news.ycombinator.com/item?id={story_id}"),
-                        "by": story.get("by", "anonymous"),
-                        "score": story.get("score", 0),
-                        "time": story.get("time", 0),
-                        "descendants": story.get("descendants", 0),  # comment count
-                        "type": story.get("type", "story")
-                    })
+                    stories.append(Story(
+                        id=story["id"],
+                        title=story.get("title", ""),
+                        url=story.get("url", f"https://news.ycombinator.com/item?id={story_id}"),
+                        by=story.get("by", "anonymous"),
+                        score=story.get("score", 0),
+                        time=story.get("time", 0),
+                        descendants=story.get("descendants", 0),  # comment count
+                        type=story.get("type", "story")
+                    ))
             
             return stories
             
@@ -66,7 +87,7 @@ class HackerNewsClient:
             dict: Item details
         """
         try:
-            response = requests.get(
+            response = http.get(
                 f"{self.BASE_URL}/item/{item_id}.json",
                 timeout=10
             )
@@ -91,20 +112,11 @@ class HackerNewsClient:
         # Get a larger pool of stories to filter from
         all_stories = self.get_top_stories(limit=50)
         
-        # Define tech-related keywords to filter by
-        tech_keywords = [
-            "ai", "algorithm", "api", "app", "application", "artificial intelligence", 
-            "cloud", "code", "computer", "crypto", "data", "developer", "development", 
-            "digital", "framework", "github", "google", "hardware", "javascript", 
-            "language", "linux", "machine learning", "microsoft", "neural", "open source", 
-            "program", "programming", "python", "software", "tech", "technology", "web"
-        ]
-        
         # Filter stories by tech-related keywords
         tech_stories = []
         for story in all_stories:
-            title_lower = story["title"].lower()
-            if any(keyword in title_lower for keyword in tech_keywords):
+            title = text_pipeline.document(("hackernews", story["id"], "title"), story["title"])
+            if self.TECH_KEYWORDS.matches(title):
                 tech_stories.append(story)
             
             if len(tech_stories) >= limit:
@@ -3,7 +3,9 @@ import os
 import logging
 import requests
 from datetime import datetime, timedelta
+from api_clients.records import Article
 from utils.cache import cache_response
+from utils import http
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,7 @@ class NewsClient:
     BASE_URL = "https://newsapi.org/v2"
 
     def __init__(self):
+        self.BASE_URL = http.base_url("newsapi", self.BASE_URL)
         self.api_key = os.getenv("NEWS_API_KEY")
         if not self.api_key:
             logger.warning("NEWS_API_KEY environment variable not set. Some functionality may be limited.")
@@ -42,7 +45,7 @@ class NewsClient:
         }
 
         try:
-            response = requests.get(
+            response = http.get(
                 f"{self.BASE_URL}/everything",
                 params=params,
                 timeout=15
@@ -53,14 +56,14 @@ class NewsClient:
             # Extract relevant information
             articles = []
             for article in data.get("articles", []):
-                articles.append({
-                    "title": article.get("title", ""),
-                    "description": article.get("description", ""),
-                    "url": article.get("url", ""),
-                    "source": article.get("source", {}).get("name", ""),
-                    "published_at": article.get("publishedAt", ""),
-                    "content": article.get("content", "")
-                })
+                articles.append(Article(
+                    title=article.get("title", ""),
+                    description=article.get("description", ""),
+                    url=article.get("url", ""),
+                    source=article.get("source", {}).get("name", ""),
+                    published_at=article.get("publishedAt", ""),
+                    content=article.get("content", "")
+                ))
 
             return articles
 
@@ -100,7 +103,7 @@ class NewsClient:
             }
 
             try:
-                response = requests.get(
+                response = http.get(
                     f"{self.BASE_URL}/everything",
                     params=params,
                     timeout=15
@@ -110,13 +113,13 @@ class NewsClient:
 
                 articles = []
                 for article in data.get("articles", []):
-                    articles.append({
-                        "title": article.get("title", ""),
-                        "description": article.get("description", ""),
-                        "url": article.get("url", ""),
-                        "source": article.get("source", {}).get("name", ""),
-                        "published_at": article.get("publishedAt", "")
-                    })
+                    articles.append(Article(
+                        title=article.get("title", ""),
+                        description=article.get("description", ""),
+                        url=article.get("url", ""),
+                        source=article.get("source", {}).get("name", ""),
+                        published_at=article.get("publishedAt", "")
+                    ))
 
                 result[category_name] = articles
 
@@ -1,25 +1,80 @@
 """
 Google Trends API client using pytrends package to fetch search trend data.
 """
+import io
 import logging
 import time
 import pandas as pd
-from datetime import datetime, timedelta
-from pytrends.request import TrendReq
-from utils.cache import cache_response
+from pytrends.request import BASE_TRENDS_URL, TrendReq
+from utils.cache import cache_response, get_cached_value, set_cached_value
+from utils.config import config
+from utils import http
 
 logger = logging.getLogger(__name__)
 
+class _RedirectedTrendReq(TrendReq):
+    """TrendReq sending its requests to another server than Google Trends."""
+    
+    def __init__(self, base_url, **kwargs):
+        self.base_url = base_url
+        super().__init__(**kwargs)
+    
+    def GetGoogleCookie(self):
+        # Only Google hands out the NID cookie
+        return {}
+    
+    def _get_data(self, url, **kwargs):
+        return super()._get_data(url.replace(BASE_TRENDS_URL, self.base_url, 1), **kwargs)
+
 class PyTrendsClient:
     """Client for Google Trends API to fetch search trend data."""
     
+    # Specific technologies to check, by category
+    TECHNOLOGIES = {
+        'programming languages': ['Python', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'Swift', 'Kotlin'],
+        'web frameworks': ['React', 'Vue.js', 'Angular', 'Next.js', 'Svelte', 'Django', 'Flask'],
+        'databases': ['MongoDB', 'PostgreSQL', 'MySQL', 'Redis', 'Cassandra', 'DynamoDB'],
+        'cloud services': ['AWS', 'Azure', 'Google Cloud', 'Cloudflare', 'Vercel', 'Netlify'],
+        'AI tools': ['TensorFlow', 'PyTorch', 'OpenAI', 'GPT-4', 'DALL-E', 'Midjourney'],
+        'mobile development': ['Flutter', 'React Native', 'SwiftUI', 'Jetpack Compose']
+    }
+    
+    # Term included in every interest batch. Google scales each request to its
+    # own maximum, so scores are expressed relative to the anchor (= 100) to
+    # make them comparable across batches.
+    ANCHOR_TERM = 'Python'
+    
     def __init__(self):
         """Initialize the PyTrends client."""
-        try:
-            self.pytrends = TrendReq(hl='en-US', tz=360)
-        except Exception as e:
-            logger.error(f"Error initializing PyTrends client: {e}")
-            self.pytrends = None
+        self._pytrends = None
+        self._initialized = False
+    
+    @property
+    def pytrends(self):
+        """
+        The underlying TrendReq session, created on first use.
+        
+        Creating it fetches Google cookies, so it is kept off the startup path
+        and never created while replaying archived responses. Returns None if
+        initialization failed.
+        """
+        if not self._initialized and not http.replaying():
+            self._initialized = True
+            try:
+                base_url = http.base_url('trends', BASE_TRENDS_URL)
+                if base_url == BASE_TRENDS_URL:
+                    self._pytrends = TrendReq(hl='en-US', tz=360)
+                else:
+                    self._pytrends = _RedirectedTrendReq(base_url, hl='en-US', tz=360)
+            except Exception as e:
+                logger.error(f"Error initializing PyTrends client: {e}")
+                self._pytrends = None
+        return self._pytrends
+    
+    @pytrends.setter
+    def pytrends(self, value):
+        self._pytrends = value
+        self._initialized = True
     
     @cache_response(expires=6*3600)  # Cache for 6 hours
     def get_tech_trends(self, timeframe='today 3-m'):
@@ -113,65 +168,130 @@ class PyTrendsClient:
             logger.error(f"Error comparing tech terms: {e}")
             return {}
     
-    @cache_response(expires=6*3600)
-    def get_trending_technologies(self, top_n=10):
+    def get_trending_technologies(self, top_n=10, timeframe='today 3-m'):
         """
         Get a curated list of trending technologies based on search popularity.
         
         Args:
             top_n (int): Number of trending technologies to return
+            timeframe (str): Time frame for the data
             
         Returns:
             list: List of trending technologies with their relative popularity scores
         """
-        if not self.pytrends:
+        if not self._available():
             logger.error("PyTrends client not initialized. Cannot fetch trending technologies.")
             return []
         
-        # Categories of technology to search for
-        tech_categories = [
-            'programming languages', 'web frameworks', 'databases',
-            'cloud services', 'AI tools', 'mobile development'
-        ]
-        
-        # Specific technologies to check
-        technologies = {
-            'programming languages': ['Python', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'Swift', 'Kotlin'],
-            'web frameworks': ['React', 'Vue.js', 'Angular', 'Next.js', 'Svelte', 'Django', 'Flask'],
-            'databases': ['MongoDB', 'PostgreSQL', 'MySQL', 'Redis', 'Cassandra', 'DynamoDB'],
-            'cloud services': ['AWS', 'Azure', 'Google Cloud', 'Cloudflare', 'Vercel', 'Netlify'],
-            'AI tools': ['TensorFlow', 'PyTorch', 'OpenAI', 'GPT-4', 'DALL-E', 'Midjourney'],
-            'mobile development': ['Flutter', 'React Native', 'SwiftUI', 'Jetpack Compose']
-        }
+        terms = [tech for techs in self.TECHNOLOGIES.values() for tech in techs]
+        interest = self.get_interest_by_term(terms, timeframe=timeframe)
         
         results = []
-        
-        # For each category, compare the technologies within that category
-        for category, techs in technologies.items():
-            # Process in batches of 5 due to API limitations
-            for i in range(0, len(techs), 5):
-                batch = techs[i:i+5]
-                try:
-                    self.pytrends.build_payload(batch, cat=0, timeframe='today 3-m', geo='', gprop='')
-                    interest_df = self.pytrends.interest_over_time()
-                    
-                    if not interest_df.empty:
-                        # Calculate average interest over the time period for each technology
-                        for tech in batch:
-                            if tech in interest_df.columns:
-                                avg_interest = interest_df[tech].mean()
-                                results.append({
-                                    'name': tech,
-                                    'category': category,
-                                    'popularity': avg_interest
-                                })
-                    
-                    # Add a small delay to avoid hitting rate limits
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Error fetching interest for {category} - {batch}: {e}")
+        for category, techs in self.TECHNOLOGIES.items():
+            for tech in techs:
+                if tech in interest:
+                    results.append({
+                        'name': tech,
+                        'category': category,
+                        'popularity': interest[tech]['popularity']
+                    })
         
         # Sort by popularity and return top N
         results.sort(key=lambda x: x['popularity'], reverse=True)
         return results[:top_n]
+    
+    def get_interest_by_term(self, terms, timeframe='today 3-m'):
+        """
+        Get anchor-normalized interest for each term, cached per term.
+        
+        Only terms whose cached interest is missing or stale are fetched, in
+        batches of four plus ANCHOR_TERM (Google allows five terms per request).
+        
+        Args:
+            terms (list): Search terms
+            timeframe (str): Time frame for the data
+            
+        Returns:
+            dict: Dictionary mapping each term to its average interest
+                  ('popularity') and interest by date ('series'), relative to
+                  the anchor term's average of 100
+        """
+        max_age = config.get('cache_expiry.pytrends', 6*3600)
+        
+        result = {}
+        stale_terms = []
+        for term in dict.fromkeys(terms):
+            cached = get_cached_value(self._interest_cache_key(term, timeframe), max_age=max_age)
+            if cached is None:
+                stale_terms.append(term)
+            else:
+                result[term] = cached
+        
+        if not stale_terms or not self._available():
+            return result
+        
+        # The anchor is part of every batch, so it never needs a batch of its own
+        others = [term for term in stale_terms if term != self.ANCHOR_TERM]
+        batches = [others[i:i+4] for i in range(0, len(others), 4)] or [[]]
+        
+        for i, batch in enumerate(batches):
+            if i > 0:
+                # Add a small delay to avoid hitting rate limits
+                time.sleep(1)
+            
+            payload = [self.ANCHOR_TERM] + batch
+            try:
+                interest_df = self._interest_over_time(payload, timeframe)
+            except Exception as e:
+                logger.error(f"Error fetching interest for {batch}: {e}")
+                continue
+            
+            if interest_df.empty or self.ANCHOR_TERM not in interest_df.columns:
+                continue
+            
+            anchor_mean = interest_df[self.ANCHOR_TERM].mean()
+            if not anchor_mean > 0:
+                logger.warning(f"No interest for anchor term '{self.ANCHOR_TERM}', skipping {batch}")
+                continue
+            
+            for term in payload:
+                if term not in interest_df.columns:
+                    continue
+                
+                series = interest_df[term] / anchor_mean * 100
+                entry = {
+                    'popularity': float(series.mean()),
+                    'series': {index.strftime('%Y-%m-%d'): float(value) for index, value in series.items()}
+                }
+                set_cached_value(self._interest_cache_key(term, timeframe), entry)
+                result[term] = entry
+        
+        return result
+    
+    def _available(self):
+        """Whether interest can be fetched, live or from the replayed archive."""
+        return http.replaying() or self.pytrends is not None
+    
+    def _interest_over_time(self, payload, timeframe):
+        """
+        Fetch the interest over time of up to five terms, recorded to or
+        replayed from the response archive.
+        
+        Args:
+            payload (list): Search terms
+            timeframe (str): Time frame for the data
+            
+        Returns:
+            pandas.DataFrame: Interest by date, one column per term
+        """
+        def fetch():
+            self.pytrends.build_payload(payload, cat=0, timeframe=timeframe, geo='', gprop='')
+            return self.pytrends.interest_over_time()
+        
+        return http.archived('pytrends', f"interest_over_time:{timeframe}:{'|'.join(payload)}", fetch,
+                             encode=lambda frame: frame.to_json(orient='split', date_format='iso'),
+                             decode=lambda text: pd.read_json(io.StringIO(text), orient='split'))
+    
+    def _interest_cache_key(self, term, timeframe):
+        """Cache key for a term's anchor-normalized interest."""
+        return f"pytrends_interest:{self.ANCHOR_TERM}:{timeframe}:{term}"
@@ -0,0 +1,208 @@
+"""
+Compact record types for data returned by the API clients.
+
+Records store their fields in ``__slots__`` instead of a per-object dict,
+and pickle as a tuple of values, so cached results don't repeat every
+field name. They behave like the dictionaries the clients used to return
+(``record['title']``, ``record.get('url')``, ``dict(record)``), and extra
+keys can still be set on them (e.g. ``repo['related_technology']``).
+"""
+from collections.abc import MutableMapping
+
+def _rebuild(record_type, values, extra):
+    """Recreate a pickled record."""
+    record = record_type(*values)
+    if extra:
+        record._extra = dict(extra)
+    return record
+
+class Record(MutableMapping):
+    """Base class of record types; subclasses list their fields in FIELDS."""
+
+    __slots__ = ('_extra',)
+    FIELDS = ()
+    DEFAULTS = {}
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self.FIELDS):
+            raise TypeError(f"{type(self).__name__} takes at most {len(self.FIELDS)} positional arguments")
+
+        values = dict(zip(self.FIELDS, args))
+        values.update(kwargs)
+        for field in self.FIELDS:
+            setattr(self, field, values.pop(field, self.DEFAULTS.get(field)))
+
+        # Keys other than the fields are kept aside
+        self._extra = values or None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a record from a dictionary, keeping unknown keys as extras.
+
+        Args:
+            data (dict): Field values by name
+
+        Returns:
+            Record: New record
+        """
+        return cls(**data)
+
+    def to_dict(self):
+        """
+        Convert the record to a plain dictionary, e.g. for JSON.
+
+        Returns:
+            dict: Field values by name, followed by any extra keys
+        """
+        result = {field: getattr(self, field) for field in self.FIELDS}
+        if self._extra:
+            result.update(self._extra)
+        return result
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self.FIELDS:
+            raise TypeError(f"Cannot delete field '{key}' of {type(self).__name__}")
+        if not self._extra or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self):
+        yield from self.FIELDS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return len(self.FIELDS) + (len(self._extra) if self._extra else 0)
+
+    def __contains__(self, key):
+        return key in self.FIELDS or bool(self._extra and key in self._extra)
+
+    def __reduce__(self):
+        return _rebuild, (type(self), tuple(getattr(self, field) for field in self.FIELDS), self._extra)
+
+    def __repr__(self):
+        fields = ', '.join(f"{key}={value!r}" for key, value in self.items())
+        return f"{type(self).__name__}({fields})"
+
+class Repo(Record):
+    """GitHub repository."""
+    __slots__ = FIELDS = ('name', 'url', 'description', 'language', 'stars', 'forks', 'created_at', 'topics')
+
+class Question(Record):
+    """Stack Overflow question."""
+    __slots__ = FIELDS = ('title', 'link', 'score', 'answer_count', 'view_count', 'tags',
+                          'creation_date', 'is_answered')
+
+class Tag(Record):
+    """Stack Overflow tag."""
+    __slots__ = FIELDS = ('name', 'count', 'has_synonyms', 'is_moderator_only', 'is_required')
+
+class Story(Record):
+    """HackerNews story."""
+    __slots__ = FIELDS = ('id', 'title', 'url', 'by', 'score', 'time', 'descendants', 'type')
+
+class Post(Record):
+    """Reddit post."""
+    __slots__ = FIELDS = ('title', 'author', 'score', 'num_comments', 'created_utc', 'url', 'permalink',
+                          'selftext', 'subreddit')
+
+class Article(Record):
+    """News article."""
+    __slots__ = FIELDS = ('title', 'description', 'url', 'source', 'published_at', 'content')
+    DEFAULTS = {'content': ''}
+
+class RecordBatch:
+    """
+    Records of one type stored column by column (struct of arrays).
+
+    Suits bulk processing: a column is a single list that can be scanned,
+    sorted by or turned into a pandas DataFrame without touching each record.
+    """
+
+    def __init__(self, record_type, columns=None):
+        """
+        Args:
+            record_type (type): Record subclass of the rows
+            columns (dict, optional): Equal-length lists of values by field
+        """
+        self.record_type = record_type
+        self.columns = {field: list((columns or {}).get(field, ())) for field in record_type.FIELDS}
+
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns of a RecordBatch must have the same length")
+
+    @classmethod
+    def from_records(cls, record_type, records):
+        """
+        Build a batch from records or dictionaries with the record type's fields.
+
+        Extra keys are not kept.
+
+        Args:
+            record_type (type): Record subclass of the rows
+            records (iterable): Records or dictionaries
+
+        Returns:
+            RecordBatch: New batch
+        """
+        batch = cls(record_type)
+        for record in records:
+            batch.append(record)
+        return batch
+
+    def append(self, record):
+        """Add a record (or dictionary) as the last row."""
+        for field, values in self.columns.items():
+            values.append(record.get(field, self.record_type.DEFAULTS.get(field)))
+
+    def column(self, field):
+        """Return the list of values of a field."""
+        return self.columns[field]
+
+    def __len__(self):
+        return len(self.columns[self.record_type.FIELDS[0]]) if self.record_type.FIELDS else 0
+
+    def __getitem__(self, index):
+        return self.record_type(*(values[index] for values in self.columns.values()))
+
+    def __iter__(self):
+        return (self.record_type(*row) for row in zip(*self.columns.values()))
+
+    def to_records(self):
+        """Convert the batch to a list of records."""
+        return list(self)
+
+    def to_frame(self):
+        """Convert the batch to a pandas DataFrame with one column per field."""
+        import pandas as pd
+        return pd.DataFrame(self.columns, columns=list(self.record_type.FIELDS))
+
+def json_default(obj):
+    """
+    Convert records and batches for JSON serialization (``json.dump(default=...)``).
+
+    Raises:
+        TypeError: If the object is neither a record nor a batch
+    """
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    if isinstance(obj, RecordBatch):
+        return [record.to_dict() for record in obj]
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
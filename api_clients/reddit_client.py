@@ -2,30 +2,97 @@
 Reddit API client for fetching trending posts from technology subreddits.
 """
 import os
+import time
 import logging
+import threading
 import requests
-from utils.cache import cache_response
+from api_clients.records import Post
+from utils.cache import cache_response, get_cached_value, set_cached_value, delete_cached_value
+from utils import http
+from utils.pagination import paginate
 
 logger = logging.getLogger(__name__)
 
-class RedditClient:
-    """Client for Reddit API to fetch trending posts from technology subreddits."""
+class RedditTokenManager:
+    """
+    Obtains and refreshes Reddit OAuth tokens.
     
-    BASE_URL = "https://www.reddit.com"
+    Tokens are persisted with their expiry in the cache store, so every
+    worker process shares one token instead of authenticating on its own.
+    """
     
-    def __init__(self):
-        self.client_id = os.getenv("REDDIT_CLIENT_ID", "")
-        self.client_secret = os.getenv("REDDIT_CLIENT_SECRET", "")
-        self.user_agent = "python:data-alchemist:v1.0 (by /u/data_alchemist_bot)"
-        self.access_token = None
+    TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+    
+    # Refresh tokens this many seconds before they expire
+    REFRESH_MARGIN = 300
+    
+    # Wait this long before retrying after a failed authentication
+    RETRY_DELAY = 60
+    
+    def __init__(self, client_id, client_secret, user_agent):
+        self.TOKEN_URL = f"{http.base_url('reddit', 'https://www.reddit.com')}/api/v1/access_token"
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.user_agent = user_agent
+        self.cache_key = f"reddit_oauth_token:{client_id}"
+        self._token = None
+        self._failed_at = None
+        self._lock = threading.Lock()
+    
+    def get_token(self):
+        """
+        Get a valid access token, authenticating if needed.
         
-        # If credentials are provided, authenticate
-        if self.client_id and self.client_secret:
-            self._authenticate()
+        Returns:
+            str: Access token, or None if authentication failed
+        """
+        with self._lock:
+            if self._is_fresh(self._token):
+                return self._token['access_token']
+            
+            # Another worker may already have refreshed the shared token
+            token = get_cached_value(self.cache_key)
+            if self._is_fresh(token):
+                self._token = token
+                return token['access_token']
+            
+            if self._failed_at is not None and time.time() - self._failed_at < self.RETRY_DELAY:
+                return None
+            
+            self._token = self._authenticate()
+            if self._token is None:
+                self._failed_at = time.time()
+                return None
+            
+            self._failed_at = None
+            set_cached_value(self.cache_key, self._token)
+            return self._token['access_token']
+    
+    def invalidate(self, access_token):
+        """
+        Discard a token the API rejected, so the next ``get_token`` re-authenticates.
+        
+        Args:
+            access_token (str): The rejected token
+        """
+        with self._lock:
+            if self._token and self._token['access_token'] == access_token:
+                self._token = None
+            
+            token = get_cached_value(self.cache_key)
+            if token and token['access_token'] == access_token:
+                delete_cached_value(self.cache_key)
+    
+    def _is_fresh(self, token):
+        """Check that a token exists and isn't about to expire."""
+        return bool(token) and token['expires_at'] - self.REFRESH_MARGIN > time.time()
     
     def _authenticate(self):
         """
         Authenticate with Reddit API using client credentials flow.
+        
+        Returns:
+            dict: Access token and its expiry timestamp, or None on failure
         """
         try:
             auth = requests.auth.HTTPBasicAuth(self.client_id, self.client_secret)
@@ -36,19 +103,47 @@ class RedditClient:
             }
             headers = {'User-Agent': self.user_agent}
             
-            response = requests.post(
-                'https://www.reddit.com/api/v1/access_token',
+            response = http.post(
+                self.TOKEN_URL,
                 auth=auth,
                 data=data,
                 headers=headers,
                 timeout=10
             )
             response.raise_for_status()
-            self.access_token = response.json().get('access_token')
+            data = response.json()
+            
+            if not data.get('access_token'):
+                logger.error(f"Reddit API did not return an access token: {data.get('error', 'unknown error')}")
+                return None
+            
+            return {
+                'access_token': data['access_token'],
+                'expires_at': time.time() + data.get('expires_in', 3600)
+            }
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error authenticating with Reddit API: {e}")
-            self.access_token = None
+            return None
+
+class RedditClient:
+    """Client for Reddit API to fetch trending posts from technology subreddits."""
+    
+    BASE_URL = "https://www.reddit.com"
+    OAUTH_URL = "https://oauth.reddit.com"
+    
+    def __init__(self):
+        # An overridden base URL serves both the public and the OAuth API
+        self.BASE_URL = http.base_url("reddit", self.BASE_URL)
+        self.OAUTH_URL = http.base_url("reddit", self.OAUTH_URL)
+        self.client_id = os.getenv("REDDIT_CLIENT_ID", "")
+        self.client_secret = os.getenv("REDDIT_CLIENT_SECRET", "")
+        self.user_agent = "python:data-alchemist:v1.0 (by /u/data_alchemist_bot)"
+        
+        # If credentials are provided, tokens are fetched on the first API request
+        self.token_manager = None
+        if self.client_id and self.client_secret:
+            self.token_manager = RedditTokenManager(self.client_id, self.client_secret, self.user_agent)
     
     @cache_response(expires=1800)  # Cache for 30 minutes
     def get_top_posts(self, subreddit="technology", time_filter="week", limit=10):
@@ -63,52 +158,116 @@ class RedditClient:
         Returns:
             list: List of top posts with metadata
         """
-        headers = {'User-Agent': self.user_agent}
-        
-        if self.access_token:
-            headers['Authorization'] = f'Bearer {self.access_token}'
-            base_url = "https://oauth.reddit.com"
-        else:
-            # If no authentication, use public API (with stricter rate limits)
-            base_url = self.BASE_URL
-        
         params = {
             'limit': limit,
             't': time_filter
         }
         
         try:
-            response = requests.get(
-                f"{base_url}/r/{subreddit}/top.json",
-                headers=headers,
-                params=params,
-                timeout=10
-            )
+            response = self._get(f"/r/{subreddit}/top.json", params)
             response.raise_for_status()
             data = response.json()
             
             # Extract relevant information
-            posts = []
-            for post in data.get('data', {}).get('children', []):
-                post_data = post.get('data', {})
-                posts.append({
-                    'title': post_data.get('title', ''),
-                    'author': post_data.get('author', ''),
-                    'score': post_data.get('score', 0),
-                    'num_comments': post_data.get('num_comments', 0),
-                    'created_utc': post_data.get('created_utc', 0),
-                    'url': post_data.get('url', ''),
-                    'permalink': f"{self.BASE_URL}{post_data.get('permalink', '')}",
-                    'selftext': post_data.get('selftext', '')[:500],  # Truncate long text
-                    'subreddit': post_data.get('subreddit', subreddit)
-                })
-            
-            return posts
+            return [self._format_post(post.get('data', {}), subreddit)
+                    for post in data.get('data', {}).get('children', [])]
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching top posts from r/{subreddit}: {e}")
             return []
     
+    def iter_posts(self, subreddit="technology", time_filter="week", sample_size=None, deadline=None):
+        """
+        Lazily iterate over a subreddit's top posts, following ``after`` cursors.
+        
+        Args:
+            subreddit (str): Name of the subreddit
+            time_filter (str): One of "hour", "day", "week", "month", "year", "all"
+            sample_size (int, optional): Maximum number of posts to yield
+            deadline (float, optional): Time budget in seconds for fetching pages
+            
+        Yields:
+            dict: Post metadata, in listing order
+        """
+        return paginate(lambda after: self._fetch_post_page(subreddit, time_filter, after), None,
+                        sample_size=sample_size, deadline=deadline)
+    
+    def _fetch_post_page(self, subreddit, time_filter, after):
+        """
+        Fetch one page (up to 100 posts) of a subreddit's top listing.
+        
+        Args:
+            subreddit (str): Name of the subreddit
+            time_filter (str): Listing time filter
+            after (str, optional): Fullname of the last post of the previous page
+            
+        Returns:
+            tuple: List of posts and the ``after`` cursor of the next page (or None)
+        """
+        params = {
+            'limit': 100,
+            't': time_filter
+        }
+        if after:
+            params['after'] = after
+        
+        try:
+            response = self._get(f"/r/{subreddit}/top.json", params)
+            response.raise_for_status()
+            listing = response.json().get('data', {})
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching top posts page from r/{subreddit}: {e}")
+            return [], None
+        
+        posts = [self._format_post(post.get('data', {}), subreddit) for post in listing.get('children', [])]
+        return posts, listing.get('after')
+    
+    def _get(self, path, params, retry_on_401=True):
+        """
+        Send a GET request to the API, authenticated when credentials are available.
+        
+        If the OAuth token is rejected, it is discarded and the request is
+        retried once with a fresh token.
+        
+        Args:
+            path (str): API path, e.g. '/r/python/top.json'
+            params (dict): Query parameters
+            retry_on_401 (bool): Whether to retry once if the token is rejected
+            
+        Returns:
+            requests.Response: The API response
+        """
+        headers = {'User-Agent': self.user_agent}
+        token = self.token_manager.get_token() if self.token_manager else None
+        
+        if not token:
+            # If no authentication, use public API (with stricter rate limits)
+            return http.get(f"{self.BASE_URL}{path}", headers=headers, params=params, timeout=10)
+        
+        headers['Authorization'] = f'Bearer {token}'
+        response = http.get(f"{self.OAUTH_URL}{path}", headers=headers, params=params, timeout=10)
+        
+        if response.status_code == 401 and retry_on_401:
+            logger.info("Reddit access token was rejected, re-authenticating")
+            self.token_manager.invalidate(token)
+            return self._get(path, params, retry_on_401=False)
+        
+        return response
+    
+    def _format_post(self, post_data, subreddit):
+        """Extract the fields we use from a post listing entry."""
+        return Post(
+            title=post_data.get('title', ''),
+            author=post_data.get('author', ''),
+            score=post_data.get('score', 0),
+            num_comments=post_data.get('num_comments', 0),
+            created_utc=post_data.get('created_utc', 0),
+            url=post_data.get('url', ''),
+            permalink=f"{self.BASE_URL}{post_data.get('permalink', '')}",
+            selftext=post_data.get('selftext', '')[:500],  # Truncate long text
+            subreddit=post_data.get('subreddit', subreddit)
+        )
+    
     @cache_response(expires=3600)
     def get_tech_subreddit_posts(self, limit=5):
         """
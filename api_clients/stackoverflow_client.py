@@ -2,9 +2,15 @@
 Stack Overflow API client for fetching questions and tag data.
 """
 import os
+import time
 import logging
 import requests
+from collections import defaultdict
+from datetime import datetime, timedelta
+from api_clients.records import Question, Tag
 from utils.cache import cache_response
+from utils import http
+from utils.pagination import paginate
 
 logger = logging.getLogger(__name__)
 
@@ -13,8 +19,19 @@ class StackOverflowClient:
     
     BASE_URL = "https://api.stackexchange.com/2.3"
     
+    # Fields read from question listings; used to build a narrow custom filter
+    # so bulk page pulls don't transfer bodies, owners, etc.
+    QUESTION_FILTER_FIELDS = [
+        ".backoff", ".has_more", ".items", ".quota_remaining",
+        "question.answer_count", "question.creation_date", "question.is_answered",
+        "question.link", "question.score", "question.tags", "question.title",
+        "question.view_count"
+    ]
+    
     def __init__(self):
+        self.BASE_URL = http.base_url("stackexchange", self.BASE_URL)
         self.api_key = os.getenv("STACKOVERFLOW_API_KEY", "")
+        self._question_filter = None
         
     @cache_response(expires=3600)  # Cache for 1 hour
     def get_popular_questions(self, tags=None, period="week", limit=10):
@@ -29,20 +46,13 @@ class StackOverflowClient:
         Returns:
             list: List of popular questions with metadata
         """
-        # Convert period to Stack Overflow parameter
-        period_map = {
-            "day": "day",
-            "week": "week",
-            "month": "month"
-        }
-        sort_period = period_map.get(period, "week")
-        
-        # Construct query parameters
+        # Construct query parameters; only questions created within the period count
         params = {
             "order": "desc",
             "sort": "votes",
             "site": "stackoverflow",
             "pagesize": limit,
+            "fromdate": self._period_start(period),
             "filter": "!-*jbN-o8P3E5"  # Filter to include more fields
         }
         
@@ -53,7 +63,7 @@ class StackOverflowClient:
             params["tagged"] = ";".join(tags)
         
         try:
-            response = requests.get(
+            response = http.get(
                 f"{self.BASE_URL}/questions",
                 params=params,
                 timeout=10
@@ -62,20 +72,7 @@ class StackOverflowClient:
             data = response.json()
             
             # Extract relevant information
-            questions = []
-            for question in data.get("items", []):
-                questions.append({
-                    "title": question["title"],
-                    "link": question["link"],
-                    "score": question["score"],
-                    "answer_count": question["answer_count"],
-                    "view_count": question["view_count"],
-                    "tags": question["tags"],
-                    "creation_date": question["creation_date"],
-                    "is_answered": question["is_answered"]
-                })
-            
-            return questions
+            return [self._format_question(question) for question in data.get("items", [])]
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching questions from Stack Overflow: {e}")
@@ -103,7 +100,7 @@ class StackOverflowClient:
             params["key"] = self.api_key
         
         try:
-            response = requests.get(
+            response = http.get(
                 f"{self.BASE_URL}/tags",
                 params=params,
                 timeout=10
@@ -114,16 +111,205 @@ class StackOverflowClient:
             # Extract relevant information
             tags = []
             for tag in data.get("items", []):
-                tags.append({
-                    "name": tag["name"],
-                    "count": tag["count"],
-                    "has_synonyms": tag.get("has_synonyms", False),
-                    "is_moderator_only": tag.get("is_moderator_only", False),
-                    "is_required": tag.get("is_required", False)
-                })
+                tags.append(Tag(
+                    name=tag["name"],
+                    count=tag["count"],
+                    has_synonyms=tag.get("has_synonyms", False),
+                    is_moderator_only=tag.get("is_moderator_only", False),
+                    is_required=tag.get("is_required", False)
+                ))
             
             return tags
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching popular tags from Stack Overflow: {e}")
             return []
+    
+    def get_questions_by_tag(self, tags, period="week", limit=10, pages=5, min_questions=None,
+                             top_questions=None):
+        """
+        Fetch popular questions for several tags with a single bulk pull.
+        
+        Top questions for the period are fetched once (see ``get_top_questions``)
+        and partitioned into a tag -> questions index locally. Only tags that end
+        up with fewer than ``min_questions`` questions fall back to a per-tag
+        ``get_popular_questions`` call.
+        
+        Args:
+            tags (list): Tags to return questions for
+            period (str): Time period - 'day', 'week', or 'month'
+            limit (int): Maximum number of questions per tag
+            pages (int): Number of 100-question pages to pull in bulk
+            min_questions (int, optional): Minimum questions a tag needs before
+                falling back to a per-tag request (defaults to ``limit``)
+            top_questions (list, optional): Result of ``get_top_questions`` for
+                the period, when the caller already fetched it
+            
+        Returns:
+            dict: Dictionary mapping each tag to its list of questions
+        """
+        if min_questions is None:
+            min_questions = limit
+        if top_questions is None:
+            top_questions = self.get_top_questions(period=period, pages=pages)
+        
+        # Build the tag -> questions index; questions arrive sorted by votes
+        tag_index = defaultdict(list)
+        for question in top_questions:
+            for tag in question["tags"]:
+                tag_index[tag].append(question)
+        
+        result = {}
+        sparse_tags = []
+        for tag in tags:
+            questions = tag_index.get(tag, [])[:limit]
+            if len(questions) < min_questions:
+                sparse_tags.append(tag)
+                questions = self.get_popular_questions(tags=[tag], period=period, limit=limit)
+            result[tag] = questions
+        
+        if sparse_tags:
+            logger.debug(f"Per-tag Stack Overflow requests for sparse tags: {', '.join(sparse_tags)}")
+        
+        return result
+    
+    @cache_response(expires=3600)
+    def get_top_questions(self, period="week", pages=5):
+        """
+        Fetch the top-voted questions created within the period, across all tags.
+        
+        Args:
+            period (str): Time period - 'day', 'week', or 'month'
+            pages (int): Maximum number of 100-question pages to fetch
+            
+        Returns:
+            list: List of questions sorted by votes
+        """
+        return list(self.iter_questions(sample_size=pages * 100, fromdate=self._period_start(period)))
+    
+    @staticmethod
+    def _period_start(period):
+        """
+        Start of a period ending now, as the Unix timestamp ``fromdate`` expects.
+        
+        Args:
+            period (str): Time period - 'day', 'week', or 'month'
+            
+        Returns:
+            int: Seconds since the epoch
+        """
+        days = {"day": 1, "week": 7, "month": 30}.get(period, 7)
+        return int((datetime.now() - timedelta(days=days)).timestamp())
+    
+    def iter_questions(self, tags=None, sort="votes", sample_size=None, deadline=None, **filters):
+        """
+        Lazily iterate over questions, following ``has_more``/``page``.
+        
+        Args:
+            tags (list, optional): List of tags to filter by
+            sort (str): Sort order, e.g. 'votes', 'activity' or 'creation'
+            sample_size (int, optional): Maximum number of questions to yield
+            deadline (float, optional): Time budget in seconds for fetching pages
+            **filters: Extra query parameters such as ``fromdate`` or ``todate``
+            
+        Yields:
+            dict: Question metadata, in listing order
+        """
+        params = {
+            "order": "desc",
+            "sort": sort,
+            "site": "stackoverflow",
+            "pagesize": 100,
+            "filter": self._get_question_filter(),
+            **filters
+        }
+        
+        if self.api_key:
+            params["key"] = self.api_key
+        
+        if tags:
+            params["tagged"] = ";".join(tags)
+        
+        return paginate(lambda page: self._fetch_question_page(params, page), 1,
+                        sample_size=sample_size, deadline=deadline)
+    
+    def _fetch_question_page(self, params, page):
+        """
+        Fetch one page of questions.
+        
+        Args:
+            params (dict): Query parameters shared by all pages
+            page (int): Page number, starting at 1
+            
+        Returns:
+            tuple: List of questions and the next page number (or None)
+        """
+        try:
+            response = http.get(
+                f"{self.BASE_URL}/questions",
+                params={**params, "page": page},
+                timeout=10
+            )
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching page {page} of questions from Stack Overflow: {e}")
+            return [], None
+        
+        questions = [self._format_question(question) for question in data.get("items", [])]
+        
+        if not data.get("has_more"):
+            return questions, None
+        
+        # Stack Exchange asks clients to wait before the next request
+        if data.get("backoff"):
+            time.sleep(data["backoff"])
+        
+        return questions, page + 1
+    
+    @staticmethod
+    def _format_question(question):
+        """Extract the fields we use from a question."""
+        return Question(
+            title=question["title"],
+            link=question["link"],
+            score=question["score"],
+            answer_count=question["answer_count"],
+            view_count=question["view_count"],
+            tags=question["tags"],
+            creation_date=question["creation_date"],
+            is_answered=question["is_answered"]
+        )
+    
+    def _get_question_filter(self):
+        """
+        Create (once per client) a custom filter returning only QUESTION_FILTER_FIELDS.
+        
+        Returns:
+            str: Filter id, or the built-in 'default' filter if creation fails
+        """
+        if self._question_filter:
+            return self._question_filter
+        
+        params = {
+            "include": ";".join(self.QUESTION_FILTER_FIELDS),
+            "base": "none",
+            "unsafe": "false"
+        }
+        
+        if self.api_key:
+            params["key"] = self.api_key
+        
+        try:
+            response = http.get(
+                f"{self.BASE_URL}/filters/create",
+                params=params,
+                timeout=10
+            )
+            response.raise_for_status()
+            self._question_filter = response.json()["items"][0]["filter"]
+        except (requests.exceptions.RequestException, KeyError, IndexError) as e:
+            logger.error(f"Error creating Stack Overflow question filter: {e}")
+            return "default"
+        
+        return self._question_filter
@@ -4,12 +4,16 @@ Provides a web interface for exploring technology trends.
 """
 import os
 import logging
-from flask import Flask, render_template, jsonify, request, redirect, url_for
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, render_template, jsonify, request, redirect, url_for, g
+from flask.json.provider import DefaultJSONProvider
 import pandas as pd
 import json
 
+from api_clients.records import json_default
 from data_processing.processor import DataProcessor
-from data_processing.analyzer import DataAnalyzer
+from data_processing.context import computation_context
 from utils.logger import setup_logger
 from utils.cache import clear_expired_cache
 
@@ -17,16 +21,61 @@ from utils.cache import clear_expired_cache
 logger = logging.getLogger(__name__)
 setup_logger(level=logging.DEBUG)
 
+class RecordJSONProvider(DefaultJSONProvider):
+    """JSON provider that also serializes API client records."""
+    
+    @staticmethod
+    def default(o):
+        try:
+            return json_default(o)
+        except TypeError:
+            return DefaultJSONProvider.default(o)
+
 # Create the Flask application
 app = Flask(__name__)
+app.json = RecordJSONProvider(app)
 app.secret_key = os.environ.get("SESSION_SECRET", "data_alchemist_secret_key")
 
-# Initialize data processor and analyzer
+# Initialize data processor (API clients are created lazily on first use)
 data_processor = DataProcessor()
-data_analyzer = DataAnalyzer()
 
-# Clear expired cache on startup
-clear_expired_cache()
+# The analyzer pulls in matplotlib, so it is only created for the first chart
+_data_analyzer = None
+_data_analyzer_lock = threading.Lock()
+
+def get_data_analyzer():
+    """Return the shared DataAnalyzer, creating it on first use."""
+    global _data_analyzer
+    with _data_analyzer_lock:
+        if _data_analyzer is None:
+            from data_processing.analyzer import DataAnalyzer
+            _data_analyzer = DataAnalyzer()
+    return _data_analyzer
+
+# Charts of every new report are drawn in the background, one report at a time
+_prerender_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prerender-charts")
+
+def prerender_charts(report):
+    """Queue the charts of a new report for drawing into the render cache."""
+    _prerender_executor.submit(lambda: get_data_analyzer().prerender(report))
+
+data_processor.report_listeners.append(prerender_charts)
+
+# Clear expired cache in the background so it doesn't delay startup
+threading.Thread(target=clear_expired_cache, name="clear-expired-cache", daemon=True).start()
+
+@app.before_request
+def open_computation_context():
+    """Share processor stage results between everything computed for one request."""
+    g.computation_context = computation_context()
+    g.computation_context.__enter__()
+
+@app.teardown_request
+def close_computation_context(exc):
+    """Discard the request's stage results."""
+    context = g.pop('computation_context', None)
+    if context is not None:
+        context.__exit__(None, None, None)
 
 @app.route('/')
 def index():
@@ -103,12 +152,51 @@ def api_insights():
         logger.error(f"Error in insights API: {e}")
         return jsonify({"error": str(e)}), 500
 
+def _frame_records(frame):
+    """Convert a DataFrame to JSON-ready records with ISO 8601 timestamps."""
+    return json.loads(frame.to_json(orient='records', date_format='iso'))
+
+@app.route('/api/history/technology/<path:name>')
+def api_technology_history(name):
+    """API endpoint for a technology's popularity scores in past reports."""
+    try:
+        days = request.args.get('days', 90, type=int)
+        # Technologies are ranked under lowercase names
+        history = data_processor.snapshot_store.technology_history(name.lower(), days=days)
+        return jsonify(_frame_records(history))
+    except Exception as e:
+        logger.error(f"Error in technology history API: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/history/topic/<path:topic>')
+def api_topic_history(topic):
+    """API endpoint for a topic's source counts and burst scores in past reports."""
+    try:
+        days = request.args.get('days', 30, type=int)
+        history = data_processor.snapshot_store.topic_history(topic, days=days)
+        return jsonify(_frame_records(history))
+    except Exception as e:
+        logger.error(f"Error in topic history API: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/history/rising_repos')
+def api_rising_repos():
+    """API endpoint for the repositories that gained the most stars in past reports."""
+    try:
+        days = request.args.get('days', 7, type=int)
+        limit = request.args.get('limit', 10, type=int)
+        rising = data_processor.snapshot_store.rising_repositories(days=days, top_n=limit)
+        return jsonify(_frame_records(rising))
+    except Exception as e:
+        logger.error(f"Error in rising repositories API: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api_viz_popularity')
 def api_viz_popularity():
     """API endpoint for technology popularity visualization."""
     try:
         popularity_data = data_processor.get_technology_popularity()
-        visualization = data_analyzer.create_technology_popularity_chart(popularity_data)
+        visualization = get_data_analyzer().create_technology_popularity_chart(popularity_data)
         return jsonify({"image": visualization})
     except Exception as e:
         logger.error(f"Error in popularity visualization API: {e}")
@@ -119,7 +207,7 @@ def api_viz_trending_topics():
     """API endpoint for trending topics visualization."""
     try:
         topics_data = data_processor.get_trending_topics()
-        visualization = data_analyzer.create_trending_topics_chart(topics_data)
+        visualization = get_data_analyzer().create_trending_topics_chart(topics_data)
         return jsonify({"image": visualization})
     except Exception as e:
         logger.error(f"Error in trending topics visualization API: {e}")
@@ -130,7 +218,7 @@ def api_viz_correlations():
     """API endpoint for technology correlations visualization."""
     try:
         correlation_data = data_processor.get_technology_correlations()
-        visualization = data_analyzer.create_tech_correlation_heatmap(correlation_data)
+        visualization = get_data_analyzer().create_tech_correlation_heatmap(correlation_data)
         return jsonify({"image": visualization})
     except Exception as e:
         logger.error(f"Error in correlations visualization API: {e}")
@@ -140,9 +228,10 @@ def api_viz_correlations():
 def api_viz_clusters():
     """API endpoint for technology clusters visualization."""
     try:
-        insights_data = data_processor.get_technology_insights_report()
-        clusters = insights_data.get('technology_clusters', [])
-        visualization = data_analyzer.create_technology_clusters_graph(clusters)
+        # Only the stages clusters depend on are computed, not the whole report
+        stage_results, _ = data_processor.run_stages(['technology_clusters'])
+        clusters = stage_results['technology_clusters']
+        visualization = get_data_analyzer().create_technology_clusters_graph(clusters)
         return jsonify({"image": visualization})
     except Exception as e:
         logger.error(f"Error in clusters visualization API: {e}")
@@ -153,7 +242,7 @@ def api_viz_hot_discussions():
     """API endpoint for hot discussions visualization."""
     try:
         discussions_data = data_processor.get_hot_discussions()
-        visualization = data_analyzer.create_hot_discussions_chart(discussions_data)
+        visualization = get_data_analyzer().create_hot_discussions_chart(discussions_data)
         return jsonify({"image": visualization})
     except Exception as e:
         logger.error(f"Error in hot discussions visualization API: {e}")
@@ -163,7 +252,7 @@ def api_viz_hot_discussions():
 def api_viz_emerging_repos():
     try:
         repos_data = data_processor.get_emerging_repositories()
-        visualization = data_analyzer.create_emerging_repos_chart(repos_data)
+        visualization = get_data_analyzer().create_emerging_repos_chart(repos_data)
         return jsonify({"image": visualization})
     except Exception as e:
         logger.error(f"Error in emerging repositories visualization API: {e}")
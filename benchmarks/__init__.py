@@ -0,0 +1,3 @@
+"""
+Benchmarks for data processing hot paths, run on synthetic data.
+"""
@@ -0,0 +1,66 @@
+"""
+Benchmark the sparse correlation engine and clustering on synthetic documents.
+
+Also times a refresh of the rolling co-occurrence accumulator holding the
+same documents: adding a batch of new ones and reading the correlations of
+the 20 most frequent technologies, as the processor does.
+
+Usage:
+    python -m benchmarks.bench_correlation [--technologies 5000] [--documents 50000]
+"""
+import argparse
+import itertools
+import random
+import time
+
+from data_processing.clustering import TechnologyClusterer
+from data_processing.correlation import CooccurrenceAccumulator, CorrelationEngine
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark technology correlations')
+    parser.add_argument('--technologies', type=int, default=5000, help='Number of technologies')
+    parser.add_argument('--documents', type=int, default=50000, help='Number of documents')
+    parser.add_argument('--per-document', type=int, default=6, help='Maximum technologies per document')
+    parser.add_argument('--batch', type=int, default=500, help='New documents per accumulator refresh')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    technologies = [f"tech{i}" for i in range(args.technologies)]
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(args.technologies)))
+    documents = [rng.choices(technologies, cum_weights=cum_weights, k=rng.randint(1, args.per_document))
+                 for _ in range(args.documents)]
+
+    start = time.perf_counter()
+    engine = CorrelationEngine(technologies)
+    for document in documents:
+        engine.add_document(document)
+    engine.incidence_matrix
+    print(f"build      {time.perf_counter() - start:.3f}s")
+
+    for metric in CorrelationEngine.METRICS:
+        start = time.perf_counter()
+        scores = engine.similarity(metric)
+        print(f"{metric:<10} {time.perf_counter() - start:.3f}s  ({scores.nnz} scores)")
+
+    start = time.perf_counter()
+    correlations = engine.to_dict()
+    print(f"to_dict    {time.perf_counter() - start:.3f}s")
+
+    for mode in TechnologyClusterer.MODES:
+        start = time.perf_counter()
+        clusters = TechnologyClusterer(threshold=0.05, mode=mode).cluster(correlations)
+        print(f"{mode:<18} {time.perf_counter() - start:.3f}s  ({len(clusters)} clusters)")
+
+    accumulator = CooccurrenceAccumulator()
+    accumulator.add_documents(enumerate(documents), technologies)
+    batch = [rng.choices(technologies, cum_weights=cum_weights, k=rng.randint(1, args.per_document))
+             for _ in range(args.batch)]
+
+    start = time.perf_counter()
+    accumulator.add_documents((('new', i), document) for i, document in enumerate(batch))
+    accumulator.to_dict(technologies[:20])
+    print(f"accumulator refresh {time.perf_counter() - start:.3f}s  "
+          f"({args.batch} new of {len(accumulator)} documents)")
+
+if __name__ == '__main__':
+    main()
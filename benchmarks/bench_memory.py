@@ -0,0 +1,158 @@
+"""
+Benchmark the memory footprint of a full insights report.
+
+The report is built from synthetic upstream data served by in-memory stub
+clients, once with the record types the clients return and once with the
+plain dictionaries they returned before. For each representation it
+reports the memory held by the upstream data, its pickled size in the
+cache, and the peak memory while building the report.
+
+Usage:
+    python -m benchmarks.bench_memory [--scale 10]
+"""
+import argparse
+import gc
+import pickle
+import tracemalloc
+
+from benchmarks.synthetic import (generate_articles, generate_posts, generate_questions,
+                                  generate_repositories, generate_stories)
+from data_processing.processor import DataProcessor
+from utils.config import config
+
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Java', 'Go', 'Rust', 'C++', 'C#', 'Kotlin', 'Swift']
+
+SUBREDDITS = ['technology', 'programming', 'webdev', 'artificial', 'MachineLearning',
+              'datascience', 'compsci', 'Python', 'javascript', 'cybersecurity']
+
+def generate_upstream(scale):
+    """
+    Generate the data every client serves.
+
+    Args:
+        scale (int): Multiplier of the number of items per response
+
+    Returns:
+        dict: Lists of records by kind (and posts by subreddit)
+    """
+    tags = [language.lower() for language in LANGUAGES]
+    return {
+        'repositories': generate_repositories(100 * scale, LANGUAGES),
+        'questions': generate_questions(200 * scale, tags),
+        'stories': generate_stories(50 * scale),
+        'articles': generate_articles(20 * scale),
+        'posts': {subreddit: generate_posts(5 * scale, subreddit, seed=i) for i, subreddit in enumerate(SUBREDDITS)}
+    }
+
+def as_dicts(upstream):
+    """Convert every record to the dictionary clients used to return."""
+    if isinstance(upstream, dict):
+        return {key: as_dicts(value) for key, value in upstream.items()}
+    return [record.to_dict() for record in upstream]
+
+class StubClients:
+    """Serves synthetic upstream data through the client methods DataProcessor calls."""
+
+    def __init__(self, upstream):
+        self.upstream = upstream
+
+    # GitHub
+    def get_language_stats(self, limit=20, **kwargs):
+        counts = {}
+        for repo in self.upstream['repositories']:
+            counts[repo['language']] = counts.get(repo['language'], 0) + 1
+        return dict(sorted(counts.items(), key=lambda x: x[1], reverse=True)[:limit])
+
+    def get_trending_repositories(self, language=None, since="daily", limit=10):
+        repos = self.upstream['repositories']
+        if language:
+            repos = [repo for repo in repos if repo['language'] == language]
+        return repos[:limit]
+
+    # Stack Overflow
+    def get_popular_tags(self, limit=20):
+        counts = {}
+        for question in self.upstream['questions']:
+            for tag in question['tags']:
+                counts[tag] = counts.get(tag, 0) + 1
+        return [{'name': tag, 'count': count} for tag, count in counts.items()][:limit]
+
+    def get_top_questions(self, **kwargs):
+        return self.upstream['questions']
+
+    def get_questions_by_tag(self, tags, limit=10, **kwargs):
+        return {tag: [question for question in self.upstream['questions'] if tag in question['tags']][:limit]
+                for tag in tags}
+
+    # PyTrends
+    def get_trending_technologies(self, top_n=10, **kwargs):
+        return [{'name': language, 'popularity': 100 - i * 5} for i, language in enumerate(LANGUAGES[:top_n])]
+
+    # HackerNews, news and Reddit
+    def get_tech_stories(self, limit=10):
+        return self.upstream['stories'][:limit]
+
+    def get_tech_news(self, days=7, limit=10):
+        return self.upstream['articles'][:limit]
+
+    def get_tech_subreddit_posts(self, limit=5):
+        return {subreddit: posts[:limit] for subreddit, posts in self.upstream['posts'].items()}
+
+    def get_top_posts(self, subreddit, time_filter="day", limit=10):
+        return self.upstream['posts'].get(subreddit, [])[:limit]
+
+def measure(build_upstream):
+    """
+    Measure one representation of the upstream data.
+
+    Args:
+        build_upstream (callable): Returns the upstream data
+
+    Returns:
+        dict: Held bytes, pickled bytes and report peak bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    upstream = build_upstream()
+    held = tracemalloc.get_traced_memory()[0]
+
+    pickled = len(pickle.dumps(upstream, protocol=pickle.HIGHEST_PROTOCOL))
+
+    stubs = StubClients(upstream)
+    processor = DataProcessor(max_workers=1)
+    for name in ('github_client', 'stackoverflow_client', 'pytrends_client',
+                 'hackernews_client', 'news_client', 'reddit_client'):
+        setattr(processor, name, stubs)
+
+    tracemalloc.reset_peak()
+    processor.get_technology_insights_report()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'held': held, 'pickled': pickled, 'peak': peak}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark report memory footprint')
+    parser.add_argument('--scale', type=int, default=10, help='Multiplier of upstream response sizes')
+    args = parser.parse_args()
+
+    # Each run builds its report from scratch rather than the persisted rolling windows
+    config.set('trends.enabled', False)
+    config.set('correlations.accumulate', False)
+    config.set('snapshots.enabled', False)
+
+    results = {
+        'dicts': measure(lambda: as_dicts(generate_upstream(args.scale))),
+        'records': measure(lambda: generate_upstream(args.scale))
+    }
+
+    print(f"{'':<10} {'held':>12} {'pickled':>12} {'report peak':>12}")
+    for name, result in results.items():
+        print(f"{name:<10} {result['held'] / 1024:>10.0f}KB {result['pickled'] / 1024:>10.0f}KB "
+              f"{result['peak'] / 1024:>10.0f}KB")
+
+    for key in ('held', 'pickled', 'peak'):
+        print(f"{key} reduction: {1 - results['records'][key] / results['dicts'][key]:.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark topic extraction on synthetic corpora.
+
+Compares data_processing.topics.extract_topics with the original
+implementation, which scanned all bigrams for every top word and all
+trigrams for every top bigram. The reference finds tech terms with the
+current lexicon, as the original substring scan matched different terms.
+
+With --processes, times the multi-process map-reduce mode instead and
+checks that it matches the serial result. With --capacity, compares the
+time, peak memory and top topics of approximate counting with exact
+counting.
+
+Usage:
+    python -m benchmarks.bench_topics [--sizes 1000 10000 50000] [--skip-legacy-above 10000]
+                                      [--processes 4] [--capacity 20000]
+"""
+import argparse
+import time
+import tracemalloc
+from collections import Counter
+
+from benchmarks.synthetic import generate_titles
+from data_processing.topics import STOP_WORDS, TECH_TERMS, extract_topics, find_tech_terms
+
+def legacy_extract_topics(texts):
+    """Reference implementation of the original quadratic extraction."""
+    word_counts = Counter()
+    bigram_counts = Counter()
+    trigram_counts = Counter()
+
+    for text in texts:
+        clean_text = text.lower()
+        words = [word.strip('.,!?()[]{}:;"\'') for word in clean_text.split()]
+        words = [word for word in words if word and word not in STOP_WORDS and len(word) > 2]
+        word_counts.update(words)
+        for i in range(len(words) - 1):
+            bigram_counts[f"{words[i]} {words[i+1]}"] += 1
+        for i in range(len(words) - 2):
+            trigram_counts[f"{words[i]} {words[i+1]} {words[i+2]}"] += 1
+        found = find_tech_terms(clean_text)
+        for term in TECH_TERMS:
+            if term in found:
+                word_counts[term] += 3
+
+    all_phrases = []
+    for word, count in word_counts.most_common(100):
+        if not any(word in bigram.split() and bigram_counts[bigram] > count / 2 for bigram in bigram_counts):
+            all_phrases.append((word, count))
+    for bigram, count in bigram_counts.most_common(50):
+        if not any(all(word in trigram.split() for word in bigram.split()) and trigram_counts[trigram] > count / 2
+                   for trigram in trigram_counts):
+            all_phrases.append((bigram, count * 1.5))
+    for trigram, count in trigram_counts.most_common(30):
+        all_phrases.append((trigram, count * 2))
+
+    all_phrases.sort(key=lambda x: x[1], reverse=True)
+    return [phrase for phrase, _ in all_phrases[:30]]
+
+def time_call(func, *args):
+    """Run a function once and return its result and run time in seconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def measure_peak(func, *args):
+    """Run a function once and return its result, run time, and peak traced memory in bytes."""
+    tracemalloc.start()
+    result = time_call(func, *args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark topic extraction')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000],
+                        help='Corpus sizes (number of titles)')
+    parser.add_argument('--skip-legacy-above', type=int, default=10000,
+                        help='Skip the original implementation for larger corpora')
+    parser.add_argument('--processes', type=int, default=0,
+                        help='Time parallel extraction with this many processes')
+    parser.add_argument('--capacity', type=int, default=0,
+                        help='Compare approximate counting with this summary capacity')
+    args = parser.parse_args()
+
+    if args.capacity:
+        print(f"{'titles':>8}  {'exact':>18}  {'approximate':>18}  top-30 overlap")
+        for size in args.sizes:
+            titles = generate_titles(size)
+            (topics, elapsed), peak = measure_peak(extract_topics, titles)
+            (approximate_topics, approximate_elapsed), approximate_peak = measure_peak(
+                lambda texts: extract_topics(texts, counting='approximate', capacity=args.capacity), titles)
+            overlap = len(set(topics) & set(approximate_topics))
+            print(f"{size:>8}  {elapsed:>7.3f}s {peak / 2**20:>7.1f}MB  "
+                  f"{approximate_elapsed:>7.3f}s {approximate_peak / 2**20:>7.1f}MB  {overlap:>6}/{len(topics)}")
+        return
+
+    if args.processes > 1:
+        print(f"{'titles':>8}  {'serial':>10}  {'parallel':>10}  {'speedup':>8}  output")
+        for size in args.sizes:
+            titles = generate_titles(size)
+            topics, elapsed = time_call(extract_topics, titles)
+            parallel_topics, parallel_elapsed = time_call(
+                lambda texts: extract_topics(texts, processes=args.processes, min_parallel_texts=0), titles)
+            status = 'identical' if topics == parallel_topics else 'DIFFERENT'
+            print(f"{size:>8}  {elapsed:>9.3f}s  {parallel_elapsed:>9.3f}s  "
+                  f"{elapsed / parallel_elapsed:>7.1f}x  {status}")
+        return
+
+    print(f"{'titles':>8}  {'current':>10}  {'legacy':>10}  {'speedup':>8}  output")
+    for size in args.sizes:
+        titles = generate_titles(size)
+        topics, elapsed = time_call(extract_topics, titles)
+
+        if size > args.skip_legacy_above:
+            print(f"{size:>8}  {elapsed:>9.3f}s  {'skipped':>10}  {'-':>8}  -")
+            continue
+
+        legacy_topics, legacy_elapsed = time_call(legacy_extract_topics, titles)
+        status = 'identical' if topics == legacy_topics else 'DIFFERENT'
+        print(f"{size:>8}  {elapsed:>9.3f}s  {legacy_elapsed:>9.3f}s  {legacy_elapsed / elapsed:>7.1f}x  {status}")
+
+if __name__ == '__main__':
+    main()
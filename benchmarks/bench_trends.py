@@ -0,0 +1,71 @@
+"""
+Benchmark refreshing trending topics with the rolling topic stream.
+
+Fills a stream with a history of synthetic titles, then times a refresh
+that ingests a batch of new titles and ranks rising topics, against
+recomputing topics from scratch over the whole window with extract_topics.
+It also times a persisted refresh (update_topic_stream on a temporary
+state store) that finds no new titles. Both refreshes should stay flat
+as the history grows.
+
+Usage:
+    python -m benchmarks.bench_trends [--days 7 30] [--per-day 2000] [--batch 200]
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_titles
+from data_processing.topics import extract_topics
+from data_processing import trends
+from data_processing.trends import DAY, HOUR, TopicStream, update_topic_stream
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark rolling topic refreshes')
+    parser.add_argument('--days', type=int, nargs='+', default=[7, 30], help='Days of history')
+    parser.add_argument('--per-day', type=int, default=2000, help='Titles ingested per day')
+    parser.add_argument('--batch', type=int, default=200, help='New titles per refresh')
+    args = parser.parse_args()
+
+    print(f"{'days':>6} {'titles':>8} {'stream refresh':>15} {'persisted':>10} {'full recompute':>15}")
+    for days in args.days:
+        titles = generate_titles(days * args.per_day + args.batch)
+        history, batch = titles[:-args.batch], titles[-args.batch:]
+
+        stream = TopicStream(history_days=days + 1)
+        start = 20000 * DAY
+        for day in range(days):
+            chunk = history[day * args.per_day:(day + 1) * args.per_day]
+            stream.ingest((((day, i), title) for i, title in enumerate(chunk)), now=start + day * DAY)
+
+        # The refresh lands an hour into the last day, whose titles are recent
+        started = time.perf_counter()
+        stream.ingest(((('new', i), title) for i, title in enumerate(batch)), now=start + (days - 1) * DAY + HOUR)
+        stream.trending()
+        refresh = time.perf_counter() - started
+
+        # Persist the same history, then refresh again with nothing new
+        root = tempfile.mkdtemp(prefix='bench-state-')
+        try:
+            for day in range(days):
+                chunk = history[day * args.per_day:(day + 1) * args.per_day]
+                update_topic_stream('bench:topic_stream', (((day, i), title) for i, title in enumerate(chunk)),
+                                    now=start + day * DAY, root=root, history_days=days + 1)
+
+            started = time.perf_counter()
+            update_topic_stream('bench:topic_stream', [], now=start + (days - 1) * DAY + HOUR, root=root,
+                                history_days=days + 1).trending()
+            persisted = time.perf_counter() - started
+        finally:
+            trends._streams.clear()
+            shutil.rmtree(root)
+
+        started = time.perf_counter()
+        extract_topics(titles)
+        recompute = time.perf_counter() - started
+
+        print(f"{days:>6} {len(titles):>8} {refresh:>14.3f}s {persisted:>9.3f}s {recompute:>14.3f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,473 @@
+"""
+End-to-end HTTP load test of the web app.
+
+Starts the mock upstream server (benchmarks/mock_upstream.py) and the app in
+their own processes, the app pointed at the mock and caching into a scratch
+directory, then drives the app over HTTP with scripted scenarios:
+
+- dashboard: virtual users loading the dashboard, each page load fetching
+  the page's data and chart endpoints over a few parallel connections, as
+  a browser does
+- polling: steady requests to the data endpoints at a fixed rate. The load
+  is open loop: latency counts from the scheduled send time, so a slow app
+  can't hide its queueing by slowing the load down
+- stampede: many clients requesting the dashboard endpoints at the same
+  moment right after the cache was cleared
+
+The dashboard and polling scenarios run on a warm cache (every endpoint is
+requested once beforehand). Each scenario reports latency percentiles and
+error rates per endpoint, and the upstream requests it caused, read from
+the mock's counters.
+
+Usage:
+    python -m benchmarks.load [--scenarios dashboard polling stampede] [--users 5] [--page-loads 3]
+                              [--rate 5] [--duration 30] [--clients 20] [--upstream-latency 50]
+                              [--upstream-error-rate 0.0] [--json results.json]
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Requests made by one load of the dashboard page (templates/index.html); the
+# page's <img> tags request the charts again next to its own chart fetches
+DASHBOARD_REQUESTS = [
+    '/api/data/popularity',
+    '/api/data/trending_topics',
+    '/api/data/emerging_repos',
+    '/api/data/hot_discussions',
+    '/api/data/insights',
+    '/api_viz_popularity',
+    '/api_viz_trending_topics',
+    '/api_viz_clusters',
+    '/api_viz_popularity',
+    '/api_viz_trending_topics',
+    '/api_viz_clusters'
+]
+
+# Endpoints requested in turn by the polling scenario
+POLLING_REQUESTS = [
+    '/api/data/popularity',
+    '/api/data/trending_topics',
+    '/api/data/emerging_repos',
+    '/api/data/hot_discussions'
+]
+
+# Parallel connections of one browser to a host
+BROWSER_CONNECTIONS = 6
+
+# Seconds to wait for a response, and for a server to start
+REQUEST_TIMEOUT = 300
+STARTUP_TIMEOUT = 120
+
+# Latency percentiles reported
+PERCENTILES = (50, 90, 99)
+
+def free_port():
+    """Return a TCP port nobody listens on."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_until_up(url, timeout=STARTUP_TIMEOUT, process=None):
+    """
+    Wait for a server to answer.
+
+    Args:
+        url (str): URL requested until it responds
+        timeout (float): Seconds to wait
+        process (subprocess.Popen, optional): The server's process, to stop
+            waiting if it exits
+
+    Raises:
+        RuntimeError: If the server didn't answer in time or exited
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Server for {url} exited with code {process.returncode}")
+        try:
+            requests.get(url, timeout=5)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server for {url} did not start within {timeout}s")
+
+def serve_app(port, cache_dir):
+    """
+    Run the app for a load test (in the process started by ``Stack``).
+
+    Cached values go to ``cache_dir``, and persisted state and report
+    snapshots next to it, instead of the working tree.
+
+    Args:
+        port (int): Port to listen on
+        cache_dir (str): Scratch cache directory
+    """
+    from utils.cache import set_cache_dir
+    from utils.config import config
+    from utils.state import set_state_dir
+
+    # Redirect the cache before the app starts its expired-cache sweep
+    set_cache_dir(cache_dir)
+    set_state_dir(os.path.join(os.path.dirname(cache_dir), 'state'))
+    config.set('snapshots.path', os.path.join(os.path.dirname(cache_dir), 'snapshots'))
+
+    from app import app
+    app.run(host='127.0.0.1', port=port, threaded=True)
+
+class Stack:
+    """The mock upstream and the app, each running in a subprocess."""
+
+    def __init__(self, upstream_latency=50.0, upstream_error_rate=0.0, upstream_args=()):
+        """
+        Args:
+            upstream_latency (float): Mean upstream latency in milliseconds
+            upstream_error_rate (float): Share of upstream requests failing
+            upstream_args (tuple): Other mock_upstream arguments
+        """
+        self.upstream_args = ['--latency', str(upstream_latency), '--error-rate', str(upstream_error_rate),
+                              *upstream_args]
+        self.scratch = None
+        self.cache_dir = None
+        self.app_url = None
+        self.upstream_url = None
+        self._processes = []
+
+    def _spawn(self, name, args, env=None):
+        """Start a Python module in a subprocess logging to the scratch directory."""
+        log = open(os.path.join(self.scratch, f"{name}.log"), 'w')
+        process = subprocess.Popen([sys.executable, '-m', *args], cwd=ROOT, env=env,
+                                   stdout=log, stderr=subprocess.STDOUT)
+        log.close()
+        self._processes.append(process)
+        return process
+
+    def __enter__(self):
+        self.scratch = tempfile.mkdtemp(prefix='load-test-')
+        self.cache_dir = os.path.join(self.scratch, 'cache')
+        try:
+            upstream_port = free_port()
+            self.upstream_url = f"http://127.0.0.1:{upstream_port}"
+            upstream = self._spawn('upstream', ['benchmarks.mock_upstream', '--port', str(upstream_port),
+                                                *self.upstream_args])
+            wait_until_up(f"{self.upstream_url}/_mock/stats", process=upstream)
+
+            # Credentials only need to be present; the mock doesn't check them
+            env = dict(os.environ, UPSTREAM_BASE_URL=self.upstream_url, NEWS_API_KEY='mock',
+                       REDDIT_CLIENT_ID='', REDDIT_CLIENT_SECRET='')
+            app_port = free_port()
+            self.app_url = f"http://127.0.0.1:{app_port}"
+            app = self._spawn('app', ['benchmarks.load', '--serve-app', str(app_port),
+                                      '--cache-dir', self.cache_dir], env=env)
+            wait_until_up(f"{self.app_url}/", process=app)
+        except Exception:
+            self.__exit__(*sys.exc_info())
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self._processes = []
+        shutil.rmtree(self.scratch, ignore_errors=True)
+
+    def clear_cache(self):
+        """Delete everything the app cached (its rolling state is kept, as when clearing the cache)."""
+        for path in Path(self.cache_dir).glob('*.cache'):
+            path.unlink()
+
+    def reset_upstream(self):
+        """Zero the mock's request counters."""
+        requests.post(f"{self.upstream_url}/_mock/reset", timeout=10).raise_for_status()
+
+    def upstream_stats(self):
+        """Return the mock's request counters by upstream."""
+        response = requests.get(f"{self.upstream_url}/_mock/stats", timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+class Recorder:
+    """Collects the outcome of every request a scenario makes."""
+
+    def __init__(self, base_url):
+        """
+        Args:
+            base_url (str): URL of the app
+        """
+        self.base_url = base_url
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def add(self, name, latency, ok):
+        """
+        Record an outcome.
+
+        Args:
+            name (str): Endpoint, or another name for what was timed
+            latency (float): Seconds
+            ok (bool): Whether it succeeded
+        """
+        with self._lock:
+            self.samples.append((name, latency, ok))
+
+    def get(self, path, scheduled=None):
+        """
+        Request a path of the app and record the outcome. Responses with an
+        error status and failed requests count as errors.
+
+        Args:
+            path (str): Path of the endpoint
+            scheduled (float, optional): ``time.perf_counter()`` at which the
+                request was due; latency counts from then rather than from
+                when it was sent
+
+        Returns:
+            bool: Whether the request succeeded
+        """
+        start = time.perf_counter() if scheduled is None else scheduled
+        try:
+            response = requests.get(f"{self.base_url}{path}", timeout=REQUEST_TIMEOUT)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        self.add(path, time.perf_counter() - start, ok)
+        return ok
+
+def run_dashboard(recorder, users=5, page_loads=3, **options):
+    """
+    Virtual users each loading the dashboard page several times in a row.
+
+    Every page load is also recorded as a whole under 'page load', from
+    requesting the page until its last fetch finished.
+    """
+    def user():
+        with ThreadPoolExecutor(BROWSER_CONNECTIONS) as browser:
+            for _ in range(page_loads):
+                start = time.perf_counter()
+                ok = recorder.get('/')
+                ok = all(browser.map(recorder.get, DASHBOARD_REQUESTS)) and ok
+                recorder.add('page load', time.perf_counter() - start, ok)
+
+    threads = [threading.Thread(target=user) for _ in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def run_polling(recorder, rate=5.0, duration=30.0, **options):
+    """Requests to the data endpoints at a fixed rate, whatever the latency."""
+    count = int(rate * duration)
+    with ThreadPoolExecutor(max(1, int(rate * 10))) as pool:
+        start = time.perf_counter()
+        for i in range(count):
+            scheduled = start + i / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(recorder.get, POLLING_REQUESTS[i % len(POLLING_REQUESTS)], scheduled)
+
+def run_stampede(recorder, clients=20, **options):
+    """Many clients requesting the dashboard endpoints at the same moment."""
+    barrier = threading.Barrier(clients)
+
+    def client(path):
+        barrier.wait()
+        recorder.get(path)
+
+    threads = [threading.Thread(target=client, args=(DASHBOARD_REQUESTS[i % len(DASHBOARD_REQUESTS)],))
+               for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+class Scenario:
+    """A scripted load on the app."""
+
+    def __init__(self, name, cold, run):
+        """
+        Args:
+            name (str): Scenario name
+            cold (bool): Whether it starts on an empty cache (otherwise on
+                a warmed one)
+            run (callable): Drives the load through a Recorder, taking the
+                load options as keyword arguments
+        """
+        self.name = name
+        self.cold = cold
+        self.run = run
+
+SCENARIOS = {
+    'dashboard': Scenario('dashboard', cold=False, run=run_dashboard),
+    'polling': Scenario('polling', cold=False, run=run_polling),
+    'stampede': Scenario('stampede', cold=True, run=run_stampede)
+}
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values (list): Numbers
+        q (float): Percentile, 0 to 100
+
+    Returns:
+        float: The smallest value with at least q% of the values at or
+               below it, or None if there are none
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+def summarize(samples, duration):
+    """
+    Aggregate request outcomes.
+
+    Args:
+        samples (list): (name, latency, ok) tuples
+        duration (float): Seconds the scenario ran
+
+    Returns:
+        dict: Requests, errors, error rate and latency percentiles by
+              endpoint, and overall; overall figures leave out samples that
+              aren't single requests (e.g. 'page load')
+    """
+    def stats(group):
+        latencies = [latency for _, latency, _ in group]
+        errors = sum(1 for _, _, ok in group if not ok)
+        summary = {
+            'requests': len(group),
+            'errors': errors,
+            'error_rate': errors / len(group) if group else 0.0
+        }
+        summary.update({f"p{q}": percentile(latencies, q) for q in PERCENTILES})
+        summary['max'] = max(latencies) if latencies else None
+        return summary
+
+    by_name = {}
+    for sample in samples:
+        by_name.setdefault(sample[0], []).append(sample)
+
+    requests_made = [sample for sample in samples if sample[0].startswith('/')]
+    overall = stats(requests_made)
+    overall['throughput'] = len(requests_made) / duration if duration > 0 else None
+    return {
+        'duration': duration,
+        'overall': overall,
+        'endpoints': {name: stats(group) for name, group in sorted(by_name.items())}
+    }
+
+def warm_up(stack):
+    """Request every dashboard endpoint once so the cache is populated."""
+    recorder = Recorder(stack.app_url)
+    for path in dict.fromkeys(DASHBOARD_REQUESTS):
+        recorder.get(path)
+
+def run_scenario(stack, scenario, **options):
+    """
+    Run a scenario against a started Stack.
+
+    Args:
+        stack (Stack): The running servers
+        scenario (Scenario): Scenario to run
+        **options: Load options passed to the scenario
+
+    Returns:
+        dict: The summary of its requests (see ``summarize``), with its name
+              and the upstream requests it caused
+    """
+    if scenario.cold:
+        stack.clear_cache()
+    else:
+        warm_up(stack)
+    stack.reset_upstream()
+
+    recorder = Recorder(stack.app_url)
+    start = time.perf_counter()
+    scenario.run(recorder, **options)
+    result = summarize(recorder.samples, time.perf_counter() - start)
+    result['scenario'] = scenario.name
+    result['upstream'] = stack.upstream_stats()
+    return result
+
+def _format_ms(seconds):
+    return '-' if seconds is None else f"{seconds * 1000:.0f}"
+
+def print_result(result):
+    """Print a scenario's summary as a table."""
+    overall = result['overall']
+    print(f"\n{result['scenario']}: {overall['requests']} requests in {result['duration']:.1f}s "
+          f"({overall['throughput']:.1f}/s), {overall['error_rate']:.1%} errors")
+    print(f"{'endpoint':<28} {'requests':>8} {'errors':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, stats in result['endpoints'].items():
+        print(f"{name:<28} {stats['requests']:>8} {stats['errors']:>7} "
+              f"{_format_ms(stats['p50']):>8} {_format_ms(stats['p90']):>8} "
+              f"{_format_ms(stats['p99']):>8} {_format_ms(stats['max']):>8}")
+
+    counts = ', '.join(f"{upstream} {stats['requests']}"
+                       + (f" ({stats['errors']} errors, {stats['rate_limited']} rate limited)"
+                          if stats['errors'] or stats['rate_limited'] else '')
+                       for upstream, stats in sorted(result['upstream'].items()) if stats['requests'])
+    print(f"upstream requests: {counts or 'none'}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the web app against the mock upstream')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS),
+                        help='Scenarios to run, in order')
+    parser.add_argument('--users', type=int, default=5, help='Dashboard: virtual users')
+    parser.add_argument('--page-loads', type=int, default=3, help='Dashboard: page loads per user')
+    parser.add_argument('--rate', type=float, default=5.0, help='Polling: requests per second')
+    parser.add_argument('--duration', type=float, default=30.0, help='Polling: seconds')
+    parser.add_argument('--clients', type=int, default=20, help='Stampede: simultaneous clients')
+    parser.add_argument('--upstream-latency', type=float, default=50.0, help='Mean upstream latency in milliseconds')
+    parser.add_argument('--upstream-error-rate', type=float, default=0.0, help='Share of upstream requests failing')
+    parser.add_argument('--json', help='Also write the results to this file')
+    parser.add_argument('--serve-app', type=int, metavar='PORT', help=argparse.SUPPRESS)
+    parser.add_argument('--cache-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_app:
+        serve_app(args.serve_app, args.cache_dir)
+        return
+
+    options = {
+        'users': args.users,
+        'page_loads': args.page_loads,
+        'rate': args.rate,
+        'duration': args.duration,
+        'clients': args.clients
+    }
+    results = []
+    with Stack(upstream_latency=args.upstream_latency, upstream_error_rate=args.upstream_error_rate) as stack:
+        for name in args.scenarios:
+            result = run_scenario(stack, SCENARIOS[name], **options)
+            print_result(result)
+            results.append(result)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'options': options, 'upstream_latency': args.upstream_latency,
+                       'upstream_error_rate': args.upstream_error_rate, 'results': results}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,569 @@
+"""
+Local stand-in for the upstream APIs, so load and latency tests run offline
+without spending GitHub, Stack Exchange, Reddit, NewsAPI or Google quota.
+
+Each upstream is served under its own prefix (/github, /stackexchange,
+/hackernews, /reddit, /newsapi and /trends), the names read by
+``utils.http.base_url``, so one environment variable points every client
+at the server:
+
+    python -m benchmarks.mock_upstream --port 5001 --latency 80 --error-rate 0.01
+    UPSTREAM_BASE_URL=http://127.0.0.1:5001 python main.py --mode web
+
+Responses carry synthetic data (see benchmarks/synthetic.py) in the shape
+of the real APIs, after a sampled latency. A share of requests fails with
+503, and every upstream enforces a request budget per time window with
+rate-limit headers. Settings can be set per upstream
+(``--set github.latency=300``) and changed while the server runs by
+POSTing JSON to /_mock/settings; request counts are served at /_mock/stats.
+
+Usage:
+    python -m benchmarks.mock_upstream [--port 5001] [--latency 50] [--latency-distribution lognormal]
+                                       [--error-rate 0.0] [--rate-limit 5000] [--scale 1]
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+from flask import Flask, Response, g, jsonify, request
+
+from benchmarks.synthetic import (generate_articles, generate_posts, generate_questions,
+                                  generate_repositories, generate_stories)
+from data_processing.topics import TECH_TERMS
+
+UPSTREAMS = ('github', 'stackexchange', 'hackernews', 'reddit', 'newsapi', 'trends')
+
+LATENCY_DISTRIBUTIONS = ('none', 'fixed', 'uniform', 'exponential', 'lognormal')
+
+# Settings of every upstream unless overridden
+DEFAULT_SETTINGS = {
+    'latency': 50.0,                    # Mean latency in milliseconds
+    'latency_distribution': 'lognormal',
+    'latency_sigma': 0.5,               # Spread of the lognormal distribution
+    'error_rate': 0.0,                  # Share of requests failing with 503
+    'rate_limit': 5000,                 # Requests per window (None for no limit)
+    'rate_window': 3600                 # Length of a rate-limit window in seconds
+}
+
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'Java', 'C++', 'Kotlin', 'Swift', 'Ruby']
+
+# Stack Overflow tags: languages and tech terms, hyphenated like real tags
+TAGS = [language.lower() for language in LANGUAGES] + sorted(term.replace(' ', '-') for term in TECH_TERMS)
+
+# GitHub search serves at most this many results per query
+GITHUB_SEARCH_LIMIT = 1000
+
+# Google Trends prefixes its JSON with characters pytrends trims
+TRENDS_EXPLORE_PREFIX = ")]}'"
+TRENDS_WIDGET_PREFIX = ")]}',"
+
+def sample_latency(rng, distribution, mean, sigma=0.5):
+    """
+    Draw a latency from a distribution.
+
+    Args:
+        rng (random.Random): Random generator
+        distribution (str): One of LATENCY_DISTRIBUTIONS
+        mean (float): Mean latency in milliseconds
+        sigma (float): Standard deviation of the log of a lognormal latency
+
+    Returns:
+        float: Latency in seconds
+    """
+    if distribution not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown latency distribution '{distribution}'; "
+                         f"expected one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+    if distribution == 'none' or mean <= 0:
+        return 0.0
+    if distribution == 'fixed':
+        milliseconds = mean
+    elif distribution == 'uniform':
+        milliseconds = rng.uniform(0, 2 * mean)
+    elif distribution == 'exponential':
+        milliseconds = rng.expovariate(1.0 / mean)
+    else:
+        # Long-tailed like real APIs; mu is chosen so the mean stays ``mean``
+        milliseconds = rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+    return milliseconds / 1000.0
+
+def _seed(*parts):
+    """Stable seed derived from strings, the same in every process."""
+    return zlib.crc32(':'.join(str(part) for part in parts).encode('utf-8'))
+
+class MockUpstream:
+    """
+    Synthetic upstream data and the simulated network behaviour of each
+    upstream: latency, failures and rate limits.
+    """
+
+    def __init__(self, settings=None, scale=1, seed=0, now=None):
+        """
+        Args:
+            settings (dict, optional): Defaults overriding DEFAULT_SETTINGS, plus
+                optional per-upstream overrides under the upstream's name,
+                e.g. ``{'latency': 20, 'github': {'error_rate': 0.1}}``
+            scale (int): Multiplier of the amount of synthetic data
+            seed (int): Random seed, so the data is reproducible
+            now (datetime, optional): Time the data is generated around
+        """
+        self.seed = seed
+        self.scale = scale
+        self.now = now or datetime.now(timezone.utc)
+        self.settings = {upstream: dict(DEFAULT_SETTINGS) for upstream in UPSTREAMS}
+        self.configure(settings or {})
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._windows = {}
+        self.stats = {}
+        self.reset_stats()
+
+        self.repositories = self._generate_repositories(3000 * scale)
+        self.questions = self._generate_questions(2000 * scale)
+        self.tags = self._generate_tags()
+        self.stories = {story['id']: story for story in self._generate_stories(500)}
+        self.articles = self._generate_articles(500 * scale)
+        self._posts = {}
+
+    def configure(self, settings):
+        """
+        Update the settings.
+
+        Args:
+            settings (dict): Settings for every upstream, plus optional
+                per-upstream overrides under the upstream's name
+
+        Raises:
+            ValueError: If a setting or upstream is unknown
+        """
+        for name, value in settings.items():
+            if name in UPSTREAMS:
+                overrides = value
+                upstreams = [name]
+            else:
+                overrides = {name: value}
+                upstreams = UPSTREAMS
+
+            for setting, setting_value in overrides.items():
+                if setting not in DEFAULT_SETTINGS:
+                    raise ValueError(f"Unknown mock upstream setting '{setting}'")
+                if setting == 'latency_distribution' and setting_value not in LATENCY_DISTRIBUTIONS:
+                    raise ValueError(f"Unknown latency distribution '{setting_value}'")
+                for upstream in upstreams:
+                    self.settings[upstream][setting] = setting_value
+
+    def reset_stats(self):
+        """Zero the request counters and rate-limit windows."""
+        with self._lock:
+            self.stats = {upstream: {'requests': 0, 'errors': 0, 'rate_limited': 0} for upstream in UPSTREAMS}
+            self._windows = {}
+
+    def simulate(self, upstream):
+        """
+        Apply the latency, rate limit and failure rate of an upstream to a request.
+
+        Args:
+            upstream (str): One of UPSTREAMS
+
+        Returns:
+            tuple: Rate-limit headers, and the status code the request fails
+                   with (None if it succeeds)
+        """
+        settings = self.settings[upstream]
+        with self._lock:
+            delay = sample_latency(self._rng, settings['latency_distribution'], settings['latency'],
+                                   settings['latency_sigma'])
+            failed = self._rng.random() < settings['error_rate']
+            stats = self.stats[upstream]
+            stats['requests'] += 1
+
+            # Fixed windows, like GitHub's hourly budget
+            headers = {}
+            limited = False
+            if settings['rate_limit'] is not None:
+                now = time.time()
+                window_start, used = self._windows.get(upstream, (now, 0))
+                if now - window_start >= settings['rate_window']:
+                    window_start, used = now, 0
+                limited = used >= settings['rate_limit']
+                if not limited:
+                    used += 1
+                self._windows[upstream] = (window_start, used)
+
+                reset = window_start + settings['rate_window']
+                headers = {
+                    'X-RateLimit-Limit': str(settings['rate_limit']),
+                    'X-RateLimit-Remaining': str(settings['rate_limit'] - used),
+                    'X-RateLimit-Reset': str(int(reset))
+                }
+                if limited:
+                    headers['Retry-After'] = str(max(1, int(math.ceil(reset - now))))
+
+            if limited:
+                stats['rate_limited'] += 1
+            elif failed:
+                stats['errors'] += 1
+
+        time.sleep(delay)
+        if limited:
+            # GitHub reports an exhausted budget as 403, the others as 429
+            return headers, 403 if upstream == 'github' else 429
+        return headers, 503 if failed else None
+
+    def quota_remaining(self, upstream):
+        """Requests left in the current window of an upstream."""
+        limit = self.settings[upstream]['rate_limit']
+        if limit is None:
+            return 10000
+        with self._lock:
+            return limit - self._windows.get(upstream, (0, 0))[1]
+
+    def posts(self, subreddit):
+        """Top posts of a subreddit, generated on first request."""
+        with self._lock:
+            if subreddit not in self._posts:
+                self._posts[subreddit] = self._generate_posts(subreddit, 300 * self.scale)
+            return self._posts[subreddit]
+
+    def _generate_repositories(self, count):
+        """Repository search results, most starred first."""
+        rng = random.Random(_seed(self.seed, 'github'))
+        repositories = []
+        for repo in generate_repositories(count, LANGUAGES, seed=self.seed):
+            created_at = self.now - timedelta(days=rng.uniform(0, 30))
+            repositories.append({
+                'full_name': repo.name,
+                'html_url': repo.url,
+                'description': repo.description,
+                'language': repo.language,
+                'stargazers_count': repo.stars,
+                'forks_count': repo.forks,
+                'created_at': created_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'topics': repo.topics
+            })
+        repositories.sort(key=lambda repo: repo['stargazers_count'], reverse=True)
+        return repositories
+
+    def _generate_questions(self, count):
+        """Stack Overflow questions created over the last month."""
+        rng = random.Random(_seed(self.seed, 'stackexchange'))
+        questions = []
+        for question in generate_questions(count, TAGS, seed=self.seed):
+            question = question.to_dict()
+            question['creation_date'] = int((self.now - timedelta(days=rng.uniform(0, 30))).timestamp())
+            questions.append(question)
+        return questions
+
+    def _generate_tags(self):
+        """Stack Overflow tags with their question counts, most used first."""
+        counts = {tag: 0 for tag in TAGS}
+        for question in self.questions:
+            for tag in question['tags']:
+                counts[tag] += 1
+        return [{'name': tag, 'count': count * 1000, 'has_synonyms': False,
+                 'is_moderator_only': False, 'is_required': False}
+                for tag, count in sorted(counts.items(), key=lambda item: item[1], reverse=True)]
+
+    def _generate_stories(self, count):
+        """HackerNews stories, with IDs from 1."""
+        stories = []
+        for story in generate_stories(count, seed=self.seed):
+            story = story.to_dict()
+            story['id'] += 1
+            story['time'] = int(self.now.timestamp()) - story['id'] * 60
+            stories.append(story)
+        return stories
+
+    def _generate_posts(self, subreddit, count):
+        """A subreddit's top posts, in the raw listing format."""
+        posts = []
+        for i, post in enumerate(generate_posts(count, subreddit, seed=_seed(self.seed, subreddit))):
+            post = post.to_dict()
+            post['name'] = f"t3_{subreddit.lower()}{i}"
+            post['permalink'] = f"/r/{subreddit}/comments/{i}/"
+            posts.append(post)
+        posts.sort(key=lambda post: post['score'], reverse=True)
+        return posts
+
+    def _generate_articles(self, count):
+        """News articles, in the NewsAPI format."""
+        return [{'source': {'id': None, 'name': article.source}, 'title': article.title,
+                 'description': article.description, 'url': article.url, 'publishedAt': article.published_at,
+                 'content': article.content}
+                for article in generate_articles(count, seed=self.seed)]
+
+    def interest(self, keywords, points=13):
+        """
+        Weekly interest of keywords over the last points weeks, scaled so
+        the highest value of the request is 100 as Google does.
+
+        Args:
+            keywords (list): Search terms
+            points (int): Number of weekly values
+
+        Returns:
+            list: Unix timestamps and lists of values (one per keyword)
+        """
+        series = []
+        for keyword in keywords:
+            rng = random.Random(_seed(self.seed, 'trends', keyword.lower()))
+            level = 5 + rng.random() * 95
+            trend = rng.uniform(-0.05, 0.08)
+            series.append([max(0.0, level * (1 + trend * week) * rng.uniform(0.85, 1.15)) for week in range(points)])
+
+        peak = max((max(values) for values in series), default=0) or 1
+        start = self.now - timedelta(weeks=points)
+        return [(int((start + timedelta(weeks=week)).timestamp()),
+                 [int(round(values[week] / peak * 100)) for values in series])
+                for week in range(points)]
+
+def create_app(upstream):
+    """
+    Build the Flask app serving a MockUpstream.
+
+    Args:
+        upstream (MockUpstream): Data and simulated behaviour
+
+    Returns:
+        Flask: The app
+    """
+    app = Flask(__name__)
+
+    @app.before_request
+    def simulate_network():
+        name = request.path.strip('/').split('/')[0]
+        if name not in UPSTREAMS:
+            return None
+        g.rate_limit_headers, status = upstream.simulate(name)
+        if status is None:
+            return None
+        message = 'API rate limit exceeded' if status in (403, 429) else 'Mock upstream error'
+        return jsonify({'message': message}), status
+
+    @app.after_request
+    def add_rate_limit_headers(response):
+        response.headers.update(g.get('rate_limit_headers', {}))
+        return response
+
+    # GitHub
+
+    @app.route('/github/search/repositories')
+    def github_search():
+        query = request.args.get('q', '')
+        per_page = min(int(request.args.get('per_page', 30)), 100)
+        page = int(request.args.get('page', 1))
+
+        language = re.search(r'language:(\S+)', query)
+        created = re.search(r'created:>(\d{4}-\d{2}-\d{2})', query)
+        items = [repo for repo in upstream.repositories
+                 if (not language or (repo['language'] or '').lower() == language.group(1).lower())
+                 and (not created or repo['created_at'][:10] > created.group(1))]
+
+        available = min(len(items), GITHUB_SEARCH_LIMIT)
+        response = jsonify({
+            'total_count': len(items),
+            'incomplete_results': False,
+            'items': items[(page - 1) * per_page:min(page * per_page, available)]
+        })
+        if page * per_page < available:
+            next_url = f"{request.base_url}?{urlencode({**request.args.to_dict(), 'page': page + 1})}"
+            response.headers['Link'] = f'<{next_url}>; rel="next"'
+        return response
+
+    # Stack Exchange
+
+    @app.route('/stackexchange/questions')
+    def stackexchange_questions():
+        tagged = [tag for tag in request.args.get('tagged', '').split(';') if tag]
+        from_date = int(request.args.get('fromdate', 0))
+        to_date = int(request.args.get('todate', 2 ** 62))
+        page_size = min(int(request.args.get('pagesize', 30)), 100)
+        page = int(request.args.get('page', 1))
+
+        # Questions must carry every tag, like the real API
+        items = [question for question in upstream.questions
+                 if all(tag in question['tags'] for tag in tagged)
+                 and from_date <= question['creation_date'] <= to_date]
+        sort_field = 'creation_date' if request.args.get('sort') in ('creation', 'activity') else 'score'
+        items.sort(key=lambda question: question[sort_field], reverse=request.args.get('order', 'desc') == 'desc')
+
+        return jsonify({
+            'items': items[(page - 1) * page_size:page * page_size],
+            'has_more': page * page_size < len(items),
+            'quota_max': upstream.settings['stackexchange']['rate_limit'] or 10000,
+            'quota_remaining': upstream.quota_remaining('stackexchange')
+        })
+
+    @app.route('/stackexchange/tags')
+    def stackexchange_tags():
+        page_size = min(int(request.args.get('pagesize', 30)), 100)
+        return jsonify({'items': upstream.tags[:page_size], 'has_more': page_size < len(upstream.tags)})
+
+    @app.route('/stackexchange/filters/create')
+    def stackexchange_filter():
+        return jsonify({'items': [{'filter': '!mockfilter', 'filter_type': 'safe'}]})
+
+    # HackerNews
+
+    @app.route('/hackernews/topstories.json')
+    def hackernews_top_stories():
+        return jsonify(sorted(upstream.stories, key=lambda story_id: upstream.stories[story_id]['score'],
+                              reverse=True))
+
+    @app.route('/hackernews/item/<int:item_id>.json')
+    def hackernews_item(item_id):
+        return jsonify(upstream.stories.get(item_id))
+
+    # Reddit
+
+    @app.route('/reddit/api/v1/access_token', methods=['POST'])
+    def reddit_token():
+        return jsonify({'access_token': 'mock-token', 'token_type': 'bearer', 'expires_in': 86400})
+
+    @app.route('/reddit/r/<subreddit>/top.json')
+    def reddit_top(subreddit):
+        posts = upstream.posts(subreddit)
+        limit = min(int(request.args.get('limit', 25)), 100)
+        after = request.args.get('after')
+        start = next((i + 1 for i, post in enumerate(posts) if post['name'] == after), 0) if after else 0
+
+        page = posts[start:start + limit]
+        return jsonify({'kind': 'Listing', 'data': {
+            'children': [{'kind': 't3', 'data': post} for post in page],
+            'after': page[-1]['name'] if page and start + limit < len(posts) else None
+        }})
+
+    # NewsAPI
+
+    @app.route('/newsapi/everything')
+    def newsapi_everything():
+        if not request.args.get('apiKey'):
+            return jsonify({'status': 'error', 'code': 'apiKeyMissing', 'message': 'Your API key is missing.'}), 401
+
+        page_size = min(int(request.args.get('pageSize', 100)), 100)
+        page = int(request.args.get('page', 1))
+
+        # Each query gets its own slice of the articles
+        articles = upstream.articles
+        offset = _seed(request.args.get('q', '')) % len(articles)
+        rotated = articles[offset:] + articles[:offset]
+        return jsonify({'status': 'ok', 'totalResults': len(rotated),
+                        'articles': rotated[(page - 1) * page_size:page * page_size]})
+
+    # Google Trends (as called by pytrends)
+
+    def trends_response(prefix, data):
+        return Response(prefix + json.dumps(data), content_type='application/json; charset=utf-8')
+
+    @app.route('/trends/api/explore', methods=['GET', 'POST'])
+    def trends_explore():
+        comparison = json.loads(request.args.get('req', '{}')).get('comparisonItem', [])
+        keywords = [item['keyword'] for item in comparison]
+        timeframe = comparison[0]['time'] if comparison else 'today 3-m'
+
+        widgets = [{'id': 'TIMESERIES', 'token': 'mock-token', 'request': {'keywords': keywords, 'time': timeframe}}]
+        for keyword in keywords:
+            widgets.append({'id': 'RELATED_QUERIES', 'token': 'mock-token', 'request': {
+                'restriction': {'complexKeywordsRestriction': {'keyword': [{'type': 'BROAD', 'value': keyword}]}}
+            }})
+        return trends_response(TRENDS_EXPLORE_PREFIX, {'widgets': widgets})
+
+    @app.route('/trends/api/widgetdata/multiline')
+    def trends_interest_over_time():
+        keywords = json.loads(request.args.get('req', '{}')).get('keywords', [])
+        timeline = upstream.interest(keywords)
+        return trends_response(TRENDS_WIDGET_PREFIX, {'default': {'timelineData': [
+            {'time': str(timestamp), 'value': values, 'hasData': [value > 0 for value in values],
+             'isPartial': i == len(timeline) - 1}
+            for i, (timestamp, values) in enumerate(timeline)
+        ]}})
+
+    @app.route('/trends/api/widgetdata/relatedsearches')
+    def trends_related_queries():
+        restriction = json.loads(request.args.get('req', '{}')).get('restriction', {})
+        keyword = restriction.get('complexKeywordsRestriction', {}).get('keyword', [{}])[0].get('value', '')
+        rng = random.Random(_seed(upstream.seed, 'related', keyword))
+        terms = rng.sample(TAGS, 10)
+        return trends_response(TRENDS_WIDGET_PREFIX, {'default': {'rankedList': [
+            {'rankedKeyword': [{'query': f"{keyword} {term}", 'value': 100 - 8 * i} for i, term in enumerate(terms)]},
+            {'rankedKeyword': [{'query': f"{term} {keyword}", 'value': rng.randint(50, 5000)} for term in terms[:5]]}
+        ]}})
+
+    # Control endpoints
+
+    @app.route('/_mock/stats')
+    def mock_stats():
+        return jsonify(upstream.stats)
+
+    @app.route('/_mock/reset', methods=['POST'])
+    def mock_reset():
+        upstream.reset_stats()
+        return jsonify(upstream.stats)
+
+    @app.route('/_mock/settings', methods=['GET', 'POST'])
+    def mock_settings():
+        if request.method == 'POST':
+            try:
+                upstream.configure(request.get_json(force=True) or {})
+            except (ValueError, AttributeError) as e:
+                return jsonify({'message': str(e)}), 400
+        return jsonify(upstream.settings)
+
+    return app
+
+def _parse_setting(assignment):
+    """Parse a ``[upstream.]setting=value`` command-line override."""
+    name, _, value = assignment.partition('=')
+    upstream, _, setting = name.rpartition('.')
+    if value.lower() == 'none':
+        value = None
+    elif setting == 'rate_limit':
+        value = int(value)
+    elif setting != 'latency_distribution':
+        value = float(value)
+    return {upstream: {setting: value}} if upstream else {setting: value}
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve synthetic upstream API responses')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=5001, help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=DEFAULT_SETTINGS['latency'],
+                        help='Mean latency in milliseconds')
+    parser.add_argument('--latency-distribution', choices=LATENCY_DISTRIBUTIONS,
+                        default=DEFAULT_SETTINGS['latency_distribution'], help='Latency distribution')
+    parser.add_argument('--error-rate', type=float, default=DEFAULT_SETTINGS['error_rate'],
+                        help='Share of requests failing with 503')
+    parser.add_argument('--rate-limit', type=int, default=DEFAULT_SETTINGS['rate_limit'],
+                        help='Requests per upstream per window')
+    parser.add_argument('--rate-window', type=float, default=DEFAULT_SETTINGS['rate_window'],
+                        help='Rate-limit window in seconds')
+    parser.add_argument('--set', action='append', default=[], metavar='[UPSTREAM.]SETTING=VALUE',
+                        help='Override a setting, e.g. github.latency=300 (repeatable)')
+    parser.add_argument('--scale', type=int, default=1, help='Multiplier of the amount of synthetic data')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    settings = {
+        'latency': args.latency,
+        'latency_distribution': args.latency_distribution,
+        'error_rate': args.error_rate,
+        'rate_limit': args.rate_limit,
+        'rate_window': args.rate_window
+    }
+    upstream = MockUpstream(settings, scale=args.scale, seed=args.seed)
+    for assignment in args.set:
+        upstream.configure(_parse_setting(assignment))
+
+    print(f"Mock upstream on http://{args.host}:{args.port}; "
+          f"run the app with UPSTREAM_BASE_URL=http://{args.host}:{args.port}")
+    create_app(upstream).run(host=args.host, port=args.port, threaded=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,451 @@
+"""
+Benchmark suite for the processor and analyzer hot paths.
+
+Each case times one hot path on synthetic data at several scales: 10^2 to
+10^6 documents for topic extraction and correlations (10^5 for trending
+topics, whose indexed corpus of 10^6 documents needs several GB), and 30 to
+5,000 technologies for scoring, clustering and every DataAnalyzer chart
+(300 for the clusters graph, whose layout is quadratic).
+For each case and size it reports the median time, the throughput (items
+per second) and the peak memory traced while the path runs, and for each
+case how time scales with size: the exponent of a power-law fit, where 1
+is linear. The largest sizes take minutes each; ``--max-size 10000`` runs
+the suite in a few minutes.
+
+A run can be saved as a JSON baseline under benchmarks/baselines/ and a
+later run compared against it, flagging every case and size that got
+slower or used more memory than the threshold allows. Timings depend on
+the machine, so compare baselines recorded on the same machine.
+
+Usage:
+    python -m benchmarks.suite [--cases popularity extract_topics] [--max-size 10000] [--repeat 3]
+                               [--save NAME] [--compare NAME] [--threshold 1.25]
+"""
+import argparse
+import functools
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import matplotlib
+matplotlib.use('Agg')
+
+from benchmarks.synthetic import (generate_articles, generate_posts, generate_questions, generate_repositories,
+                                  generate_stories, generate_tech_documents, generate_technologies,
+                                  generate_titles)
+from data_processing.analyzer import DataAnalyzer
+from data_processing.clustering import TechnologyClusterer
+from data_processing.context import computation_context
+from data_processing.correlation import CorrelationEngine
+from data_processing.processor import DataProcessor
+from utils.config import config
+from utils.text import text_pipeline
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+
+DOCUMENT_SIZES = [100, 10000, 1000000]
+TECHNOLOGY_SIZES = [30, 300, 5000]
+
+# Building the indexed corpus of a million documents takes several GB
+CORPUS_SIZES = [100, 10000, 100000]
+
+# The clusters graph lays out every clustered technology as a node of a
+# force-directed graph, quadratic in the technologies drawn: 5,000 take
+# longer than the rest of the suite
+GRAPH_SIZES = [30, 100, 300]
+
+# Each run computes from scratch rather than from persisted rolling windows
+# or previously drawn charts
+ISOLATED_SETTINGS = {
+    'trends.enabled': False,
+    'correlations.accumulate': False,
+    'snapshots.enabled': False,
+    'charts.cache': False
+}
+
+# Clustering threshold for the clusters chart, low enough to draw many clusters
+CHART_CLUSTER_THRESHOLD = 0.05
+
+SUBREDDITS = ['technology', 'programming', 'webdev', 'artificial', 'MachineLearning',
+              'datascience', 'compsci', 'Python', 'javascript', 'cybersecurity']
+
+CLIENTS = ('github_client', 'stackoverflow_client', 'pytrends_client',
+           'hackernews_client', 'news_client', 'reddit_client')
+
+class SyntheticClients:
+    """
+    Serves synthetic data through the client methods DataProcessor calls.
+
+    Unlike the real clients, limits are ignored, so the hot paths see the
+    benchmark's scale rather than the sizes the app requests upstream.
+    """
+
+    def __init__(self, technologies=30, documents=100, seed=0):
+        """
+        Args:
+            technologies (int): Number of technologies each platform ranks
+            documents (int): Number of repositories and questions, and of
+                news articles, Reddit posts and HackerNews stories (each
+                source is generated when first requested)
+            seed (int): Random seed
+        """
+        self.technologies = generate_technologies(technologies)
+        self.documents = documents
+        self.seed = seed
+
+    @functools.cached_property
+    def repositories(self):
+        # Repositories and questions carry some of the 30 most popular technologies
+        return generate_repositories(self.documents // 2, generate_technologies(30), seed=self.seed)
+
+    @functools.cached_property
+    def questions(self):
+        tags = [tech.lower() for tech in generate_technologies(30)]
+        return generate_questions(self.documents - self.documents // 2, tags, seed=self.seed)
+
+    @functools.cached_property
+    def _questions_by_tag(self):
+        questions_by_tag = {}
+        for question in self.questions:
+            for tag in question['tags']:
+                questions_by_tag.setdefault(tag, []).append(question)
+        return questions_by_tag
+
+    @functools.cached_property
+    def _discussions(self):
+        """News articles, Reddit posts by subreddit and HackerNews stories."""
+        articles = generate_articles(self.documents // 3, seed=self.seed)
+        posts = {subreddit: generate_posts(self.documents // 3 // len(SUBREDDITS), subreddit, seed=i)
+                 for i, subreddit in enumerate(SUBREDDITS)}
+        stories = generate_stories(self.documents - len(articles) - sum(map(len, posts.values())), seed=self.seed)
+
+        # Titles follow a skewed distribution over a large vocabulary, like real headlines
+        titles = iter(generate_titles(self.documents, seed=self.seed))
+        for item in articles + stories + [post for subreddit_posts in posts.values() for post in subreddit_posts]:
+            item['title'] = next(titles)
+        return articles, posts, stories
+
+    # GitHub
+    def get_language_stats(self, **kwargs):
+        return {tech: 100000 // (rank + 1) for rank, tech in enumerate(self.technologies)}
+
+    def get_trending_repositories(self, language=None, **kwargs):
+        if language:
+            return [repo for repo in self.repositories if repo['language'] == language]
+        return self.repositories
+
+    # Stack Overflow
+    def get_popular_tags(self, **kwargs):
+        return [{'name': tech.lower(), 'count': 50000 // (rank + 2)} for rank, tech in enumerate(self.technologies)]
+
+    def get_top_questions(self, **kwargs):
+        return self.questions
+
+    def get_questions_by_tag(self, tags, **kwargs):
+        return {tag: self._questions_by_tag.get(tag, []) for tag in tags}
+
+    # PyTrends
+    def get_trending_technologies(self, **kwargs):
+        return [{'name': tech, 'popularity': 100.0 / (rank + 1)} for rank, tech in enumerate(self.technologies)]
+
+    # HackerNews, news and Reddit
+    def get_tech_stories(self, **kwargs):
+        return self._discussions[2]
+
+    def get_tech_news(self, **kwargs):
+        return self._discussions[0]
+
+    def get_tech_subreddit_posts(self, **kwargs):
+        return self._discussions[1]
+
+    def get_top_posts(self, subreddit, **kwargs):
+        return self._discussions[1].get(subreddit, [])
+
+def _processor(clients):
+    """DataProcessor fetching from synthetic clients."""
+    processor = DataProcessor(max_workers=1)
+    for name in CLIENTS:
+        setattr(processor, name, clients)
+    return processor
+
+def _correlations(technologies):
+    """Correlations of technologies co-occurring in ten documents per technology."""
+    names = generate_technologies(technologies)
+    engine = CorrelationEngine(names)
+    for document in generate_tech_documents(10 * technologies, names):
+        engine.add_document(document)
+    return engine.to_dict()
+
+@functools.lru_cache(maxsize=1)
+def chart_inputs(technologies):
+    """
+    Build the data every chart draws, at one scale.
+
+    Args:
+        technologies (int): Number of technologies (and of repositories and
+            discussions)
+
+    Returns:
+        dict: Inputs by DataAnalyzer method name
+    """
+    clients = SyntheticClients(technologies=technologies, documents=10 * technologies)
+    processor = _processor(clients)
+    correlations = _correlations(technologies)
+    with computation_context():
+        popularity = processor.get_technology_popularity()
+        topics = processor.get_trending_topics()
+
+    clusters = [{'name': processor._determine_cluster_name(cluster), 'technologies': cluster}
+                for cluster in TechnologyClusterer(threshold=CHART_CLUSTER_THRESHOLD).cluster(correlations)]
+    repositories = [dict(repo.to_dict(), related_technology=repo['language'])
+                    for repo in clients.repositories[:technologies]]
+    discussions = [{'title': question['title'], 'url': question['link'], 'source': 'stackoverflow',
+                    'score': question['score'], 'engagement_score': question['score'] * 2 + question['view_count'] / 100}
+                   for question in clients.questions[:technologies]]
+    return {
+        'create_technology_popularity_chart': popularity,
+        'create_trending_topics_chart': topics,
+        'create_tech_correlation_heatmap': correlations,
+        'create_technology_clusters_graph': clusters,
+        'create_hot_discussions_chart': discussions,
+        'create_emerging_repos_chart': repositories
+    }
+
+class Case:
+    """A hot path timed at several input sizes."""
+
+    def __init__(self, name, unit, sizes, setup, run):
+        """
+        Args:
+            name (str): Case name
+            unit (str): What the size counts, e.g. 'documents'
+            sizes (list): Input sizes, smallest first
+            setup (callable): Builds the input of a size (not timed)
+            run (callable): Runs the hot path on an input
+        """
+        self.name = name
+        self.unit = unit
+        self.sizes = sizes
+        self.setup = setup
+        self.run = run
+
+def _run_trending_topics(processor):
+    text_pipeline.clear()
+    with computation_context():
+        return processor.get_trending_topics()
+
+def _run_correlations(processor):
+    with computation_context():
+        return processor.get_technology_correlations()
+
+def _chart_case(method):
+    sizes = GRAPH_SIZES if method == 'create_technology_clusters_graph' else TECHNOLOGY_SIZES
+    return Case(f"chart:{method[len('create_'):]}", 'technologies', sizes,
+                lambda size: (DataAnalyzer(), chart_inputs(size)[method]),
+                lambda data: getattr(data[0], method)(data[1]))
+
+CASES = [
+    Case('popularity', 'technologies', TECHNOLOGY_SIZES,
+         lambda size: _processor(SyntheticClients(technologies=size)),
+         lambda processor: processor.get_technology_popularity()),
+    Case('extract_topics', 'documents', DOCUMENT_SIZES,
+         lambda size: (_processor(SyntheticClients()), generate_titles(size)),
+         lambda data: data[0]._extract_topics(data[1])),
+    Case('trending_topics', 'documents', CORPUS_SIZES,
+         lambda size: _processor(SyntheticClients(documents=size)),
+         _run_trending_topics),
+    Case('correlations', 'documents', DOCUMENT_SIZES,
+         lambda size: _processor(SyntheticClients(documents=size)),
+         _run_correlations),
+    Case('clusters', 'technologies', TECHNOLOGY_SIZES,
+         lambda size: (_processor(SyntheticClients()), _correlations(size)),
+         lambda data: data[0]._identify_technology_clusters(data[1]))
+] + [_chart_case(method) for method in sorted(name for name in dir(DataAnalyzer) if name.startswith('create_'))]
+
+def measure(case, size, repeat=3, budget=10.0, memory=True):
+    """
+    Time a case at one size, then trace its peak memory in one more run.
+
+    Args:
+        case (Case): Case to run
+        size (int): Input size
+        repeat (int): Maximum number of timed runs
+        budget (float): Stop repeating once the runs took this many seconds
+        memory (bool): Whether to trace the peak memory
+
+    Returns:
+        dict: Size, runs, best and median time in seconds, throughput in
+              items per second and peak memory in bytes (None if not traced)
+    """
+    data = case.setup(size)
+
+    timings = []
+    while len(timings) < repeat:
+        gc.collect()
+        start = time.perf_counter()
+        case.run(data)
+        timings.append(time.perf_counter() - start)
+        if sum(timings) >= budget:
+            break
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        case.run(data)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        'case': case.name,
+        'unit': case.unit,
+        'size': size,
+        'runs': len(timings),
+        'best': min(timings),
+        'median': median,
+        'throughput': size / median if median > 0 else None,
+        'peak_memory': peak
+    }
+
+def scaling_exponent(results):
+    """
+    Fit time = c * size^k to a case's results.
+
+    Args:
+        results (list): Results of one case at two or more sizes
+
+    Returns:
+        float: The exponent k (1 is linear), or None with fewer than two sizes
+    """
+    points = [(math.log(result['size']), math.log(result['median'])) for result in results if result['median'] > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+def compare(results, baseline, threshold=1.25):
+    """
+    Compare results with a baseline run.
+
+    Args:
+        results (list): Results of this run
+        baseline (dict): Saved baseline, with its 'results'
+        threshold (float): Largest acceptable ratio of this run's median
+            time or peak memory to the baseline's
+
+    Returns:
+        list: For each case and size in both runs, its time and memory
+              ratios and whether it regressed
+    """
+    previous = {(result['case'], result['size']): result for result in baseline['results']}
+    rows = []
+    for result in results:
+        before = previous.get((result['case'], result['size']))
+        if before is None:
+            continue
+        time_ratio = result['median'] / before['median'] if before['median'] else None
+        memory_ratio = (result['peak_memory'] / before['peak_memory']
+                        if result['peak_memory'] is not None and before['peak_memory'] else None)
+        rows.append({
+            'case': result['case'],
+            'size': result['size'],
+            'time_ratio': time_ratio,
+            'memory_ratio': memory_ratio,
+            'regressed': any(ratio is not None and ratio > threshold for ratio in (time_ratio, memory_ratio))
+        })
+    return rows
+
+def baseline_path(name):
+    """Path of a baseline given by name (under BASELINE_DIR) or path."""
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, f"{name}.json")
+
+def _commit():
+    """Short hash of the checked out commit, if in a git repository."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _format_bytes(value):
+    return '-' if value is None else f"{value / 1024 / 1024:.1f}MB"
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark processor and analyzer hot paths')
+    parser.add_argument('--cases', nargs='+', choices=[case.name for case in CASES],
+                        help='Cases to run (all by default)')
+    parser.add_argument('--max-size', type=int, help='Skip sizes above this')
+    parser.add_argument('--repeat', type=int, default=3, help='Maximum timed runs per case and size')
+    parser.add_argument('--budget', type=float, default=10.0, help='Stop repeating a size after this many seconds')
+    parser.add_argument('--no-memory', action='store_true', help="Don't trace peak memory")
+    parser.add_argument('--save', metavar='NAME', help='Save the results as a baseline')
+    parser.add_argument('--compare', metavar='NAME', help='Compare the results with a baseline')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Ratio of time or memory to the baseline counted as a regression')
+    args = parser.parse_args()
+
+    for key, value in ISOLATED_SETTINGS.items():
+        config.set(key, value)
+
+    results = []
+    exponents = {}
+    print(f"{'case':<34} {'size':>9} {'median':>10} {'throughput':>14} {'peak memory':>12}")
+    for case in CASES:
+        if args.cases and case.name not in args.cases:
+            continue
+
+        case_results = []
+        for size in case.sizes:
+            if args.max_size and size > args.max_size:
+                continue
+            result = measure(case, size, repeat=args.repeat, budget=args.budget, memory=not args.no_memory)
+            case_results.append(result)
+            print(f"{case.name:<34} {size:>9} {result['median']:>9.4f}s "
+                  f"{result['throughput']:>10.0f}/s {_format_bytes(result['peak_memory']):>12}")
+
+        exponents[case.name] = scaling_exponent(case_results)
+        if exponents[case.name] is not None:
+            print(f"{'':<34} scaling exponent {exponents[case.name]:.2f} per {case.unit}")
+        results.extend(case_results)
+
+    regressed = False
+    if args.compare:
+        with open(baseline_path(args.compare)) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} (commit {baseline.get('commit')}):")
+        for row in compare(results, baseline, args.threshold):
+            memory = '-' if row['memory_ratio'] is None else f"{row['memory_ratio']:.2f}x"
+            print(f"{row['case']:<34} {row['size']:>9}  time {row['time_ratio']:.2f}x  memory {memory}"
+                  f"{'  REGRESSION' if row['regressed'] else ''}")
+            regressed = regressed or row['regressed']
+
+    if args.save:
+        path = baseline_path(args.save)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'commit': _commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'results': results,
+                'scaling': exponents
+            }, f, indent=2)
+        print(f"\nSaved baseline to {path}")
+
+    sys.exit(1 if regressed else 0)
+
+if __name__ == '__main__':
+    main()
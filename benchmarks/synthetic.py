@@ -0,0 +1,134 @@
+"""
+Synthetic data generators for benchmarks.
+"""
+import itertools
+import random
+
+from api_clients.records import Article, Post, Question, Repo, Story
+from data_processing.topics import STOP_WORDS, TECH_TERMS
+
+# Real technology names, used before synthetic ones
+TECHNOLOGY_NAMES = ['Python', 'JavaScript', 'TypeScript', 'Java', 'Go', 'Rust', 'C++', 'C#', 'Kotlin', 'Swift']
+
+# Filler vocabulary mixed into generated titles
+FILLER_WORDS = [
+    'release', 'framework', 'library', 'performance', 'guide', 'tutorial', 'update',
+    'server', 'database', 'compiler', 'runtime', 'memory', 'design', 'developer',
+    'engineering', 'testing', 'deployment', 'migration', 'architecture', 'scaling',
+    'startup', 'open', 'source', 'project', 'model', 'training', 'inference', 'browser',
+    'mobile', 'desktop', 'platform', 'tooling', 'benchmark', 'debugging', 'patterns'
+]
+
+def generate_titles(count, vocabulary_size=5000, seed=0):
+    """
+    Generate titles resembling story and question headlines.
+
+    Words follow a skewed distribution over a vocabulary of filler words,
+    synthetic tokens, stop words and tech terms, with some punctuation.
+
+    Args:
+        count (int): Number of titles
+        vocabulary_size (int): Number of distinct synthetic tokens
+        seed (int): Random seed, so runs are reproducible
+
+    Returns:
+        list: Generated titles
+    """
+    rng = random.Random(seed)
+    vocabulary = (FILLER_WORDS + sorted(STOP_WORDS) + list(TECH_TERMS) +
+                  [f"term{i}" for i in range(vocabulary_size)])
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    rng.shuffle(weights)
+
+    titles = []
+    for _ in range(count):
+        words = rng.choices(vocabulary, weights=weights, k=rng.randint(4, 14))
+        title = ' '.join(words).capitalize()
+        titles.append(title + rng.choice(['', '', '?', '!', ' (2024)', ': a guide']))
+    return titles
+
+def _words(rng, count):
+    """Pick some filler and tech words."""
+    return ' '.join(rng.choice(FILLER_WORDS + list(TECH_TERMS)) for _ in range(count))
+
+def generate_repositories(count, languages, seed=0):
+    """
+    Generate GitHub repositories.
+
+    Args:
+        count (int): Number of repositories
+        languages (list): Languages to pick from
+        seed (int): Random seed
+
+    Returns:
+        list: Repo records
+    """
+    rng = random.Random(seed)
+    return [Repo(name=f"user{i}/project{i}", url=f"https://github.com/user{i}/project{i}",
+                 description=_words(rng, 10), language=rng.choice(languages),
+                 stars=int(rng.paretovariate(1.2) * 10), forks=rng.randint(0, 500),
+                 created_at="2026-10-01T00:00:00Z", topics=[rng.choice(languages).lower() for _ in range(3)])
+            for i in range(count)]
+
+def generate_questions(count, tags, seed=0):
+    """Generate Stack Overflow questions tagged with some of ``tags``, as Question records."""
+    rng = random.Random(seed)
+    return [Question(title=_words(rng, 8), link=f"https://stackoverflow.com/q/{i}",
+                     score=rng.randint(0, 200), answer_count=rng.randint(0, 10), view_count=rng.randint(10, 50000),
+                     tags=rng.sample(tags, 3), creation_date=1760000000 + i, is_answered=rng.random() < 0.7)
+            for i in range(count)]
+
+def generate_stories(count, seed=0):
+    """Generate HackerNews stories, as Story records."""
+    rng = random.Random(seed)
+    return [Story(id=i, title=_words(rng, 8), url=f"https://example.com/story/{i}", by=f"user{i % 97}",
+                  score=rng.randint(1, 900), time=1760000000 + i, descendants=rng.randint(0, 400), type="story")
+            for i in range(count)]
+
+def generate_posts(count, subreddit, seed=0):
+    """Generate Reddit posts in a subreddit, as Post records."""
+    rng = random.Random(seed)
+    return [Post(title=_words(rng, 8), author=f"user{i % 89}", score=rng.randint(1, 5000),
+                 num_comments=rng.randint(0, 800), created_utc=1760000000 + i, url=f"https://example.com/post/{i}",
+                 permalink=f"https://www.reddit.com/r/{subreddit}/comments/{i}", selftext=_words(rng, 40),
+                 subreddit=subreddit)
+            for i in range(count)]
+
+def generate_articles(count, seed=0):
+    """Generate news articles, as Article records."""
+    rng = random.Random(seed)
+    return [Article(title=_words(rng, 8), description=_words(rng, 25), url=f"https://example.com/news/{i}",
+                    source=f"Source {i % 13}", published_at="2026-10-18T12:00:00Z", content=_words(rng, 60))
+            for i in range(count)]
+
+def generate_technologies(count):
+    """
+    Generate technology names: real ones first, then synthetic 'techN' names.
+
+    Args:
+        count (int): Number of technologies
+
+    Returns:
+        list: Technology names, most popular first
+    """
+    real = TECHNOLOGY_NAMES + sorted(set(TECH_TERMS) - {name.lower() for name in TECHNOLOGY_NAMES})
+    return (real + [f"tech{i}" for i in range(max(0, count - len(real)))])[:count]
+
+def generate_tech_documents(count, technologies, per_document=6, seed=0):
+    """
+    Generate documents mentioning technologies, with a skewed (Zipf-like)
+    popularity so a few technologies appear in most documents.
+
+    Args:
+        count (int): Number of documents
+        technologies (list): Technologies, most popular first
+        per_document (int): Maximum technologies per document
+        seed (int): Random seed
+
+    Returns:
+        list: Lists of technologies, one per document
+    """
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(technologies))))
+    return [rng.choices(technologies, cum_weights=cum_weights, k=rng.randint(1, per_document))
+            for _ in range(count)]
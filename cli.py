@@ -9,6 +9,7 @@ import pandas as pd
 from tabulate import tabulate
 import time
 
+from api_clients.records import json_default
 from data_processing.processor import DataProcessor
 from utils.logger import setup_logger
 from utils.cache import clear_cache, clear_expired_cache
@@ -31,9 +32,10 @@ def display_menu():
     print("4. Browse Hot Discussions")
     print("5. Analyze Technology Correlations")
     print("6. Generate Full Insights Report")
-    print("7. Manage Cache")
-    print("8. Exit")
-    return input("\nSelect an option (1-8): ")
+    print("7. View Report History")
+    print("8. Manage Cache")
+    print("9. Exit")
+    return input("\nSelect an option (1-9): ")
 
 def display_table(data, title):
     """Display data in a tabular format."""
@@ -259,6 +261,12 @@ def generate_insights_report(processor):
     print("="*80)
     print(f"Report generated on: {insights['timestamp']}")
     
+    metadata = insights.get('metadata', {})
+    if metadata:
+        print(f"Computed in {metadata['total_time']:.1f}s using {metadata['max_workers']} workers")
+        for stage, seconds in metadata['stage_timings'].items():
+            print(f"  {stage}: {seconds:.2f}s")
+    
     # Show top technologies
     print("\nTOP TECHNOLOGIES BY OVERALL POPULARITY")
     print("-" * 50)
@@ -297,12 +305,41 @@ def generate_insights_report(processor):
         filename = f"tech_insights_report_{time.strftime('%Y%m%d_%H%M%S')}.json"
         try:
             with open(filename, 'w') as f:
-                json.dump(insights, f, indent=2)
+                json.dump(insights, f, indent=2, default=json_default)
             print(f"\nReport saved to {filename}")
         except Exception as e:
             logger.error(f"Error saving report: {e}")
             print(f"\nError saving report: {e}")
 
+def view_report_history(processor):
+    """Show a technology's popularity in past reports and this week's fastest-rising repositories."""
+    
+    technology = input("\nTechnology to look up (default: python): ").strip().lower() or 'python'
+    store = processor.snapshot_store
+    
+    history = store.technology_history(technology, days=90)
+    if history.empty:
+        print(f"\nNo stored reports rank {technology} in the last 90 days.")
+    else:
+        table_data = [{
+            "Report": row.run_at.strftime('%Y-%m-%d %H:%M'),
+            "Overall Score": f"{row.overall_score:.2f}"
+        } for row in history.itertuples()]
+        display_table(table_data, f"{technology.upper()} POPULARITY OVER 90 DAYS")
+    
+    rising = store.rising_repositories(days=7, top_n=10)
+    if rising.empty:
+        print("\nNo repository gained stars across this week's stored reports.")
+        return
+    
+    table_data = [{
+        "Repository": row.name,
+        "Language": row.language or "Unknown",
+        "Stars": row.last_stars,
+        "Gained": f"+{row.star_gain}"
+    } for row in rising.itertuples()]
+    display_table(table_data, "FASTEST-RISING REPOSITORIES THIS WEEK")
+
 def manage_cache():
     
     print("\nCACHE MANAGEMENT")
@@ -321,12 +358,17 @@ def manage_cache():
     else:
         return
 
-def cli_main():
-    """Main function for the CLI interface."""
+def cli_main(max_workers=None):
+    """
+    Main function for the CLI interface.
+    
+    Args:
+        max_workers (int, optional): Number of report stages to compute in parallel
+    """
     setup_logger()
     
     # Initialize data processor
-    processor = DataProcessor()
+    processor = DataProcessor(max_workers=max_workers)
     
     display_title()
     print("Initializing data sources...")
@@ -347,8 +389,10 @@ def cli_main():
         elif choice == '6':
             generate_insights_report(processor)
         elif choice == '7':
-            manage_cache()
+            view_report_history(processor)
         elif choice == '8':
+            manage_cache()
+        elif choice == '9':
             print("\nThank you for using Data Alchemist. Goodbye!")
             sys.exit(0)
         else:
@@ -7,17 +7,93 @@ import numpy as np
 import matplotlib.pyplot as plt
 import io
 import base64
+import functools
+import hashlib
+import inspect
+import json
+import threading
 from matplotlib.ticker import MaxNLocator
 import seaborn as sns
 
+from api_clients.records import json_default
+from utils.cache import get_cached_value, set_cached_value
+from utils.config import config
+
 logger = logging.getLogger(__name__)
 
+# Part of every render cache key; bump it when the drawing of a chart changes
+CHART_VERSION = 1
+
+# Chart drawn from each insights report stage, as the /api_viz_* endpoints draw them
+REPORT_CHARTS = {
+    'popularity_ranking': 'create_technology_popularity_chart',
+    'trending_topics': 'create_trending_topics_chart',
+    'tech_correlations': 'create_tech_correlation_heatmap',
+    'technology_clusters': 'create_technology_clusters_graph',
+    'hot_discussions': 'create_hot_discussions_chart',
+    'emerging_repositories': 'create_emerging_repos_chart'
+}
+
+# Pyplot keeps global state, so charts are drawn one at a time
+_render_lock = threading.Lock()
+
+def _encode(obj):
+    """Serialize records, and anything else JSON can't, for content hashing."""
+    try:
+        return json_default(obj)
+    except TypeError:
+        return str(obj)
+
+def cached_chart(method):
+    """
+    Serve a chart from the render cache when it was drawn before from the
+    same data, parameters and style.
+
+    Charts are keyed by a hash of their content rather than by time, so a
+    cached chart is never stale, and are kept in the cache store, where all
+    workers find them. Concurrent requests for a chart missing from the
+    cache draw it once.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not config.get('charts.cache', True):
+            with _render_lock:
+                return method(self, *args, **kwargs)
+
+        arguments = signature.bind(self, *args, **kwargs)
+        arguments.apply_defaults()
+        params = dict(arguments.arguments)
+        params.pop('self')
+        key = self.chart_key(method.__name__, params)
+
+        chart = get_cached_value(key)
+        if chart is not None:
+            return chart
+
+        with _render_lock:
+            # Another request may have drawn it while this one waited
+            chart = get_cached_value(key)
+            if chart is None:
+                chart = method(self, *args, **kwargs)
+                if chart is not None:
+                    set_cached_value(key, chart)
+        return chart
+    return wrapper
+
 class DataAnalyzer:
 
-    def __init__(self):
-        """Initialize the data analyzer."""
+    def __init__(self, style='dark_background'):
+        """
+        Initialize the data analyzer.
+        
+        Args:
+            style (str): Matplotlib style of the charts
+        """
         # Set Matplotlib style for better visualizations
-        plt.style.use('dark_background')
+        self.style = style
+        plt.style.use(style)
         
         # Common color scheme for consistent visualizations
         self.colors = {
@@ -35,6 +111,40 @@ class DataAnalyzer:
             'pytrends': '#fbbc05'
         }
     
+    def chart_key(self, name, params):
+        """
+        Render cache key of a chart.
+        
+        Args:
+            name (str): Chart method name
+            params (dict): Arguments of the method, including its input data
+            
+        Returns:
+            str: Cache key hashing the chart version, style, colors and arguments
+        """
+        content = json.dumps([CHART_VERSION, self.style, self.colors, params], default=_encode)
+        return f"chart:{name}:{hashlib.sha256(content.encode('utf-8')).hexdigest()}"
+    
+    def prerender(self, stage_results):
+        """
+        Draw the charts of freshly computed report stages into the render
+        cache, so chart requests for the same data are cache lookups.
+        
+        Args:
+            stage_results (dict): Stage results by name, e.g. an insights report
+        """
+        if not config.get('charts.cache', True):
+            return
+        
+        for stage, method in REPORT_CHARTS.items():
+            if stage not in stage_results:
+                continue
+            try:
+                getattr(self, method)(stage_results[stage])
+            except Exception as e:
+                logger.error(f"Error pre-rendering {method}: {e}")
+    
+    @cached_chart
     def create_technology_popularity_chart(self, technology_data, top_n=10):
 
         # Get top N technologies by overall score
@@ -86,10 +196,12 @@ class DataAnalyzer:
         encoded = base64.b64encode(img.getvalue()).decode('utf-8')
         return encoded
     
+    @cached_chart
     def create_trending_topics_chart(self, topics_data, top_n=10):
 
-        # Get top N topics by source count
-        top_topics = sorted(topics_data.items(), key=lambda x: x[1]['source_count'], reverse=True)[:top_n]
+        # Get top N topics by burst score, then source count (as ranked on the dashboard)
+        top_topics = sorted(topics_data.items(),
+                            key=lambda x: (x[1].get('burst_score') or 0, x[1]['source_count']), reverse=True)[:top_n]
         
         # Extract data for the chart
         topic_names = [topic for topic, _ in top_topics]
@@ -151,6 +263,7 @@ class DataAnalyzer:
         encoded = base64.b64encode(img.getvalue()).decode('utf-8')
         return encoded
     
+    @cached_chart
     def create_tech_correlation_heatmap(self, correlation_data, top_n=15):
 
         # Identify top technologies to include (those with the most correlations)
@@ -213,6 +326,7 @@ class DataAnalyzer:
         encoded = base64.b64encode(img.getvalue()).decode('utf-8')
         return encoded
     
+    @cached_chart
     def create_technology_clusters_graph(self, clusters_data):
 
         # Only proceed if we have clusters
@@ -338,6 +452,7 @@ class DataAnalyzer:
         encoded = base64.b64encode(img.getvalue()).decode('utf-8')
         return encoded
     
+    @cached_chart
     def create_hot_discussions_chart(self, hot_discussions_data, top_n=10):
 
         top_discussions = sorted(hot_discussions_data, key=lambda x: x['engagement_score'], reverse=True)[:top_n]
@@ -396,6 +511,7 @@ class DataAnalyzer:
         encoded = base64.b64encode(img.getvalue()).decode('utf-8')
         return encoded
     
+    @cached_chart
     def create_emerging_repos_chart(self, repos_data, top_n=10):
 
         # Get top N repositories by stars
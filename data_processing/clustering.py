@@ -0,0 +1,207 @@
+"""
+Graph-based clustering of correlated technologies.
+"""
+from collections import defaultdict
+
+from utils.lexicon import Lexicon
+
+# Common technology categories for naming clusters
+CATEGORIES = {
+    'web development': ['javascript', 'typescript', 'react', 'vue', 'angular', 'html', 'css', 'node', 'webpack', 'bootstrap'],
+    'data science': ['python', 'r', 'pandas', 'numpy', 'jupyter', 'data science', 'machine learning', 'analytics', 'visualization'],
+    'ai & ml': ['ai', 'artificial intelligence', 'machine learning', 'deep learning', 'neural network', 'tensorflow', 'pytorch', 'nlp'],
+    'cloud & devops': ['cloud', 'aws', 'azure', 'gcp', 'kubernetes', 'docker', 'devops', 'ci/cd', 'terraform', 'serverless'],
+    'mobile development': ['android', 'ios', 'swift', 'kotlin', 'flutter', 'react native', 'mobile'],
+    'backend development': ['java', 'spring', 'django', 'flask', 'express', 'api', 'rest', 'graphql', 'microservices'],
+    'database technologies': ['sql', 'postgresql', 'mysql', 'mongodb', 'redis', 'database', 'nosql'],
+    'blockchain & crypto': ['blockchain', 'crypto', 'bitcoin', 'ethereum', 'web3', 'nft', 'defi', 'dao'],
+    'systems programming': ['c', 'c++', 'rust', 'go', 'systems']
+}
+
+# Matcher for category keywords within technology names
+KEYWORD_LEXICON = Lexicon([keyword for keywords in CATEGORIES.values() for keyword in keywords], aliases={})
+
+def _build_keyword_index(categories):
+    """Map each keyword to the categories listing it."""
+    index = defaultdict(list)
+    for category, keywords in categories.items():
+        for keyword in keywords:
+            index[keyword].append(category)
+    return dict(index)
+
+KEYWORD_CATEGORIES = _build_keyword_index(CATEGORIES)
+
+def name_cluster(technologies, min_matches=2):
+    """
+    Name a cluster after the category sharing the most keywords with it.
+
+    A technology matches the keywords found as whole words in its name
+    (e.g. 'node' in 'node.js', 'react' and 'react native' in 'react-native').
+
+    Args:
+        technologies (list): Technologies in the cluster
+        min_matches (int): Keywords a category needs to name the cluster
+
+    Returns:
+        str: Category name, or a generic name when no category matches enough
+    """
+    matched = defaultdict(set)
+    for tech in technologies:
+        for keyword in KEYWORD_LEXICON.find(tech):
+            for category in KEYWORD_CATEGORIES[keyword]:
+                matched[category].add(keyword)
+
+    # Ties go to the category listed first
+    best_category, best_count = None, 0
+    for category in CATEGORIES:
+        if len(matched[category]) > best_count:
+            best_category, best_count = category, len(matched[category])
+
+    if best_count >= min_matches:
+        return best_category.title()
+    return f"Related Technologies ({len(technologies)})"
+
+class TechnologyClusterer:
+    """
+    Groups technologies whose correlation exceeds a threshold.
+
+    The technologies are nodes of a graph with an edge for every correlation
+    above the threshold. In 'components' mode each connected component is a
+    cluster, found with union-find. In 'label_propagation' mode components are
+    further split into communities by label propagation, which suits large,
+    loosely connected graphs. Both modes are deterministic and run in time
+    near-linear in the number of edges.
+    """
+
+    MODES = ('components', 'label_propagation')
+
+    def __init__(self, threshold=0.3, mode='components', min_size=2, max_iterations=20):
+        """
+        Args:
+            threshold (float): Minimum correlation for two technologies to be linked
+            mode (str): One of MODES
+            min_size (int): Smallest cluster returned
+            max_iterations (int): Maximum label propagation sweeps
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown clustering mode '{mode}'; expected one of {', '.join(self.MODES)}")
+
+        self.threshold = threshold
+        self.mode = mode
+        self.min_size = min_size
+        self.max_iterations = max_iterations
+
+    def cluster(self, correlations):
+        """
+        Cluster technologies from nested correlation dictionaries.
+
+        Args:
+            correlations (dict): For each technology, a dictionary of
+                correlated technologies and their scores
+
+        Returns:
+            list: Clusters as lists of technologies, largest first; ties and
+                  members keep the order technologies first appear in
+        """
+        nodes = {}
+        for tech, partners in correlations.items():
+            nodes.setdefault(tech, len(nodes))
+            for other in partners:
+                nodes.setdefault(other, len(nodes))
+
+        edges = []
+        for tech, partners in correlations.items():
+            for other, score in partners.items():
+                if score > self.threshold and tech != other:
+                    edges.append((nodes[tech], nodes[other], score))
+
+        names = list(nodes)
+        return [[names[node] for node in cluster] for cluster in self.cluster_edges(len(names), edges)]
+
+    def cluster_edges(self, node_count, edges):
+        """
+        Cluster the nodes of a weighted graph.
+
+        Args:
+            node_count (int): Number of nodes, identified by 0..node_count-1
+            edges (iterable): (node, node, weight) tuples; an undirected edge
+                may be listed once or in both directions
+
+        Returns:
+            list: Clusters as sorted lists of nodes, largest first, then by
+                  smallest node
+        """
+        edges = list(edges)
+        if self.mode == 'components':
+            labels = self._components(node_count, edges)
+        else:
+            labels = self._label_propagation(node_count, edges)
+
+        groups = defaultdict(list)
+        for node in range(node_count):
+            groups[labels[node]].append(node)
+
+        clusters = [members for members in groups.values() if len(members) >= self.min_size]
+        clusters.sort(key=lambda members: (-len(members), members[0]))
+        return clusters
+
+    @staticmethod
+    def _components(node_count, edges):
+        """Label each node with the root of its connected component (union-find)."""
+        parent = list(range(node_count))
+        size = [1] * node_count
+
+        def find(node):
+            while parent[node] != node:
+                # Path halving
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        for a, b, _ in edges:
+            root_a, root_b = find(a), find(b)
+            if root_a == root_b:
+                continue
+            # Union by size
+            if size[root_a] < size[root_b]:
+                root_a, root_b = root_b, root_a
+            parent[root_b] = root_a
+            size[root_a] += size[root_b]
+
+        return [find(node) for node in range(node_count)]
+
+    def _label_propagation(self, node_count, edges):
+        """
+        Label each node with its community.
+
+        Nodes are visited in order and adopt the label with the highest total
+        edge weight among their neighbours, preferring their current label and
+        then the smallest one on ties, until no label changes.
+        """
+        neighbours = [defaultdict(float) for _ in range(node_count)]
+        for a, b, weight in edges:
+            if a != b:
+                neighbours[a][b] = max(neighbours[a][b], weight)
+                neighbours[b][a] = max(neighbours[b][a], weight)
+
+        labels = list(range(node_count))
+        for _ in range(self.max_iterations):
+            changed = False
+            for node in range(node_count):
+                if not neighbours[node]:
+                    continue
+
+                totals = defaultdict(float)
+                for other, weight in neighbours[node].items():
+                    totals[labels[other]] += weight
+
+                best = max(totals.values())
+                if totals.get(labels[node]) == best:
+                    continue
+                labels[node] = min(label for label, total in totals.items() if total == best)
+                changed = True
+
+            if not changed:
+                break
+
+        return labels
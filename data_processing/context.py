@@ -0,0 +1,82 @@
+"""
+Computation context for reusing processor stage results within one report or request.
+"""
+import contextlib
+import contextvars
+import functools
+import threading
+
+_current_context = contextvars.ContextVar('computation_context', default=None)
+
+class ComputationContext:
+    """Stage results computed during a single report or request."""
+
+    def __init__(self):
+        self._results = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the result stored under ``key``, computing it on first request.
+
+        Concurrent callers asking for the same key wait for the first
+        computation instead of repeating it.
+
+        Args:
+            key: Hashable identifier of the computation
+            compute (callable): Produces the result when it isn't stored yet
+
+        Returns:
+            The stored or newly computed result
+        """
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if key not in self._results:
+                self._results[key] = compute()
+            return self._results[key]
+
+@contextlib.contextmanager
+def computation_context():
+    """
+    Open a computation context for the current report or request.
+
+    If a context is already active (e.g. a report built while serving a
+    request), it is reused so that results are shared with it.
+
+    Yields:
+        ComputationContext: The active context
+    """
+    context = _current_context.get()
+    if context is not None:
+        yield context
+        return
+
+    context = ComputationContext()
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
+
+def get_current_context():
+    """Return the active ComputationContext, or None outside of one."""
+    return _current_context.get()
+
+def memoized_stage(func):
+    """
+    Compute a processor stage once per computation context.
+
+    Outside of a context the stage runs normally on every call.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        context = _current_context.get()
+        if context is None:
+            return func(self, *args, **kwargs)
+
+        key = (id(self), func.__name__, args, tuple(sorted(kwargs.items())))
+        return context.get_or_compute(key, lambda: func(self, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,462 @@
+"""
+Sparse co-occurrence and similarity of technologies across documents.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from data_processing.trends import DAY
+from utils.lexicon import Lexicon
+from utils.state import BucketStore
+
+logger = logging.getLogger(__name__)
+
+# Supported similarity metrics, for technologies A and B occurring in
+# df(A) and df(B) of N documents, together in c of them:
+#   jaccard - c / (df(A) + df(B) - c)
+#   pmi     - log(c * N / (df(A) * df(B)))
+#   npmi    - pmi / -log(c / N), in [-1, 1]
+#   cosine  - c / sqrt(df(A) * df(B))
+METRICS = ('jaccard', 'pmi', 'npmi', 'cosine')
+
+def _check_metric(metric):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}'; expected one of {', '.join(METRICS)}")
+
+def pair_scores(metric, shared, df_a, df_b, total):
+    """
+    Compute a similarity metric for pairs of technologies.
+
+    Args:
+        metric (str): One of METRICS
+        shared (array-like): Documents each pair shares
+        df_a (array-like): Document frequency of each pair's first technology
+        df_b (array-like): Document frequency of each pair's second technology
+        total (int): Number of documents
+
+    Returns:
+        numpy.ndarray: Score of each pair
+    """
+    _check_metric(metric)
+    shared = np.asarray(shared, dtype=float)
+    df_a, df_b = np.asarray(df_a, dtype=float), np.asarray(df_b, dtype=float)
+    total = float(total)
+
+    if metric == 'jaccard':
+        return shared / (df_a + df_b - shared)
+    if metric == 'cosine':
+        return shared / np.sqrt(df_a * df_b)
+
+    pmi = np.log(shared * total / (df_a * df_b))
+    if metric == 'pmi':
+        return pmi
+    # Pairs present in every document are perfectly associated
+    denominator = -np.log(shared / total)
+    return np.divide(pmi, denominator, out=np.ones_like(pmi), where=denominator > 0)
+
+class CorrelationEngine:
+    """
+    Correlates technologies by the documents (repositories, questions) they
+    appear in together.
+
+    Documents are collected as rows of a sparse binary document x technology
+    incidence matrix X. Co-occurrence counts are the sparse product X^T X,
+    whose diagonal holds each technology's document frequency, and every
+    similarity metric is computed from it on the non-zero pairs only.
+    """
+
+    METRICS = METRICS
+
+    def __init__(self, technologies):
+        """
+        Args:
+            technologies (iterable): Technology names, the matrix columns
+        """
+        self.technologies = list(dict.fromkeys(technologies))
+        self._columns = {tech: i for i, tech in enumerate(self.technologies)}
+        self._rows = []
+        self._cols = []
+        self.document_count = 0
+        self._matrix = None
+
+    def add_document(self, technologies):
+        """
+        Add a document containing some technologies.
+
+        Args:
+            technologies (iterable): Technologies found in the document;
+                duplicates and unknown names are ignored
+
+        Returns:
+            int: Number of known technologies in the document
+        """
+        columns = {self._columns[tech] for tech in technologies if tech in self._columns}
+        self._rows.extend([self.document_count] * len(columns))
+        self._cols.extend(columns)
+        self.document_count += 1
+        self._matrix = None
+        return len(columns)
+
+    @property
+    def incidence_matrix(self):
+        """Sparse binary document x technology matrix (CSR)."""
+        if self._matrix is None:
+            data = np.ones(len(self._rows), dtype=np.int64)
+            self._matrix = sparse.csr_matrix((data, (self._rows, self._cols)),
+                                             shape=(self.document_count, len(self.technologies)))
+        return self._matrix
+
+    def co_occurrence(self):
+        """
+        Count the documents each pair of technologies shares.
+
+        Returns:
+            scipy.sparse.csr_matrix: Technology x technology counts; the
+                diagonal holds each technology's document frequency
+        """
+        matrix = self.incidence_matrix
+        return (matrix.T @ matrix).tocsr()
+
+    def similarity(self, metric='jaccard', min_count=1):
+        """
+        Compute a similarity score for every pair of co-occurring technologies.
+
+        Args:
+            metric (str): One of METRICS
+            min_count (int): Minimum number of shared documents for a pair
+
+        Returns:
+            scipy.sparse.coo_matrix: Symmetric technology x technology scores,
+                without the diagonal
+        """
+        _check_metric(metric)
+
+        counts = self.co_occurrence()
+        frequency = counts.diagonal().astype(float)
+
+        pairs = sparse.triu(counts, k=1).tocoo()
+        keep = pairs.data >= max(min_count, 1)
+        rows, cols = pairs.row[keep], pairs.col[keep]
+        scores = pair_scores(metric, pairs.data[keep], frequency[rows], frequency[cols], self.document_count)
+
+        size = len(self.technologies)
+        return sparse.coo_matrix((np.concatenate([scores, scores]),
+                                  (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+                                 shape=(size, size))
+
+    def to_dict(self, metric='jaccard', min_count=1):
+        """
+        Compute similarities as nested dictionaries.
+
+        Args:
+            metric (str): One of METRICS
+            min_count (int): Minimum number of shared documents for a pair
+
+        Returns:
+            dict: For each technology with a correlated partner, a dictionary
+                  of partner technologies and their scores
+        """
+        scores = self.similarity(metric, min_count).tocsr()
+        scores.sort_indices()
+
+        result = {}
+        for row, tech in enumerate(self.technologies):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            if start < end:
+                result[tech] = {self.technologies[col]: float(score)
+                                for col, score in zip(scores.indices[start:end], scores.data[start:end])}
+        return result
+
+def find_technologies(lexicon, texts):
+    """
+    Find the technologies mentioned in any of a document's texts.
+
+    Args:
+        lexicon (Lexicon): Technologies to look for
+        texts (iterable): Texts of the document (e.g. a description and topics)
+
+    Returns:
+        set: Canonical names found
+    """
+    found = set()
+    for text in texts:
+        if text:
+            found.update(lexicon.find(text))
+    return found
+
+class CooccurrenceAccumulator:
+    """
+    Running technology co-occurrence counts over a rolling window of documents.
+
+    Each document is counted once, when first added, under its ID; its texts
+    and the technologies found in them are kept in a daily bucket. The
+    accumulator maintains document frequencies and pair counts as documents
+    arrive and as buckets older than ``history_days`` expire, so
+    correlations are read from the current counts without revisiting any
+    document, and cover more documents the longer it runs.
+
+    Documents are matched against every technology tracked so far. When a
+    new technology is tracked, the stored documents are matched again, so
+    its document frequency covers the whole window like that of the others.
+    """
+
+    def __init__(self, history_days=30):
+        """
+        Args:
+            history_days (int): Days a document is counted for
+        """
+        if history_days < 1:
+            raise ValueError("The history must cover at least one day")
+
+        self.history_days = history_days
+        self.technologies = []
+        self.document_count = 0
+        self.technology_counts = Counter()
+        # Pairs are keyed by (technology, technology) in sorted order
+        self.pair_counts = Counter()
+
+        self._lexicon = Lexicon()
+        self._days = {}
+        self._seen = {}
+
+        # Names of buckets changed or expired since the last save
+        self._changed = set()
+        self._expired = set()
+
+    @property
+    def settings(self):
+        """Parameters the accumulator was created with."""
+        return {'history_days': self.history_days}
+
+    @classmethod
+    def from_buckets(cls, buckets, **settings):
+        """
+        Rebuild an accumulator from buckets saved by ``save``.
+
+        Args:
+            buckets (dict): Buckets by name
+            **settings: CooccurrenceAccumulator parameters
+
+        Returns:
+            CooccurrenceAccumulator: The accumulator
+        """
+        accumulator = cls(**settings)
+        accumulator.technologies = list(buckets.get('technologies', []))
+        accumulator._lexicon = Lexicon(accumulator.technologies)
+        for name, bucket in buckets.items():
+            kind, _, day = name.partition('-')
+            if kind != 'day':
+                continue
+            accumulator._days[int(day)] = bucket
+            for doc_id, _, technologies in bucket:
+                accumulator._seen[doc_id] = int(day)
+                accumulator._count(technologies, 1)
+        return accumulator
+
+    def save(self, store):
+        """
+        Write the buckets changed since the last save, and remove expired ones.
+
+        Args:
+            store (BucketStore): Store of the accumulator
+        """
+        for name in self._expired:
+            store.delete(name)
+        for name in self._changed:
+            if name == 'technologies':
+                store.save(name, self.technologies)
+            elif int(name.partition('-')[2]) in self._days:
+                store.save(name, self._days[int(name.partition('-')[2])])
+        self._changed.clear()
+        self._expired.clear()
+
+    def track(self, technologies):
+        """
+        Start counting technologies, matching them in the stored documents.
+
+        Args:
+            technologies (iterable): Technology names; ones already tracked
+                are ignored
+
+        Returns:
+            int: Number of technologies added
+        """
+        tracked = set(self.technologies)
+        new = [tech for tech in dict.fromkeys(technologies) if tech not in tracked]
+        if not new:
+            return 0
+
+        self.technologies.extend(new)
+        self._lexicon = Lexicon(self.technologies)
+        self._changed.add('technologies')
+
+        # Match the whole window again with every tracked technology
+        for day, bucket in self._days.items():
+            for i, (doc_id, texts, technologies) in enumerate(bucket):
+                found = tuple(sorted(find_technologies(self._lexicon, texts)))
+                if found != technologies:
+                    self._count(technologies, -1)
+                    self._count(found, 1)
+                    bucket[i] = (doc_id, texts, found)
+                    self._changed.add(f"day-{day}")
+        return len(new)
+
+    def add_documents(self, documents, technologies=(), now=None):
+        """
+        Count new documents and expire those older than the history.
+
+        Args:
+            documents (iterable): (document ID, texts) pairs, where texts is a
+                sequence of strings to find technologies in; documents
+                already counted are skipped
+            technologies (iterable): Technologies to track (see ``track``)
+            now (float, optional): Time added as a Unix timestamp (defaults
+                to the current time)
+
+        Returns:
+            int: Number of documents counted
+        """
+        now = time.time() if now is None else now
+        self.expire(now)
+        self.track(technologies)
+
+        day = int(now // DAY)
+        bucket = self._days.setdefault(day, [])
+
+        added = 0
+        for doc_id, texts in documents:
+            if doc_id in self._seen:
+                continue
+            texts = tuple(texts)
+            found = tuple(sorted(find_technologies(self._lexicon, texts)))
+            self._seen[doc_id] = day
+            bucket.append((doc_id, texts, found))
+            self._count(found, 1)
+            added += 1
+
+        if added:
+            self._changed.add(f"day-{day}")
+        return added
+
+    def expire(self, now=None):
+        """
+        Drop documents added before the history window.
+
+        Args:
+            now (float, optional): Current time as a Unix timestamp
+        """
+        now = time.time() if now is None else now
+        first_day = int(now // DAY) - self.history_days + 1
+
+        for day in [day for day in self._days if day < first_day]:
+            for doc_id, _, technologies in self._days.pop(day):
+                del self._seen[doc_id]
+                self._count(technologies, -1)
+            self._changed.discard(f"day-{day}")
+            self._expired.add(f"day-{day}")
+
+    def _count(self, technologies, sign):
+        """Add (sign 1) or remove (sign -1) a document's counts."""
+        self.document_count += sign
+        for tech in technologies:
+            self.technology_counts[tech] += sign
+        for i, tech in enumerate(technologies):
+            for other in technologies[i + 1:]:
+                self.pair_counts[tech, other] += sign
+
+        if sign < 0:
+            for tech in technologies:
+                if self.technology_counts[tech] <= 0:
+                    del self.technology_counts[tech]
+            for i, tech in enumerate(technologies):
+                for other in technologies[i + 1:]:
+                    if self.pair_counts[tech, other] <= 0:
+                        del self.pair_counts[tech, other]
+
+    def to_dict(self, technologies, metric='jaccard', min_count=1):
+        """
+        Compute similarities between technologies from the current counts.
+
+        Args:
+            technologies (iterable): Technologies to correlate
+            metric (str): One of METRICS
+            min_count (int): Minimum number of shared documents for a pair
+
+        Returns:
+            dict: For each technology with a correlated partner, a dictionary
+                  of partner technologies and their scores, in the same form
+                  and order as CorrelationEngine.to_dict
+        """
+        _check_metric(metric)
+        technologies = list(dict.fromkeys(technologies))
+
+        pairs = []
+        for i, tech in enumerate(technologies):
+            for j in range(i + 1, len(technologies)):
+                other = technologies[j]
+                shared = self.pair_counts.get((tech, other) if tech < other else (other, tech), 0)
+                if shared >= max(min_count, 1):
+                    pairs.append((i, j, shared))
+        if not pairs:
+            return {}
+
+        rows, cols, shared = zip(*pairs)
+        scores = pair_scores(metric, shared,
+                             [self.technology_counts[technologies[i]] for i in rows],
+                             [self.technology_counts[technologies[j]] for j in cols],
+                             self.document_count)
+
+        # Pairs are in row-major order, so every technology's partners are
+        # added in the order of the technologies, as in CorrelationEngine
+        partners = [{} for _ in technologies]
+        for i, j, score in zip(rows, cols, scores):
+            partners[i][technologies[j]] = float(score)
+            partners[j][technologies[i]] = float(score)
+
+        return {tech: partners[i] for i, tech in enumerate(technologies) if partners[i]}
+
+    def __len__(self):
+        return self.document_count
+
+# Accumulators kept in memory between updates, by state directory
+_accumulators = {}
+
+# Serializes updates of persisted accumulators within a process
+_accumulator_lock = threading.Lock()
+
+def update_cooccurrence(key, documents, technologies=(), now=None, root=None, **settings):
+    """
+    Add documents to the accumulator persisted under a state key.
+
+    The accumulator is loaded from the state store on first use and then
+    kept in memory; each update only writes the buckets it changed. One
+    stored with other settings is replaced by a new one. Across processes
+    the last save of a bucket wins.
+
+    Args:
+        key (str): State key of the accumulator
+        documents (iterable): (document ID, texts) pairs
+        technologies (iterable): Technologies to track
+        now (float, optional): Time added as a Unix timestamp
+        root (str, optional): State directory (see utils.state)
+        **settings: CooccurrenceAccumulator parameters
+
+    Returns:
+        CooccurrenceAccumulator: The updated accumulator
+    """
+    settings = CooccurrenceAccumulator(**settings).settings
+    with _accumulator_lock:
+        store = BucketStore(key, root)
+        accumulator = _accumulators.get(store.directory)
+        if accumulator is None or accumulator.settings != settings:
+            accumulator = CooccurrenceAccumulator.from_buckets(store.load(settings), **settings)
+            _accumulators[store.directory] = accumulator
+
+        added = accumulator.add_documents(documents, technologies, now=now)
+        logger.debug(f"Added {added} new documents to {key}")
+        accumulator.save(store)
+    return accumulator
@@ -0,0 +1,110 @@
+"""
+Dependency-graph execution of processor stages on a thread pool.
+"""
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+class Stage:
+    """A named unit of work and the stages whose results it needs."""
+
+    def __init__(self, name, func, dependencies=()):
+        """
+        Args:
+            name (str): Stage name, also the key of its result
+            func (callable): Called with each dependency's result as a keyword
+                argument named after the dependency
+            dependencies (iterable): Names of stages that must finish first
+        """
+        self.name = name
+        self.func = func
+        self.dependencies = tuple(dependencies)
+
+class StageExecutor:
+    """Runs a graph of stages, starting each one as soon as its dependencies finish."""
+
+    def __init__(self, stages, max_workers=4):
+        """
+        Args:
+            stages (iterable): Stage objects making up the graph
+            max_workers (int): Maximum number of stages running at once
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max(1, max_workers)
+
+        for stage in self.stages.values():
+            for dependency in stage.dependencies:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+
+    def run(self, targets=None):
+        """
+        Run the target stages and everything they depend on.
+
+        Stages run inside a copy of the caller's context, so a computation
+        context opened by the caller is shared by every stage.
+
+        Args:
+            targets (iterable, optional): Names of the stages to run (all by default)
+
+        Returns:
+            tuple: Dictionary of results by stage name, and dictionary of
+                   each stage's run time in seconds
+        """
+        pending = self._resolve(targets if targets is not None else self.stages)
+        results = {}
+        timings = {}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as executor:
+            while pending or running:
+                # Start every stage whose dependencies have finished
+                for name in [name for name in pending
+                             if all(dep in results for dep in self.stages[name].dependencies)]:
+                    pending.remove(name)
+                    stage = self.stages[name]
+                    kwargs = {dep: results[dep] for dep in stage.dependencies}
+                    context = contextvars.copy_context()
+                    running[executor.submit(context.run, self._timed, stage, kwargs)] = name
+
+                if not running:
+                    raise ValueError(f"Stage graph has a cycle among: {', '.join(sorted(pending))}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name], timings[name] = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+
+        # Report results in graph order rather than completion order
+        ordered = [name for name in self.stages if name in results]
+        return {name: results[name] for name in ordered}, {name: timings[name] for name in ordered}
+
+    def _resolve(self, targets):
+        """Collect the target stages and their transitive dependencies."""
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].dependencies)
+        return needed
+
+    @staticmethod
+    def _timed(stage, kwargs):
+        """Run a stage and measure how long it took."""
+        start = time.perf_counter()
+        result = stage.func(**kwargs)
+        elapsed = time.perf_counter() - start
+        logger.debug(f"Stage '{stage.name}' finished in {elapsed:.3f}s")
+        return result, elapsed
@@ -1,10 +1,9 @@
 """
 Data processor module for aggregating and transforming data from multiple APIs.
 """
+import copy
 import logging
-import pandas as pd
-import numpy as np
-from collections import Counter, defaultdict
+from collections import defaultdict
 from datetime import datetime
 
 from api_clients.github_client import GitHubClient
@@ -13,20 +12,86 @@ from api_clients.hackernews_client import HackerNewsClient
 from api_clients.news_client import NewsClient
 from api_clients.reddit_client import RedditClient
 from api_clients.pytrends_client import PyTrendsClient
+from data_processing.clustering import TechnologyClusterer, name_cluster
+from data_processing.context import computation_context, memoized_stage
+from data_processing.correlation import CorrelationEngine, find_technologies, update_cooccurrence
+from data_processing.pipeline import Stage, StageExecutor
+from data_processing.scoring import PopularityScorer
+from data_processing.text_index import DocumentIndex
+from data_processing.topics import extract_topics
+from data_processing.trends import update_topic_stream
+from utils import http
+from utils.config import config
+from utils.lexicon import Lexicon
+from utils.text import text_pipeline
+from utils.lazy import LazyAttribute
 
 logger = logging.getLogger(__name__)
 
+def _create_snapshot_store():
+    """Open the report snapshot store (pyarrow is only imported when it is used)."""
+    from data_processing.snapshots import SNAPSHOT_DIR, SnapshotStore
+    return SnapshotStore(config.get('snapshots.path') or SNAPSHOT_DIR)
+
 class DataProcessor:
     
-    def __init__(self):
-        """Initialize the data processor with API clients."""
-        self.github_client = GitHubClient()
-        self.stackoverflow_client = StackOverflowClient()
-        self.hackernews_client = HackerNewsClient()
-        self.news_client = NewsClient()
-        self.reddit_client = RedditClient()
-        self.pytrends_client = PyTrendsClient()
+    # API clients are constructed on first use, so creating a processor
+    # (e.g. when the web app is imported) does no network I/O
+    github_client = LazyAttribute(GitHubClient)
+    stackoverflow_client = LazyAttribute(StackOverflowClient)
+    hackernews_client = LazyAttribute(HackerNewsClient)
+    news_client = LazyAttribute(NewsClient)
+    reddit_client = LazyAttribute(RedditClient)
+    pytrends_client = LazyAttribute(PyTrendsClient)
+    
+    # History of past reports
+    snapshot_store = LazyAttribute(_create_snapshot_store)
+    
+    def __init__(self, max_workers=None):
+        """
+        Initialize the data processor.
+        
+        Args:
+            max_workers (int, optional): Number of report stages to run in
+                parallel (defaults to the 'report.max_workers' setting)
+        """
+        self.max_workers = max_workers or config.get('report.max_workers', 4)
+        
+        # Called with every new insights report, e.g. to pre-render its charts
+        self.report_listeners = []
+    
+    def run_stages(self, targets=None):
+        """
+        Compute report stages and their dependencies on the stage executor.
+        
+        Independent stages run in parallel on up to ``max_workers`` threads and
+        share one computation context, so common dependencies run once.
+        
+        Args:
+            targets (list, optional): Stage names to compute, e.g.
+                ['technology_clusters'] (all stages by default)
+            
+        Returns:
+            tuple: Dictionary of results by stage name, and dictionary of
+                   each stage's run time in seconds
+        """
+        stages = [
+            Stage('popularity_ranking', lambda: self.get_technology_popularity()),
+            Stage('trending_topics', lambda: self.get_trending_topics()),
+            Stage('emerging_repositories', lambda popularity_ranking: self.get_emerging_repositories(),
+                  ['popularity_ranking']),
+            Stage('hot_discussions', lambda popularity_ranking: self.get_hot_discussions(),
+                  ['popularity_ranking']),
+            Stage('tech_correlations', lambda popularity_ranking: self.get_technology_correlations(),
+                  ['popularity_ranking']),
+            Stage('technology_clusters', lambda tech_correlations: self._identify_technology_clusters(tech_correlations),
+                  ['tech_correlations'])
+        ]
+        
+        with computation_context():
+            return StageExecutor(stages, max_workers=self.max_workers).run(targets)
     
+    @memoized_stage
     def get_technology_popularity(self):
  
         logger.info("Analyzing technology popularity across platforms...")
@@ -36,128 +101,57 @@ class DataProcessor:
         stackoverflow_tags = self.stackoverflow_client.get_popular_tags(limit=30)
         pytrends_tech = self.pytrends_client.get_trending_technologies(top_n=20)
         
-        # Extract technology names and normalize
-        technologies = set()
-        
-        # From GitHub languages
-        for lang in github_languages.keys():
-            technologies.add(lang.lower())
-        
-        # From Stack Overflow tags
-        for tag in stackoverflow_tags:
-            technologies.add(tag['name'].lower())
-        
-        # From PyTrends
-        for tech in pytrends_tech:
-            technologies.add(tech['name'].lower())
-        
-        # Create a standardized technology list
-        tech_popularity = {}
-        for tech in technologies:
-            # Initialize scores for each platform
-            scores = {
-                'github': 0,
-                'stackoverflow': 0,
-                'pytrends': 0
-            }
-            
-            # Calculate GitHub score (normalized)
-            for lang, count in github_languages.items():
-                if lang.lower() == tech:
-                    max_count = max(github_languages.values()) if github_languages else 1
-                    scores['github'] = (count / max_count) * 100
-            
-            # Calculate Stack Overflow score (normalized)
-            for tag in stackoverflow_tags:
-                if tag['name'].lower() == tech:
-                    max_count = max(tag['count'] for tag in stackoverflow_tags) if stackoverflow_tags else 1
-                    scores['stackoverflow'] = (tag['count'] / max_count) * 100
-            
-            # Calculate PyTrends score (normalized)
-            for trend in pytrends_tech:
-                if trend['name'].lower() == tech:
-                    max_popularity = max(t['popularity'] for t in pytrends_tech) if pytrends_tech else 1
-                    scores['pytrends'] = (trend['popularity'] / max_popularity) * 100
-            
-            # Calculate overall score (weighted average)
-            weights = {'github': 0.4, 'stackoverflow': 0.4, 'pytrends': 0.2}
-            overall_score = sum(score * weights[platform] for platform, score in scores.items())
-            
-            # Add to results if the technology has some presence
-            if overall_score > 0:
-                tech_popularity[tech] = {
-                    'overall_score': overall_score,
-                    'platform_scores': scores
-                }
-        
-        # Sort by overall score and return top results
-        sorted_tech = sorted(tech_popularity.items(), key=lambda x: x[1]['overall_score'], reverse=True)
-        return dict(sorted_tech)
+        # Score all platforms at once, aligned on the lowercased technology name
+        scorer = PopularityScorer(weights=config.get('popularity.weights'),
+                                  normalization=config.get('popularity.normalization', 'max'))
+        return scorer.score({
+            'github': github_languages,
+            'stackoverflow': {tag['name']: tag['count'] for tag in stackoverflow_tags},
+            'pytrends': {tech['name']: tech['popularity'] for tech in pytrends_tech}
+        })
     
+    @memoized_stage
     def get_trending_topics(self):
 
         logger.info("Identifying trending topics...")
         
-        # Collect data from different sources
-        news_articles = self.news_client.get_tech_news(days=3, limit=20)
-        reddit_posts = []
-        for subreddit, posts in self.reddit_client.get_tech_subreddit_posts(limit=5).items():
-            reddit_posts.extend(posts)
-        hackernews_stories = self.hackernews_client.get_tech_stories(limit=20)
-        
-        # Extract titles and descriptions for text analysis
-        texts = []
-        
-        # From news articles
-        for article in news_articles:
-            texts.append(article['title'])
-            if article['description']:
-                texts.append(article['description'])
-        
-        # From Reddit posts
-        for post in reddit_posts:
-            texts.append(post['title'])
+        # Collect data from different sources, tokenized and indexed for phrase lookups
+        corpus = self._get_trending_corpus()
         
-        # From HackerNews stories
-        for story in hackernews_stories:
-            texts.append(story['title'])
-        
-        # Perform text analysis to identify key phrases and topics
-        topics = self._extract_topics(texts)
+        # Perform text analysis on the titles and descriptions to identify key phrases and topics,
+        # ranked by how fast they are rising when the rolling topic stream is enabled
+        burst_scores = {}
+        if config.get('trends.enabled', True):
+            burst_scores = self._get_rising_topics(corpus)
+            topics = list(burst_scores)
+        else:
+            topics = self._extract_topics(corpus['documents'])
         
         # Map topics back to their sources for context
         topic_sources = defaultdict(list)
         
-        # Check each topic against each source
         for topic in topics:
-            # Check news articles
-            for article in news_articles:
-                if topic.lower() in article['title'].lower() or (article['description'] and topic.lower() in article['description'].lower()):
+            for source_type, item in corpus['index'].find(topic):
+                if source_type == 'news':
                     topic_sources[topic].append({
                         'source_type': 'news',
-                        'title': article['title'],
-                        'url': article['url'],
-                        'published_at': article['published_at']
+                        'title': item['title'],
+                        'url': item['url'],
+                        'published_at': item['published_at']
                     })
-            
-            # Check Reddit posts
-            for post in reddit_posts:
-                if topic.lower() in post['title'].lower():
+                elif source_type == 'reddit':
                     topic_sources[topic].append({
                         'source_type': 'reddit',
-                        'title': post['title'],
-                        'url': post['permalink'],
-                        'subreddit': post['subreddit']
+                        'title': item['title'],
+                        'url': item['permalink'],
+                        'subreddit': item['subreddit']
                     })
-            
-            # Check HackerNews stories
-            for story in hackernews_stories:
-                if topic.lower() in story['title'].lower():
+                else:
                     topic_sources[topic].append({
                         'source_type': 'hackernews',
-                        'title': story['title'],
-                        'url': story['url'],
-                        'score': story['score']
+                        'title': item['title'],
+                        'url': item['url'],
+                        'score': item['score']
                     })
         
         # Format the results
@@ -169,11 +163,15 @@ class DataProcessor:
                     'sources': sources,
                     'source_count': len(sources)
                 }
+                if topic in burst_scores:
+                    trending_topics[topic]['burst_score'] = burst_scores[topic]
         
-        # Sort by number of sources
-        sorted_topics = sorted(trending_topics.items(), key=lambda x: x[1]['source_count'], reverse=True)
+        # Sort by burst score when available, then by number of sources
+        sorted_topics = sorted(trending_topics.items(),
+                               key=lambda x: (x[1].get('burst_score', 0), x[1]['source_count']), reverse=True)
         return dict(sorted_topics)
     
+    @memoized_stage
     def get_emerging_repositories(self):
 
         logger.info("Identifying emerging repositories...")
@@ -188,7 +186,9 @@ class DataProcessor:
             repos = self.github_client.get_trending_repositories(language=tech.capitalize(), since="weekly", limit=3)
             
             for repo in repos:
-                # Add the technology as context
+                # Add the technology as context, on a copy: client results
+                # may be shared with other stages and requests
+                repo = copy.copy(repo)
                 repo['related_technology'] = tech
                 emerging_repos.append(repo)
         
@@ -196,6 +196,7 @@ class DataProcessor:
         emerging_repos.sort(key=lambda x: x['stars'], reverse=True)
         return emerging_repos[:20]  # Return top 20
     
+    @memoized_stage
     def get_hot_discussions(self):
 
         logger.info("Finding hot discussions...")
@@ -203,16 +204,15 @@ class DataProcessor:
         # Get trending technologies first
         trending_tech = list(self.get_technology_popularity().keys())[:10]
         
+        # Convert technology names to tag format (lowercase, no spaces)
+        tags = {tech: tech.lower().replace(' ', '-') for tech in trending_tech}
+        
         # Get Stack Overflow questions related to trending technologies
+        questions_by_tag = self._get_questions_by_tag(list(tags.values()), limit=2)
+        
         hot_discussions = []
         for tech in trending_tech:
-            # Convert technology name to tag format (lowercase, no spaces)
-            tag = tech.lower().replace(' ', '-')
-            
-            # Get questions from Stack Overflow
-            questions = self.stackoverflow_client.get_popular_questions(tags=[tag], period="week", limit=2)
-            
-            for question in questions:
+            for question in questions_by_tag.get(tags[tech], []):
                 hot_discussions.append({
                     'title': question['title'],
                     'url': question['link'],
@@ -224,17 +224,16 @@ class DataProcessor:
                 })
         
         # Get Reddit discussions
+        lexicon = Lexicon(trending_tech)
         subreddits = ['programming', 'technology', 'webdev', 'MachineLearning']
         for subreddit in subreddits:
             posts = self.reddit_client.get_top_posts(subreddit=subreddit, time_filter="week", limit=5)
             
             for post in posts:
-                # Check if post is related to any trending technology
-                related_tech = None
-                for tech in trending_tech:
-                    if tech.lower() in post['title'].lower():
-                        related_tech = tech
-                        break
+                # Check if post is related to any trending technology, preferring the most popular
+                title = text_pipeline.document(('reddit', post['permalink'], 'title'), post['title'])
+                mentioned = set(lexicon.find(title))
+                related_tech = next((tech for tech in trending_tech if tech in mentioned), None)
                 
                 if related_tech:
                     hot_discussions.append({
@@ -256,6 +255,7 @@ class DataProcessor:
         hot_discussions.sort(key=lambda x: x['engagement_score'], reverse=True)
         return hot_discussions
     
+    @memoized_stage
     def get_technology_correlations(self):
 
         logger.info("Analyzing technology correlations...")
@@ -266,84 +266,53 @@ class DataProcessor:
         # Get repositories and their associated technologies
         repositories = self.github_client.get_trending_repositories(limit=100)
         
-        # Build co-occurrence matrix
-        tech_pairs = []
+        # Each repository and question is a document, keyed by its ID, with
+        # the texts technologies are found in
+        documents = []
         
         # Analyze repository topics and descriptions
         for repo in repositories:
-            found_techs = []
-            
-            # Check description
-            if repo['description']:
-                for tech in trending_tech:
-                    if tech.lower() in repo['description'].lower():
-                        found_techs.append(tech)
-            
-            # Check topics
-            for topic in repo['topics']:
-                for tech in trending_tech:
-                    if tech.lower() == topic.lower() or tech.lower() in topic.lower():
-                        found_techs.append(tech)
-            
-            # Add all pairs of co-occurring technologies
-            for i in range(len(found_techs)):
-                for j in range(i+1, len(found_techs)):
-                    tech_pairs.append((found_techs[i], found_techs[j]))
+            documents.append((('repository', repo['name']), (repo['description'], *repo['topics'])))
         
         # Get Stack Overflow questions and their tags
-        for tech in trending_tech:
-            questions = self.stackoverflow_client.get_popular_questions(tags=[tech.lower()], limit=20)
-            
-            for question in questions:
-                found_techs = [tech]  # Start with the main technology
-                
-                # Check other tags
-                for tag in question['tags']:
-                    for other_tech in trending_tech:
-                        if other_tech.lower() == tag.lower() and other_tech != tech:
-                            found_techs.append(other_tech)
-                
-                # Add all pairs of co-occurring technologies
-                for i in range(len(found_techs)):
-                    for j in range(i+1, len(found_techs)):
-                        tech_pairs.append((found_techs[i], found_techs[j]))
-        
-        # Count co-occurrences
-        correlation_count = Counter(tech_pairs)
-        
-        # Calculate correlation matrix
-        tech_count = Counter()
-        for tech1, tech2 in tech_pairs:
-            tech_count[tech1] += 1
-            tech_count[tech2] += 1
-        
-        correlations = {}
-        for (tech1, tech2), count in correlation_count.items():
-            # Use Jaccard similarity: intersection / union
-            similarity = count / (tech_count[tech1] + tech_count[tech2] - count)
-            
-            if tech1 not in correlations:
-                correlations[tech1] = {}
-            if tech2 not in correlations:
-                correlations[tech2] = {}
-            
-            correlations[tech1][tech2] = similarity
-            correlations[tech2][tech1] = similarity
+        questions_by_tag = self._get_questions_by_tag([tech.lower() for tech in trending_tech], limit=20)
         
-        return correlations
+        # A question listed under several tags is still one document; the
+        # tags it was found under count with its own tags
+        question_texts = {}
+        for tech in trending_tech:
+            for question in questions_by_tag.get(tech.lower(), []):
+                key = question.get('question_id', question['link'])
+                texts = question_texts.setdefault(key, list(question['tags']))
+                if tech.lower() not in texts:
+                    texts.append(tech.lower())
+        
+        documents.extend((('question', key), texts) for key, texts in question_texts.items())
+        
+        metric = config.get('correlations.metric', 'jaccard')
+        if config.get('correlations.accumulate', True):
+            # Add the documents not seen before to the persisted rolling counts,
+            # matched against every technology tracked over the window
+            accumulator = update_cooccurrence(config.get('correlations.state_key', 'correlations:cooccurrence'),
+                                              documents, trending_tech,
+                                              history_days=config.get('correlations.history_days', 30))
+            return accumulator.to_dict(trending_tech, metric=metric)
+        
+        lexicon = Lexicon(trending_tech)
+        engine = CorrelationEngine(trending_tech)
+        for _, texts in documents:
+            engine.add_document(find_technologies(lexicon, texts))
+        return engine.to_dict(metric=metric)
     
     def get_technology_insights_report(self):
 
         logger.info("Generating comprehensive technology insights report...")
         
-        report = {
-            'timestamp': datetime.now().isoformat(),
-            'popularity_ranking': self.get_technology_popularity(),
-            'trending_topics': self.get_trending_topics(),
-            'emerging_repositories': self.get_emerging_repositories(),
-            'hot_discussions': self.get_hot_discussions(),
-            'tech_correlations': self.get_technology_correlations()
-        }
+        started = datetime.now()
+        stage_results, stage_timings = self.run_stages()
+        
+        report = {'timestamp': started.isoformat()}
+        report.update(stage_results)
         
         # Add some higher-level insights
         
@@ -353,9 +322,9 @@ class DataProcessor:
         report['top_technologies'] = [{'name': tech, 'score': data['overall_score']} 
                                       for tech, data in top_tech]
         
-        # Top 5 trending topics by source count
+        # Top 5 trending topics by burst score (when ranked by the topic stream), then source count
         top_topics = sorted(report['trending_topics'].items(), 
-                            key=lambda x: x[1]['source_count'], reverse=True)[:5]
+                            key=lambda x: (x[1].get('burst_score', 0), x[1]['source_count']), reverse=True)[:5]
         report['top_trending_topics'] = [{'topic': topic, 'source_count': data['source_count']} 
                                          for topic, data in top_topics]
         
@@ -367,105 +336,165 @@ class DataProcessor:
         report['top_discussions'] = sorted(report['hot_discussions'], 
                                            key=lambda x: x['engagement_score'], reverse=True)[:5]
         
-        # Find technology clusters based on correlations
-        clusters = self._identify_technology_clusters(report['tech_correlations'])
-        report['technology_clusters'] = clusters
+        # Record how long each stage took
+        report['metadata'] = {
+            'max_workers': self.max_workers,
+            'stage_timings': stage_timings,
+            'total_time': (datetime.now() - started).total_seconds()
+        }
+        
+        # Keep the run's scores for historical queries (replayed runs are not new history);
+        # a failure doesn't lose the report
+        if config.get('snapshots.enabled', True) and not http.replaying():
+            try:
+                self.snapshot_store.append(report)
+            except Exception as e:
+                logger.error(f"Error storing report snapshot: {e}")
+        
+        for listener in self.report_listeners:
+            try:
+                listener(report)
+            except Exception as e:
+                logger.error(f"Error notifying report listener: {e}")
         
         return report
     
-    def _extract_topics(self, texts):
-
-        # Define stop words (common words to ignore)
-        stop_words = set([
-            'the', 'and', 'is', 'of', 'to', 'a', 'in', 'for', 'on', 'with', 'as', 'by',
-            'an', 'are', 'at', 'be', 'this', 'that', 'it', 'from', 'or', 'have', 'has',
-            'new', 'more', 'how', 'what', 'why', 'when', 'who', 'where', 'which', 'not',
-            'but', 'can', 'about', 'its', 'their', 'your', 'our', 'we', 'you', 'they',
-            'now', 'get', 'all', 'one', 'two', 'three', 'over', 'may', 'just', 'first',
-            'after', 'into', 'time', 'year', 'day', 'was', 'will', 'should', 'could',
-            'would', 'do', 'if', 'my', 'than', 'then', 'no', 'only', 'also', 'use', 'using'
-        ])
-        
-        # Define technology terms to specifically look for
-        tech_terms = [
-            'ai', 'artificial intelligence', 'machine learning', 'deep learning', 'neural network',
-            'blockchain', 'cryptocurrency', 'bitcoin', 'ethereum', 'web3', 'nft',
-            'cloud', 'aws', 'azure', 'google cloud', 'serverless', 'kubernetes', 'docker',
-            'python', 'javascript', 'typescript', 'rust', 'go', 'java', 'c++', 'kotlin', 'swift',
-            'react', 'vue', 'angular', 'svelte', 'next.js', 'django', 'flask', 'spring',
-            'devops', 'cicd', 'security', 'cybersecurity', 'devsecops', 'encryption',
-            'api', 'rest', 'graphql', 'microservices', 'serverless', 'edge computing',
-            'quantum computing', 'augmented reality', 'virtual reality', 'ar', 'vr', 'metaverse',
-            'data science', 'big data', 'analytics', 'visualization', 'business intelligence',
-            'iot', 'internet of things', 'embedded', 'robotics', 'automation',
-            '5g', '6g', 'networking', 'wifi', 'bluetooth', 'protocol', 'standard'
-        ]
+    def _get_questions_by_tag(self, tags, limit):
+        """
+        Fetch popular Stack Overflow questions for each tag.
         
-        # Process all texts
-        word_counts = Counter()
-        bigram_counts = Counter()
-        trigram_counts = Counter()
+        Uses the client's fetch-once bulk mode unless it is disabled in the
+        configuration, in which case every tag is requested separately.
         
-        for text in texts:
-            # Normalize text
-            clean_text = text.lower()
-            
-            # Split into words
-            words = clean_text.split()
-            words = [word.strip('.,!?()[]{}:;"\'') for word in words]
-            words = [word for word in words if word and word not in stop_words and len(word) > 2]
-            
-            # Count words
-            word_counts.update(words)
-            
-            # Count bigrams (pairs of consecutive words)
-            for i in range(len(words) - 1):
-                bigram = f"{words[i]} {words[i+1]}"
-                bigram_counts[bigram] += 1
-            
-            # Count trigrams (triplets of consecutive words)
-            for i in range(len(words) - 2):
-                trigram = f"{words[i]} {words[i+1]} {words[i+2]}"
-                trigram_counts[trigram] += 1
+        Args:
+            tags (list): Stack Overflow tags
+            limit (int): Maximum number of questions per tag
             
-            # Check for specific tech terms
-            for term in tech_terms:
-                if term in clean_text:
-                    word_counts[term] += 3  # Give higher weight to known tech terms
-        
-        # Combine all n-grams and sort by frequency
-        all_phrases = []
-        
-        # Add most frequent words (excluding those that are part of frequent bigrams)
-        for word, count in word_counts.most_common(100):
-            # Skip words that are more valuable as part of bigrams
-            skip = False
-            for bigram in bigram_counts:
-                if word in bigram.split() and bigram_counts[bigram] > count / 2:
-                    skip = True
-                    break
+        Returns:
+            dict: Dictionary mapping each tag to its list of questions
+        """
+        if config.get('stackoverflow_bulk.enabled', True):
+            pages = config.get('stackoverflow_bulk.pages', 5)
+            return self.stackoverflow_client.get_questions_by_tag(
+                tags, period="week", limit=limit, pages=pages, top_questions=self._get_top_questions(pages))
+        
+        return {tag: self.stackoverflow_client.get_popular_questions(tags=[tag], period="week", limit=limit)
+                for tag in tags}
+    
+    @memoized_stage
+    def _get_top_questions(self, pages):
+        """
+        Fetch the week's top Stack Overflow questions for the bulk pull.
+        
+        Memoized so that stages running in parallel (hot discussions and
+        technology correlations) share one pull instead of both fetching it
+        on a cold cache.
+        
+        Args:
+            pages (int): Number of 100-question pages to pull
             
-            if not skip:
-                all_phrases.append((word, count))
-        
-        for bigram, count in bigram_counts.most_common(50):
-            # Skip bigrams that are more valuable as part of trigrams
-            skip = False
-            for trigram in trigram_counts:
-                if all(word in trigram.split() for word in bigram.split()) and trigram_counts[trigram] > count / 2:
-                    skip = True
-                    break
+        Returns:
+            list: List of questions sorted by votes
+        """
+        return self.stackoverflow_client.get_top_questions(period="week", pages=pages)
+    
+    @memoized_stage
+    def _get_trending_corpus(self):
+        """
+        Fetch recent news articles, Reddit posts and HackerNews stories, and
+        tokenize and index their texts once so every stage searching them can
+        reuse the result.
+        
+        Returns:
+            dict: The 'news', 'reddit' and 'hackernews' items; their titles and
+                  descriptions as processed 'documents' with their 'document_ids';
+                  and a DocumentIndex 'index' whose documents are (source type,
+                  item) tuples
+        """
+        news_articles = self.news_client.get_tech_news(days=3, limit=20)
+        reddit_posts = []
+        for subreddit, posts in self.reddit_client.get_tech_subreddit_posts(limit=5).items():
+            reddit_posts.extend(posts)
+        hackernews_stories = self.hackernews_client.get_tech_stories(limit=20)
+        
+        documents = []
+        document_ids = []
+        index = DocumentIndex()
+        
+        def add_document(doc_id, text):
+            document = text_pipeline.document(doc_id, text)
+            documents.append(document)
+            document_ids.append(doc_id)
+            return document
+        
+        # From news articles
+        for article in news_articles:
+            fields = [add_document(('news', article['url'], 'title'), article['title'])]
+            if article['description']:
+                fields.append(add_document(('news', article['url'], 'description'), article['description']))
+            index.add(('news', article), *fields)
+        
+        # From Reddit posts
+        for post in reddit_posts:
+            index.add(('reddit', post), add_document(('reddit', post['permalink'], 'title'), post['title']))
+        
+        # From HackerNews stories
+        for story in hackernews_stories:
+            index.add(('hackernews', story),
+                      add_document(('hackernews', story.get('id', story['url']), 'title'), story['title']))
+        
+        return {
+            'news': news_articles,
+            'reddit': reddit_posts,
+            'hackernews': hackernews_stories,
+            'documents': documents,
+            'document_ids': document_ids,
+            'index': index
+        }
+    
+    def _extract_topics(self, texts):
+        """
+        Extract the most significant topics from a collection of texts.
+        
+        Args:
+            texts (list): Texts to analyze, as strings or processed Documents
             
-            if not skip:
-                all_phrases.append((bigram, count * 1.5))  # Give higher weight to bigrams
+        Returns:
+            list: Top 30 phrases, most significant first
+        """
+        return extract_topics(texts, top_n=30,
+                              processes=config.get('topics.processes', 0),
+                              min_parallel_texts=config.get('topics.min_parallel_texts', 5000),
+                              counting=config.get('topics.counting', 'auto'),
+                              capacity=config.get('topics.capacity', 20000),
+                              approximate_above=config.get('topics.approximate_above', 50000))
+    
+    def _get_rising_topics(self, corpus):
+        """
+        Add the corpus documents to the persisted rolling topic stream and rank
+        the topics rising in its recent window.
         
-        # Add most frequent trigrams
-        for trigram, count in trigram_counts.most_common(30):
-            all_phrases.append((trigram, count * 2))  # Give higher weight to trigrams
+        Only documents the stream has not seen before are counted. The stream
+        stays in memory between refreshes and only its changed buckets are
+        saved, so a refresh costs time proportional to the new documents and
+        the current day's bucket, not to the whole history.
         
-        # Sort by weight and return top phrases
-        all_phrases.sort(key=lambda x: x[1], reverse=True)
-        return [phrase for phrase, _ in all_phrases[:30]]  # Return top 30 topics
+        Args:
+            corpus (dict): Trending corpus with 'documents' and 'document_ids'
+            
+        Returns:
+            dict: Burst score by topic, highest first
+        """
+        stream = update_topic_stream(
+            config.get('trends.state_key', 'trends:topic_stream'),
+            zip(corpus['document_ids'], corpus['documents']),
+            recent_hours=config.get('trends.recent_hours', 24),
+            history_days=config.get('trends.history_days', 30),
+            smoothing=config.get('trends.smoothing', 1.0),
+            max_daily_phrases=config.get('trends.max_daily_phrases', 20000))
+        
+        rising = stream.trending(top_n=30, min_count=config.get('trends.min_count', 2))
+        return {topic['topic']: round(topic['score'], 3) for topic in rising}
     
     def _identify_technology_clusters(self, correlations):
         """
@@ -481,92 +510,21 @@ class DataProcessor:
         if not correlations or len(correlations) < 3:
             return []
         
-        # Convert correlation dict to a matrix format for easier processing
-        technologies = list(correlations.keys())
-        matrix = []
-        
-        for tech1 in technologies:
-            row = []
-            for tech2 in technologies:
-                if tech2 in correlations.get(tech1, {}):
-                    row.append(correlations[tech1][tech2])
-                else:
-                    row.append(0)
-            matrix.append(row)
-        
-        # Convert to numpy array for better processing
-        corr_matrix = np.array(matrix)
-        
-        # Simple clustering algorithm (hierarchical)
-        clusters = []
-        remaining_techs = set(technologies)
-        
-        # Threshold for considering technologies related
-        threshold = 0.3
-        
-        while remaining_techs:
-            # Start a new cluster with the first remaining technology
-            current_tech = next(iter(remaining_techs))
-            current_cluster = [current_tech]
-            remaining_techs.remove(current_tech)
-            
-            # Find all technologies that correlate with the current technology
-            tech_index = technologies.index(current_tech)
-            for i, corr in enumerate(corr_matrix[tech_index]):
-                if i != tech_index and technologies[i] in remaining_techs and corr > threshold:
-                    current_cluster.append(technologies[i])
-                    remaining_techs.remove(technologies[i])
-            
-            # Add the cluster if it has at least one technology
-            if current_cluster:
-                clusters.append(current_cluster)
-        
-        # Sort clusters by size
-        clusters.sort(key=len, reverse=True)
+        clusterer = TechnologyClusterer(threshold=config.get('clustering.threshold', 0.3),
+                                        mode=config.get('clustering.mode', 'components'))
         
         # Format the clusters with descriptive names
-        named_clusters = []
-        for i, cluster in enumerate(clusters):
-            # Skip singleton clusters
-            if len(cluster) < 2:
-                continue
-                
-            # Try to determine a name for the cluster based on the technologies
-            cluster_name = self._determine_cluster_name(cluster)
-            
-            named_clusters.append({
-                'name': cluster_name,
-                'technologies': cluster
-            })
-        
-        return named_clusters
+        return [{'name': self._determine_cluster_name(cluster), 'technologies': cluster}
+                for cluster in clusterer.cluster(correlations)]
     
     def _determine_cluster_name(self, technologies):
-
-        # Common technology categories for naming clusters
-        categories = {
-            'web development': ['javascript', 'typescript', 'react', 'vue', 'angular', 'html', 'css', 'node', 'webpack', 'bootstrap'],
-            'data science': ['python', 'r', 'pandas', 'numpy', 'jupyter', 'data science', 'machine learning', 'analytics', 'visualization'],
-            'ai & ml': ['ai', 'artificial intelligence', 'machine learning', 'deep learning', 'neural network', 'tensorflow', 'pytorch', 'nlp'],
-            'cloud & devops': ['cloud', 'aws', 'azure', 'gcp', 'kubernetes', 'docker', 'devops', 'ci/cd', 'terraform', 'serverless'],
-            'mobile development': ['android', 'ios', 'swift', 'kotlin', 'flutter', 'react native', 'mobile'],
-            'backend development': ['java', 'spring', 'django', 'flask', 'express', 'api', 'rest', 'graphql', 'microservices'],
-            'database technologies': ['sql', 'postgresql', 'mysql', 'mongodb', 'redis', 'database', 'nosql'],
-            'blockchain & crypto': ['blockchain', 'crypto', 'bitcoin', 'ethereum', 'web3', 'nft', 'defi', 'dao'],
-            'systems programming': ['c', 'c++', 'rust', 'go', 'systems']
-        }
-        
-        # Count matches for each category
-        category_matches = {}
-        for category, keywords in categories.items():
-            matches = sum(any(tech.lower() in keyword.lower() or keyword.lower() in tech.lower() for tech in technologies) for keyword in keywords)
-            category_matches[category] = matches
-        
-        # Find the category with the most matches
-        best_category = max(category_matches.items(), key=lambda x: x[1])
+        """
+        Name a cluster after the technology category it best matches.
         
-        # Use the category name if it has at least 2 matches, otherwise use a generic name
-        if best_category[1] >= 2:
-            return best_category[0].title()
-        else:
-            return f"Related Technologies ({len(technologies)})"
+        Args:
+            technologies (list): Technologies in the cluster
+            
+        Returns:
+            str: Cluster name
+        """
+        return name_cluster(technologies)
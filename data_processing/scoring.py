@@ -0,0 +1,107 @@
+"""
+Vectorized popularity scoring across platforms.
+"""
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+class PopularityScorer:
+    """
+    Scores technologies by combining normalized per-platform metrics.
+
+    Each platform's raw values (e.g. repository counts, tag counts, search
+    interest) are aligned on a normalized technology key, normalized to a
+    0-100 scale once per platform, and combined with per-platform weights.
+    """
+
+    DEFAULT_WEIGHTS = {'github': 0.4, 'stackoverflow': 0.4, 'pytrends': 0.2}
+
+    # Supported normalization methods, each mapping raw values to 0-100:
+    #   max    - share of the platform's maximum value
+    #   rank   - percentile rank within the platform
+    #   log    - log1p(value) as a share of log1p(max), compressing heavy tails
+    #   zscore - standard score mapped so the mean is 50 and +/-3 std devs span 0-100
+    NORMALIZATIONS = ('max', 'rank', 'log', 'zscore')
+
+    def __init__(self, weights=None, normalization='max'):
+        """
+        Args:
+            weights (dict, optional): Weight of each platform in the overall score
+            normalization (str or dict): Normalization method for all platforms,
+                or a dictionary of methods by platform (unlisted platforms use 'max')
+        """
+        self.weights = dict(weights or self.DEFAULT_WEIGHTS)
+
+        if isinstance(normalization, dict):
+            self.normalization = {platform: normalization.get(platform, 'max') for platform in self.weights}
+        else:
+            self.normalization = {platform: normalization or 'max' for platform in self.weights}
+
+        for platform, method in self.normalization.items():
+            if method not in self.NORMALIZATIONS:
+                raise ValueError(f"Unknown normalization '{method}' for {platform}; "
+                                 f"expected one of {', '.join(self.NORMALIZATIONS)}")
+
+    def score(self, platform_values):
+        """
+        Compute overall and per-platform scores.
+
+        Args:
+            platform_values (dict): For each platform, a dictionary of raw values
+                by technology name. Names are matched case-insensitively.
+
+        Returns:
+            dict: Technologies with a positive overall score, sorted by it, each
+                  with 'overall_score' and 'platform_scores'
+        """
+        columns = {}
+        for platform in self.weights:
+            values = self._align(platform_values.get(platform) or {})
+            columns[platform] = self._normalize(values, self.normalization[platform])
+
+        frame = pd.DataFrame(columns, columns=list(self.weights)).fillna(0.0)
+        if frame.empty:
+            return {}
+
+        overall = frame.mul(pd.Series(self.weights)).sum(axis=1)
+
+        # Only technologies with some presence, highest score first
+        keep = overall[overall > 0].sort_values(ascending=False, kind='mergesort')
+        frame = frame.loc[keep.index]
+
+        platform_scores = frame.to_dict(orient='index')
+        return {tech: {'overall_score': float(score), 'platform_scores': platform_scores[tech]}
+                for tech, score in keep.items()}
+
+    @staticmethod
+    def _align(values):
+        """Index raw values by normalized technology key (last duplicate wins)."""
+        series = pd.Series(values, dtype=float)
+        series.index = series.index.map(lambda name: str(name).strip().lower())
+        return series[~series.index.duplicated(keep='last')]
+
+    @staticmethod
+    def _normalize(values, method):
+        """Normalize one platform's values to a 0-100 scale."""
+        if values.empty:
+            return values
+
+        if method == 'rank':
+            return values.rank(pct=True) * 100
+
+        if method == 'zscore':
+            std = values.std(ddof=0)
+            if not std > 0:
+                return pd.Series(100.0, index=values.index)
+            z = (values - values.mean()) / std
+            return (50 + z * 50 / 3).clip(0, 100)
+
+        if method == 'log':
+            values = np.log1p(values.clip(lower=0))
+
+        max_value = values.max()
+        if not max_value > 0:
+            return values * 0
+        return values / max_value * 100
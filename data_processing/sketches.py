@@ -0,0 +1,147 @@
+"""
+Bounded-memory approximate counting of frequent items.
+"""
+import heapq
+import itertools
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters summary (Metwally et al., 2005).
+
+    Tracks at most ``capacity`` items. When a new item arrives and the
+    summary is full, the item with the smallest count is replaced and the
+    newcomer inherits that count as its possible overestimate. After N
+    increments in total:
+
+    - every tracked item's count overestimates its true count by at most
+      ``error(item)``, and ``error(item) <= N / capacity``;
+    - every item whose true count exceeds N / capacity is tracked.
+
+    Memory is fixed by ``capacity``. The summary supports the parts of the
+    Counter interface used for ranking (``update``, ``most_common``,
+    ``items``, lookups), so it can stand in for a Counter.
+    """
+
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity (int): Maximum number of tracked items
+        """
+        if capacity < 1:
+            raise ValueError("SpaceSaving capacity must be at least 1")
+
+        self.capacity = capacity
+        self.total = 0
+        self._counts = {}
+        self._errors = {}
+        # Min-heap of (count, sequence, item); entries whose count is stale are
+        # skipped when popped and the heap is rebuilt when it grows too large
+        self._heap = []
+        self._sequence = itertools.count()
+
+    def add(self, item, count=1):
+        """
+        Count occurrences of an item.
+
+        Args:
+            item: Hashable item
+            count (int): Number of occurrences
+        """
+        self.total += count
+        counts = self._counts
+
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+            self._errors[item] = 0
+        else:
+            minimum, victim = self._pop_minimum()
+            del counts[victim]
+            del self._errors[victim]
+            counts[item] = minimum + count
+            self._errors[item] = minimum
+
+        heapq.heappush(self._heap, (counts[item], next(self._sequence), item))
+        if len(self._heap) > 2 * self.capacity + 64:
+            self._rebuild_heap()
+
+    def update(self, items):
+        """
+        Count items like Counter.update.
+
+        Args:
+            items (iterable or dict): Items, each counted once, or a
+                dictionary of counts by item
+        """
+        if hasattr(items, 'items'):
+            for item, count in items.items():
+                self.add(item, count)
+        else:
+            for item in items:
+                self.add(item)
+
+    def _pop_minimum(self):
+        """Remove and return the current (count, item) with the smallest count."""
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            if self._counts.get(item) == count:
+                return count, item
+
+    def _rebuild_heap(self):
+        """Drop stale heap entries."""
+        self._heap = [(count, next(self._sequence), item) for item, count in self._counts.items()]
+        heapq.heapify(self._heap)
+
+    def error(self, item):
+        """
+        Return the most an item's count may overestimate its true count.
+
+        Args:
+            item: Tracked item
+
+        Returns:
+            int: Overestimate bound (0 for items tracked since their first occurrence)
+        """
+        return self._errors.get(item, 0)
+
+    @property
+    def max_error(self):
+        """Bound on every tracked count's overestimate: total / capacity."""
+        return self.total / self.capacity
+
+    def most_common(self, n=None):
+        """
+        Return the items with the highest counts.
+
+        Args:
+            n (int, optional): Number of items (all tracked items by default)
+
+        Returns:
+            list: (item, count) tuples, highest count first
+        """
+        if n is None:
+            return sorted(self._counts.items(), key=lambda x: x[1], reverse=True)
+        return heapq.nlargest(n, self._counts.items(), key=lambda x: x[1])
+
+    def items(self):
+        return self._counts.items()
+
+    def keys(self):
+        return self._counts.keys()
+
+    def get(self, item, default=None):
+        return self._counts.get(item, default)
+
+    def __getitem__(self, item):
+        # Like a Counter, untracked items count zero
+        return self._counts.get(item, 0)
+
+    def __contains__(self, item):
+        return item in self._counts
+
+    def __iter__(self):
+        return iter(self._counts)
+
+    def __len__(self):
+        return len(self._counts)
@@ -0,0 +1,372 @@
+"""
+Append-only store of report snapshots in partitioned Parquet files.
+
+Every insights report is flattened into four tables (popularity scores,
+trending topics, emerging repositories and hot discussions) whose rows
+carry the report's ``run_at`` time. Each run writes one file per table
+under ``<root>/<table>/date=<YYYY-MM-DD>/``, and past days are compacted
+into one file, so a range query only opens the few files of the days it
+covers, and history never has to be fetched from the upstream APIs again.
+"""
+import contextlib
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Default location of the store
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'snapshots')
+
+RUN_AT = pa.timestamp('us', tz='UTC')
+
+TABLES = {
+    'popularity': pa.schema([
+        ('run_at', RUN_AT),
+        ('technology', pa.string()),
+        ('overall_score', pa.float64()),
+        ('github_score', pa.float64()),
+        ('stackoverflow_score', pa.float64()),
+        ('pytrends_score', pa.float64())
+    ]),
+    'topics': pa.schema([
+        ('run_at', RUN_AT),
+        ('topic', pa.string()),
+        ('source_count', pa.int64()),
+        ('burst_score', pa.float64())
+    ]),
+    'repositories': pa.schema([
+        ('run_at', RUN_AT),
+        ('name', pa.string()),
+        ('url', pa.string()),
+        ('language', pa.string()),
+        ('related_technology', pa.string()),
+        ('stars', pa.int64()),
+        ('forks', pa.int64())
+    ]),
+    'discussions': pa.schema([
+        ('run_at', RUN_AT),
+        ('title', pa.string()),
+        ('url', pa.string()),
+        ('source', pa.string()),
+        ('related_technology', pa.string()),
+        ('score', pa.int64()),
+        ('engagement_score', pa.float64())
+    ])
+}
+
+# Partition directories are named date=YYYY-MM-DD, compared as strings
+PARTITIONING = ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive')
+
+# Hidden lock file held while a partition is compacted
+COMPACT_LOCK = '.compact.lock'
+
+# A compaction lock older than this many seconds was left by a dead process
+STALE_LOCK_AGE = 600
+
+def snapshot_rows(report):
+    """
+    Flatten an insights report into rows of each snapshot table.
+
+    Args:
+        report (dict): Report from DataProcessor.get_technology_insights_report
+
+    Returns:
+        dict: Lists of row dictionaries (without run_at) by table name
+    """
+    rows = {table: [] for table in TABLES}
+
+    for tech, data in report.get('popularity_ranking', {}).items():
+        platform_scores = data.get('platform_scores', {})
+        rows['popularity'].append({
+            'technology': tech,
+            'overall_score': data['overall_score'],
+            'github_score': platform_scores.get('github'),
+            'stackoverflow_score': platform_scores.get('stackoverflow'),
+            'pytrends_score': platform_scores.get('pytrends')
+        })
+
+    for topic, data in report.get('trending_topics', {}).items():
+        rows['topics'].append({
+            'topic': topic,
+            'source_count': data['source_count'],
+            'burst_score': data.get('burst_score')
+        })
+
+    for repo in report.get('emerging_repositories', []):
+        rows['repositories'].append({
+            'name': repo['name'],
+            'url': repo.get('url'),
+            'language': repo.get('language'),
+            'related_technology': repo.get('related_technology'),
+            'stars': repo['stars'],
+            'forks': repo.get('forks')
+        })
+
+    for discussion in report.get('hot_discussions', []):
+        rows['discussions'].append({
+            'title': discussion['title'],
+            'url': discussion.get('url'),
+            'source': discussion['source'],
+            'related_technology': discussion.get('related_technology'),
+            'score': discussion.get('score'),
+            'engagement_score': discussion.get('engagement_score')
+        })
+
+    return rows
+
+def _as_utc(moment):
+    """Interpret a datetime (naive ones as local time) or ISO string in UTC."""
+    if isinstance(moment, str):
+        moment = datetime.fromisoformat(moment)
+    return moment.astimezone(timezone.utc)
+
+def _write_file(data, directory, filename):
+    """
+    Write a Parquet file under a hidden temporary name (skipped by dataset
+    discovery) and rename it into place, so queries never read a partial file.
+    """
+    tmp_path = os.path.join(directory, f".{filename}.tmp")
+    pq.write_table(data, tmp_path)
+    os.replace(tmp_path, os.path.join(directory, filename))
+
+@contextlib.contextmanager
+def _partition_lock(directory):
+    """
+    Hold a partition's compaction lock, shared by every process through a
+    lock file created exclusively.
+
+    Yields:
+        bool: Whether the lock was acquired; if not, another process is
+              compacting the partition
+    """
+    path = os.path.join(directory, COMPACT_LOCK)
+    try:
+        if time.time() - os.path.getmtime(path) > STALE_LOCK_AGE:
+            os.remove(path)
+    except OSError:
+        pass
+
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        yield False
+        return
+
+    try:
+        yield True
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+class SnapshotStore:
+    """
+    Partitioned Parquet files of report snapshots, with range queries.
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        """
+        Args:
+            root (str): Directory holding one subdirectory per table
+        """
+        self.root = root
+
+    def append(self, report, run_at=None):
+        """
+        Store the snapshot of a report.
+
+        The previous day's partition of each table is compacted into a single
+        file, so scans over past days open one file per day.
+
+        Args:
+            report (dict): Insights report
+            run_at (datetime or str, optional): Time of the run (defaults to
+                the report's 'timestamp', or now)
+
+        Returns:
+            dict: Number of rows written by table
+        """
+        run_at = _as_utc(run_at or report.get('timestamp') or datetime.now(timezone.utc))
+        partition = f"date={run_at.date().isoformat()}"
+        filename = f"{run_at.strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}.parquet"
+
+        written = {}
+        for table, rows in snapshot_rows(report).items():
+            if not rows:
+                continue
+
+            for row in rows:
+                row['run_at'] = run_at
+            data = pa.Table.from_pylist(rows, schema=TABLES[table])
+
+            directory = os.path.join(self.root, table, partition)
+            os.makedirs(directory, exist_ok=True)
+            _write_file(data, directory, filename)
+            written[table] = len(rows)
+
+            # The snapshot is stored even if compaction fails; a later append retries it
+            try:
+                self.compact(table, (run_at.date() - timedelta(days=1)).isoformat())
+            except Exception as e:
+                logger.error(f"Error compacting the {table} snapshots of the previous day: {e}")
+
+        logger.debug(f"Stored report snapshot of {run_at.isoformat()}: {written}")
+        return written
+
+    def scan(self, table, start=None, end=None, filter=None, columns=None):
+        """
+        Read the rows of a table stored between two times.
+
+        Only the daily partitions overlapping the range are opened.
+
+        Args:
+            table (str): One of TABLES
+            start (datetime or str, optional): Earliest run time (inclusive)
+            end (datetime or str, optional): Latest run time (inclusive)
+            filter (pyarrow.compute.Expression, optional): Additional row filter,
+                e.g. ``ds.field('technology') == 'python'``
+            columns (list, optional): Columns to read (all by default)
+
+        Returns:
+            pandas.DataFrame: Matching rows ordered by run_at
+        """
+        if table not in TABLES:
+            raise ValueError(f"Unknown snapshot table '{table}'; expected one of {', '.join(TABLES)}")
+
+        schema = TABLES[table]
+        path = os.path.join(self.root, table)
+        if not os.path.isdir(path):
+            return schema.empty_table().to_pandas()
+
+        expression = ds.scalar(True)
+        if start is not None:
+            start = _as_utc(start)
+            expression &= (ds.field('date') >= start.date().isoformat()) & (ds.field('run_at') >= pa.scalar(start, RUN_AT))
+        if end is not None:
+            end = _as_utc(end)
+            expression &= (ds.field('date') <= end.date().isoformat()) & (ds.field('run_at') <= pa.scalar(end, RUN_AT))
+        if filter is not None:
+            expression &= filter
+
+        dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+        frame = dataset.to_table(columns=columns or schema.names, filter=expression).to_pandas()
+        if 'run_at' in frame.columns:
+            frame = frame.sort_values('run_at', kind='stable').reset_index(drop=True)
+        return frame
+
+    def technology_history(self, technology, days=90, now=None):
+        """
+        Popularity scores of a technology over the last days.
+
+        Args:
+            technology (str): Technology name as ranked
+            days (int): Number of days to cover
+            now (datetime, optional): End of the range (defaults to now)
+
+        Returns:
+            pandas.DataFrame: run_at, overall_score and per-platform scores
+        """
+        end = _as_utc(now or datetime.now(timezone.utc))
+        return self.scan('popularity', start=end - timedelta(days=days), end=end,
+                         filter=ds.field('technology') == technology,
+                         columns=['run_at', 'overall_score', 'github_score', 'stackoverflow_score', 'pytrends_score'])
+
+    def topic_history(self, topic, days=30, now=None):
+        """
+        Source counts and burst scores of a topic over the last days.
+
+        Args:
+            topic (str): Topic phrase
+            days (int): Number of days to cover
+            now (datetime, optional): End of the range (defaults to now)
+
+        Returns:
+            pandas.DataFrame: run_at, source_count and burst_score
+        """
+        end = _as_utc(now or datetime.now(timezone.utc))
+        return self.scan('topics', start=end - timedelta(days=days), end=end,
+                         filter=ds.field('topic') == topic, columns=['run_at', 'source_count', 'burst_score'])
+
+    def rising_repositories(self, days=7, top_n=10, now=None):
+        """
+        Repositories that gained the most stars over the last days.
+
+        A repository's gain is the difference between the stars of its
+        latest and earliest snapshots in the range.
+
+        Args:
+            days (int): Number of days to cover
+            top_n (int): Number of repositories to return
+            now (datetime, optional): End of the range (defaults to now)
+
+        Returns:
+            pandas.DataFrame: name, language, first_seen, last_seen,
+                first_stars, last_stars and star_gain, largest gain first
+        """
+        end = _as_utc(now or datetime.now(timezone.utc))
+        frame = self.scan('repositories', start=end - timedelta(days=days), end=end,
+                          columns=['run_at', 'name', 'language', 'stars'])
+        columns = ['name', 'language', 'first_seen', 'last_seen', 'first_stars', 'last_stars', 'star_gain']
+        if frame.empty:
+            return pd.DataFrame(columns=columns)
+
+        # A repository listed under several technologies in one run counts once
+        frame = frame.drop_duplicates(['run_at', 'name'])
+        grouped = frame.groupby('name', sort=False)
+        summary = pd.DataFrame({
+            'language': grouped['language'].last(),
+            'first_seen': grouped['run_at'].first(),
+            'last_seen': grouped['run_at'].last(),
+            'first_stars': grouped['stars'].first(),
+            'last_stars': grouped['stars'].last()
+        }).reset_index()
+        summary['star_gain'] = summary['last_stars'] - summary['first_stars']
+
+        summary = summary[summary['star_gain'] > 0]
+        return summary.sort_values('star_gain', ascending=False, kind='stable').head(top_n)[columns].reset_index(drop=True)
+
+    def compact(self, table, date):
+        """
+        Merge the files of one daily partition into a single file.
+
+        Only one process compacts a partition at a time; others skip it
+        rather than merge files that are being replaced.
+
+        Args:
+            table (str): One of TABLES
+            date (str): Partition date, YYYY-MM-DD
+
+        Returns:
+            int: Number of files merged (0 if another process holds the partition)
+        """
+        directory = os.path.join(self.root, table, f"date={date}")
+        if not os.path.isdir(directory):
+            return 0
+
+        with _partition_lock(directory) as acquired:
+            if not acquired:
+                logger.debug(f"Partition {table}/date={date} is being compacted by another process")
+                return 0
+
+            files = sorted(name for name in os.listdir(directory) if name.endswith('.parquet'))
+            if len(files) < 2:
+                return len(files)
+
+            merged = pa.concat_tables(pq.read_table(os.path.join(directory, name), schema=TABLES[table])
+                                      for name in files)
+
+            # Named after the earliest run, so the partition stays in run order
+            target = f"{files[0].split('-')[0]}-compacted.parquet"
+            _write_file(merged, directory, target)
+            for name in files:
+                if name != target:
+                    os.remove(os.path.join(directory, name))
+            return len(files)
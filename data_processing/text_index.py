@@ -0,0 +1,93 @@
+"""
+Positional inverted index for phrase lookups over a corpus of documents.
+"""
+from utils.text import Document, tokenize
+
+class DocumentIndex:
+    """
+    Inverted index mapping each token to the positions where it occurs in
+    each document, so phrases can be found without rescanning the texts.
+
+    A document may have several text fields (e.g. title and description);
+    phrases never match across the boundary between two fields.
+    """
+
+    def __init__(self):
+        self.documents = []
+        self._postings = {}
+
+    def add(self, document, *texts):
+        """
+        Index a document.
+
+        Args:
+            document: Object returned by find() when the document matches
+            *texts (str or Document): Text fields of the document; empty ones
+                are skipped, and processed Documents are used as tokenized
+
+        Returns:
+            int: Identifier of the document within the index
+        """
+        doc_id = len(self.documents)
+        self.documents.append(document)
+
+        position = 0
+        for text in texts:
+            if not text:
+                continue
+            tokens = text.tokens if isinstance(text, Document) else tokenize(text)
+            for token in tokens:
+                self._postings.setdefault(token, {}).setdefault(doc_id, []).append(position)
+                position += 1
+            # Leave a gap so that phrases don't span two fields
+            position += 1
+
+        return doc_id
+
+    def search(self, phrase):
+        """
+        Find the documents containing a phrase as consecutive tokens.
+
+        Args:
+            phrase (str): Phrase to look up, tokenized like the documents
+
+        Returns:
+            list: Identifiers of matching documents, in the order they were added
+        """
+        tokens = tokenize(phrase)
+        postings = [self._postings.get(token) for token in tokens]
+        if not postings or not all(postings):
+            return []
+
+        # Only documents containing every token, starting from the rarest
+        candidates = set(min(postings, key=len))
+        for token_postings in postings:
+            candidates.intersection_update(token_postings)
+
+        matches = []
+        for doc_id in sorted(candidates):
+            # Start positions from which each following token is at the right offset
+            starts = set(postings[0][doc_id])
+            for offset, token_postings in enumerate(postings[1:], 1):
+                starts.intersection_update(position - offset for position in token_postings[doc_id])
+                if not starts:
+                    break
+            if starts:
+                matches.append(doc_id)
+
+        return matches
+
+    def find(self, phrase):
+        """
+        Find the documents containing a phrase.
+
+        Args:
+            phrase (str): Phrase to look up
+
+        Returns:
+            list: Matching documents, in the order they were added
+        """
+        return [self.documents[doc_id] for doc_id in self.search(phrase)]
+
+    def __len__(self):
+        return len(self.documents)
@@ -0,0 +1,313 @@
+"""
+Topic extraction from short texts (titles, descriptions) using n-gram counts.
+"""
+import atexit
+import multiprocessing
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from data_processing.sketches import SpaceSaving
+from utils.lexicon import Lexicon
+from utils.text import Document, as_document
+
+# Common words to ignore
+STOP_WORDS = frozenset([
+    'the', 'and', 'is', 'of', 'to', 'a', 'in', 'for', 'on', 'with', 'as', 'by',
+    'an', 'are', 'at', 'be', 'this', 'that', 'it', 'from', 'or', 'have', 'has',
+    'new', 'more', 'how', 'what', 'why', 'when', 'who', 'where', 'which', 'not',
+    'but', 'can', 'about', 'its', 'their', 'your', 'our', 'we', 'you', 'they',
+    'now', 'get', 'all', 'one', 'two', 'three', 'over', 'may', 'just', 'first',
+    'after', 'into', 'time', 'year', 'day', 'was', 'will', 'should', 'could',
+    'would', 'do', 'if', 'my', 'than', 'then', 'no', 'only', 'also', 'use', 'using'
+])
+
+# Technology terms to specifically look for. Each occurrence in this list adds
+# weight, so a term listed twice (e.g. 'serverless') counts twice.
+TECH_TERMS = (
+    'ai', 'artificial intelligence', 'machine learning', 'deep learning', 'neural network',
+    'blockchain', 'cryptocurrency', 'bitcoin', 'ethereum', 'web3', 'nft',
+    'cloud', 'aws', 'azure', 'google cloud', 'serverless', 'kubernetes', 'docker',
+    'python', 'javascript', 'typescript', 'rust', 'go', 'java', 'c++', 'kotlin', 'swift',
+    'react', 'vue', 'angular', 'svelte', 'next.js', 'django', 'flask', 'spring',
+    'devops', 'cicd', 'security', 'cybersecurity', 'devsecops', 'encryption',
+    'api', 'rest', 'graphql', 'microservices', 'serverless', 'edge computing',
+    'quantum computing', 'augmented reality', 'virtual reality', 'ar', 'vr', 'metaverse',
+    'data science', 'big data', 'analytics', 'visualization', 'business intelligence',
+    'iot', 'internet of things', 'embedded', 'robotics', 'automation',
+    '5g', '6g', 'networking', 'wifi', 'bluetooth', 'protocol', 'standard'
+)
+
+# Weight added to a tech term for each text containing it
+TECH_TERM_WEIGHT = 3
+
+# Total weight of each term, in list order
+TECH_TERM_WEIGHTS = {term: TECH_TERMS.count(term) * TECH_TERM_WEIGHT for term in TECH_TERMS}
+
+# How n-grams can be counted (see extract_topics)
+COUNTING_MODES = ('exact', 'approximate', 'auto')
+
+# Matcher for tech terms and their aliases as whole words
+TECH_LEXICON = Lexicon(TECH_TERMS)
+
+def find_tech_terms(text):
+    """
+    Find the tech terms mentioned in a text, as whole words or by alias.
+
+    Args:
+        text (str or Document): Text to search
+
+    Returns:
+        set: Tech terms found in the text
+    """
+    return set(TECH_LEXICON.find(text))
+
+def document_ngrams(text):
+    """
+    Return the words, bigrams and trigrams of a text.
+
+    Words are lowercased, stripped of surrounding punctuation, and dropped if
+    they are stop words or shorter than three characters.
+
+    Args:
+        text (str or Document): Text to split
+
+    Returns:
+        tuple: Lists of words, bigrams and trigrams, in order
+    """
+    words = [word for word in as_document(text).tokens if word not in STOP_WORDS and len(word) > 2]
+    bigrams = [f"{a} {b}" for a, b in zip(words, words[1:])]
+    trigrams = [f"{a} {b} {c}" for a, b, c in zip(words, words[1:], words[2:])]
+    return words, bigrams, trigrams
+
+def count_ngrams(texts, capacity=None):
+    """
+    Count words, bigrams and trigrams over a collection of texts.
+
+    N-grams are those of ``document_ngrams``. Tech terms found in a text add
+    TECH_TERM_WEIGHT to their word count.
+
+    Args:
+        texts (iterable): Texts to analyze, as strings or processed Documents
+        capacity (int, optional): Count approximately, keeping at most this
+            many words, bigrams and trigrams each in SpaceSaving summaries
+            (see data_processing.sketches for the error bounds). Counts
+            exactly by default.
+
+    Returns:
+        tuple: Counters (or SpaceSaving summaries) of words, bigrams and trigrams
+    """
+    if capacity:
+        word_counts, bigram_counts, trigram_counts = (SpaceSaving(capacity) for _ in range(3))
+    else:
+        word_counts, bigram_counts, trigram_counts = Counter(), Counter(), Counter()
+
+    for text in texts:
+        document = as_document(text)
+        words, bigrams, trigrams = document_ngrams(document)
+
+        word_counts.update(words)
+        bigram_counts.update(bigrams)
+        trigram_counts.update(trigrams)
+
+        # Give higher weight to known tech terms
+        found = find_tech_terms(document)
+        if found:
+            word_counts.update({term: weight for term, weight in TECH_TERM_WEIGHTS.items() if term in found})
+
+    return word_counts, bigram_counts, trigram_counts
+
+def rank_topics(word_counts, bigram_counts, trigram_counts, top_n=30):
+    """
+    Rank words, bigrams and trigrams into a list of topics.
+
+    A word is skipped when some bigram containing it occurs more than half as
+    often as the word itself, and a bigram is skipped when some trigram
+    containing both of its words does. Bigrams and trigrams are weighted 1.5x
+    and 2x.
+
+    Args:
+        word_counts (Counter): Word counts
+        bigram_counts (Counter): Bigram counts
+        trigram_counts (Counter): Trigram counts
+        top_n (int): Number of topics to return
+
+    Returns:
+        list: Top phrases, most significant first
+    """
+    top_words = word_counts.most_common(100)
+    top_bigrams = bigram_counts.most_common(50)
+
+    # Highest count of any bigram containing each candidate word
+    candidate_words = {word for word, _ in top_words}
+    max_bigram_by_word = {}
+    for bigram, count in bigram_counts.items():
+        for word in set(bigram.split()) & candidate_words:
+            if count > max_bigram_by_word.get(word, 0):
+                max_bigram_by_word[word] = count
+
+    # Highest count of any trigram containing both words of each candidate bigram
+    candidate_keys = {frozenset(bigram.split()) for bigram, _ in top_bigrams}
+    candidate_tokens = set().union(*candidate_keys)
+    max_trigram_by_words = {}
+    for trigram, count in trigram_counts.items():
+        words = set(trigram.split()) & candidate_tokens
+        if not words:
+            continue
+        keys = [frozenset([word]) for word in words]
+        keys += [frozenset([a, b]) for a in words for b in words if a < b]
+        for key in keys:
+            if key in candidate_keys and count > max_trigram_by_words.get(key, 0):
+                max_trigram_by_words[key] = count
+
+    all_phrases = []
+
+    # Add most frequent words (excluding those that are more valuable as part of bigrams)
+    for word, count in top_words:
+        if not max_bigram_by_word.get(word, 0) > count / 2:
+            all_phrases.append((word, count))
+
+    # Add most frequent bigrams (excluding those that are more valuable as part of trigrams)
+    for bigram, count in top_bigrams:
+        if not max_trigram_by_words.get(frozenset(bigram.split()), 0) > count / 2:
+            all_phrases.append((bigram, count * 1.5))
+
+    # Add most frequent trigrams
+    for trigram, count in trigram_counts.most_common(30):
+        all_phrases.append((trigram, count * 2))
+
+    # Sort by weight and return top phrases
+    all_phrases.sort(key=lambda x: x[1], reverse=True)
+    return [phrase for phrase, _ in all_phrases[:top_n]]
+
+def merge_counts(partials):
+    """
+    Merge partial (words, bigrams, trigrams) counts with a pairwise tree reduction.
+
+    Each partial is merged into the one before it, so counts and the
+    first-seen order of every n-gram (which breaks ranking ties) are the
+    same as counting all texts in one pass.
+
+    Args:
+        partials (list): Count tuples of consecutive shards, in order
+
+    Returns:
+        tuple: Merged Counters of words, bigrams and trigrams
+    """
+    if not partials:
+        return Counter(), Counter(), Counter()
+
+    while len(partials) > 1:
+        merged = []
+        for i in range(0, len(partials) - 1, 2):
+            left, right = partials[i], partials[i + 1]
+            for left_counts, right_counts in zip(left, right):
+                left_counts.update(right_counts)
+            merged.append(left)
+        if len(partials) % 2:
+            merged.append(partials[-1])
+        partials = merged
+
+    return partials[0]
+
+# Worker pool shared by every parallel count, by number of processes
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_process_pool(processes):
+    """
+    Return the long-lived worker pool with a number of processes, starting it
+    on first use.
+
+    Workers are spawned rather than forked: counts are requested from Flask
+    and stage executor threads, and forking a multithreaded process can copy
+    locks held by other threads into the children.
+
+    Args:
+        processes (int): Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor: The pool
+    """
+    with _pools_lock:
+        pool = _pools.get(processes)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+            _pools[processes] = pool
+        return pool
+
+def shutdown_process_pools():
+    """Stop the workers of every pool started by ``get_process_pool``."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+atexit.register(shutdown_process_pools)
+
+def count_ngrams_parallel(texts, processes, shards_per_process=4):
+    """
+    Count n-grams by sharding the texts across a process pool (map) and
+    merging the partial counts (reduce).
+
+    Args:
+        texts (list): Texts to analyze, as strings or processed Documents
+        processes (int): Number of worker processes
+        shards_per_process (int): Shards per worker, for load balancing
+
+    Returns:
+        tuple: Counters of words, bigrams and trigrams, equal to count_ngrams(texts)
+    """
+    # Workers re-process raw strings, which are cheaper to send than Documents
+    raw_texts = [text.raw if isinstance(text, Document) else text for text in texts]
+
+    shard_count = max(1, min(len(raw_texts), processes * shards_per_process))
+    shard_size = -(-len(raw_texts) // shard_count)
+    shards = [raw_texts[i:i + shard_size] for i in range(0, len(raw_texts), shard_size)]
+
+    pool = get_process_pool(processes)
+    try:
+        partials = list(pool.map(count_ngrams, shards))
+    except BrokenProcessPool:
+        # A worker died; start a new pool for the next count
+        with _pools_lock:
+            if _pools.get(processes) is pool:
+                del _pools[processes]
+        raise
+
+    return merge_counts(partials)
+
+def extract_topics(texts, top_n=30, processes=0, min_parallel_texts=5000,
+                   counting='exact', capacity=20000, approximate_above=50000):
+    """
+    Extract the most significant topics from a collection of texts.
+
+    Args:
+        texts (iterable): Texts to analyze, as strings or processed Documents
+        top_n (int): Number of topics to return
+        processes (int): Worker processes for exact counting; 0 or 1 counts
+            in this process
+        min_parallel_texts (int): Smallest corpus counted in parallel, as
+            smaller ones don't repay the cost of starting workers
+        counting (str): 'exact' keeps every n-gram; 'approximate' keeps at
+            most ``capacity`` of each kind in fixed memory; 'auto' counts
+            exactly up to ``approximate_above`` texts
+        capacity (int): Summary size for approximate counting
+        approximate_above (int): Corpus size above which 'auto' approximates
+
+    Returns:
+        list: Top phrases, most significant first
+    """
+    if counting not in COUNTING_MODES:
+        raise ValueError(f"Unknown counting mode '{counting}'; expected one of {', '.join(COUNTING_MODES)}")
+
+    texts = list(texts)
+    if counting == 'approximate' or (counting == 'auto' and len(texts) > approximate_above):
+        counts = count_ngrams(texts, capacity=capacity)
+    elif processes and processes > 1 and len(texts) >= min_parallel_texts:
+        counts = count_ngrams_parallel(texts, processes)
+    else:
+        counts = count_ngrams(texts)
+    return rank_topics(*counts, top_n=top_n)
@@ -0,0 +1,339 @@
+"""
+Incremental topic counts over rolling time windows, scored by burstiness.
+"""
+import logging
+import math
+import threading
+import time
+from collections import Counter
+
+from data_processing.topics import document_ngrams
+from utils.state import BucketStore
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+class _Bucket:
+    """
+    Documents counted in one time bucket and the documents containing each
+    phrase; daily buckets also hold the IDs of their documents.
+    """
+
+    __slots__ = ('documents', 'counts', 'ids', 'trimmed')
+
+    def __init__(self):
+        self.documents = 0
+        self.counts = Counter()
+        self.ids = set()
+        self.trimmed = False
+
+class TopicStream:
+    """
+    Rolling phrase counts over a stream of documents.
+
+    Each document is counted once, when it is first ingested, into an hourly
+    and a daily bucket. Hourly buckets make up the recent window and daily
+    buckets the history; buckets leaving either are subtracted from running
+    totals. Refreshing therefore costs time proportional to the new
+    documents, not to everything seen so far.
+
+    A phrase (word, bigram or trigram, see ``document_ngrams``) counts the
+    documents containing it. Its burst score compares its recent count with
+    what its share of the baseline (the history before the recent window)
+    predicts for the recent volume of documents:
+
+        expected = recent_documents * baseline_count / baseline_documents
+        score = (count - expected) / sqrt(expected)
+
+    ``expected`` is at least ``smoothing``, so phrases new to the baseline
+    (and all phrases, until there is a baseline) are ranked by their count.
+
+    Once a day is over, its bucket keeps only its ``max_daily_phrases`` most
+    frequent phrases, which bounds the vocabulary of the history. Rarer
+    phrases then count as absent from that day's baseline.
+    """
+
+    def __init__(self, recent_hours=24, history_days=30, smoothing=1.0, max_daily_phrases=20000):
+        """
+        Args:
+            recent_hours (int): Length of the recent window in hours
+            history_days (int): Days of history kept, including the recent window
+            smoothing (float): Smallest expected count of a phrase
+            max_daily_phrases (int): Phrases kept in the bucket of a past day
+        """
+        if recent_hours < 1 or history_days * 24 <= recent_hours:
+            raise ValueError("The history must be longer than the recent window")
+
+        self.recent_hours = recent_hours
+        self.history_days = history_days
+        self.smoothing = smoothing
+        self.max_daily_phrases = max_daily_phrases
+
+        self._hourly = {}
+        self._daily = {}
+        self._recent = _Bucket()
+        self._history = _Bucket()
+
+        # Day each counted document was ingested, by ID
+        self._seen = {}
+
+        # Names of buckets changed or expired since the last save
+        self._changed = set()
+        self._expired = set()
+
+    @property
+    def settings(self):
+        """Parameters the stream was created with."""
+        return {'recent_hours': self.recent_hours, 'history_days': self.history_days,
+                'smoothing': self.smoothing, 'max_daily_phrases': self.max_daily_phrases}
+
+    @classmethod
+    def from_buckets(cls, buckets, **settings):
+        """
+        Rebuild a stream from buckets saved by ``save``.
+
+        Args:
+            buckets (dict): Buckets by name
+            **settings: TopicStream parameters
+
+        Returns:
+            TopicStream: The stream
+        """
+        stream = cls(**settings)
+        for name, bucket in buckets.items():
+            kind, _, number = name.partition('-')
+            if kind == 'hour':
+                stream._hourly[int(number)] = bucket
+                stream._add(stream._recent, bucket)
+            elif kind == 'day':
+                stream._daily[int(number)] = bucket
+                stream._add(stream._history, bucket)
+                stream._seen.update(dict.fromkeys(bucket.ids, int(number)))
+        return stream
+
+    def save(self, store):
+        """
+        Write the buckets changed since the last save, and remove expired ones.
+
+        Args:
+            store (BucketStore): Store of the stream
+        """
+        for name in self._expired:
+            store.delete(name)
+        for name in self._changed:
+            kind, _, number = name.partition('-')
+            buckets = self._hourly if kind == 'hour' else self._daily
+            if int(number) in buckets:
+                store.save(name, buckets[int(number)])
+        self._changed.clear()
+        self._expired.clear()
+
+    def ingest(self, documents, now=None):
+        """
+        Count new documents and expire buckets that left their window.
+
+        Args:
+            documents (iterable): (document ID, text or Document) pairs;
+                documents already counted are skipped
+            now (float, optional): Ingestion time as a Unix timestamp
+                (defaults to the current time)
+
+        Returns:
+            int: Number of documents counted
+        """
+        now = time.time() if now is None else now
+        self.expire(now)
+
+        hour, day = int(now // HOUR), int(now // DAY)
+        hourly = self._hourly.setdefault(hour, _Bucket())
+        daily = self._daily.setdefault(day, _Bucket())
+
+        added = 0
+        for doc_id, text in documents:
+            if doc_id in self._seen:
+                continue
+            self._seen[doc_id] = day
+            daily.ids.add(doc_id)
+
+            words, bigrams, trigrams = document_ngrams(text)
+            phrases = set(words)
+            phrases.update(bigrams)
+            phrases.update(trigrams)
+
+            for bucket in (hourly, daily, self._recent, self._history):
+                bucket.documents += 1
+                bucket.counts.update(phrases)
+            added += 1
+
+        if added:
+            self._changed.update((f"hour-{hour}", f"day-{day}"))
+        return added
+
+    def expire(self, now=None):
+        """
+        Drop hourly buckets older than the recent window and daily buckets
+        older than the history, and trim the buckets of past days.
+
+        Args:
+            now (float, optional): Current time as a Unix timestamp
+        """
+        now = time.time() if now is None else now
+        today = int(now // DAY)
+        first_hour = int(now // HOUR) - self.recent_hours + 1
+        first_day = today - self.history_days + 1
+
+        for hour in [hour for hour in self._hourly if hour < first_hour]:
+            self._subtract(self._recent, self._hourly.pop(hour))
+            self._expired.add(f"hour-{hour}")
+
+        for day in [day for day in self._daily if day < first_day]:
+            bucket = self._daily.pop(day)
+            self._subtract(self._history, bucket)
+            for doc_id in bucket.ids:
+                del self._seen[doc_id]
+            self._expired.add(f"day-{day}")
+
+        for day, bucket in self._daily.items():
+            if day < today and not bucket.trimmed:
+                self._trim(bucket)
+                self._changed.add(f"day-{day}")
+
+    def _trim(self, bucket):
+        """Keep the most frequent phrases of a past day's bucket."""
+        if len(bucket.counts) > self.max_daily_phrases:
+            kept = Counter(dict(bucket.counts.most_common(self.max_daily_phrases)))
+            self._subtract_counts(self._history.counts, bucket.counts - kept)
+            bucket.counts = kept
+        bucket.trimmed = True
+
+    @staticmethod
+    def _add(total, bucket):
+        """Add a bucket's counts to a running total."""
+        total.documents += bucket.documents
+        total.counts.update(bucket.counts)
+
+    @classmethod
+    def _subtract(cls, total, bucket):
+        """Remove a bucket's counts from a running total."""
+        total.documents -= bucket.documents
+        cls._subtract_counts(total.counts, bucket.counts)
+
+    @staticmethod
+    def _subtract_counts(counts, removed):
+        """Subtract phrase counts, dropping phrases that reach zero."""
+        for phrase, count in removed.items():
+            remaining = counts[phrase] - count
+            if remaining > 0:
+                counts[phrase] = remaining
+            else:
+                del counts[phrase]
+
+    def score(self, phrase):
+        """
+        Return a phrase's recent count, expected count and burst score.
+
+        Args:
+            phrase (str): Word, bigram or trigram
+
+        Returns:
+            tuple: (count, expected, score)
+        """
+        count = self._recent.counts[phrase]
+        baseline_documents = self._history.documents - self._recent.documents
+        expected = 0.0
+        if baseline_documents > 0:
+            # Trimmed past days may have dropped part of a recent count
+            baseline_count = max(self._history.counts[phrase] - count, 0)
+            expected = self._recent.documents * baseline_count / baseline_documents
+        expected = max(expected, self.smoothing)
+        return count, expected, (count - expected) / math.sqrt(expected)
+
+    def trending(self, top_n=30, min_count=2):
+        """
+        Rank the phrases rising in the recent window.
+
+        Like ``rank_topics``, a phrase is skipped when a longer candidate
+        containing it is in more than half as many recent documents.
+
+        Args:
+            top_n (int): Number of topics to return
+            min_count (int): Fewest recent documents a topic must appear in
+
+        Returns:
+            list: Dictionaries with the 'topic', its recent 'count', its
+                  'expected' count and its burst 'score', highest score first
+        """
+        candidates = {phrase: count for phrase, count in self._recent.counts.items() if count >= min_count}
+
+        # Highest count of a longer candidate containing each word or bigram
+        max_container = {}
+        for phrase, count in candidates.items():
+            words = phrase.split()
+            if len(words) < 2:
+                continue
+            parts = words if len(words) == 2 else words + [f"{words[0]} {words[1]}", f"{words[1]} {words[2]}"]
+            for part in parts:
+                if count > max_container.get(part, 0):
+                    max_container[part] = count
+
+        topics = []
+        for phrase, count in candidates.items():
+            if max_container.get(phrase, 0) > count / 2:
+                continue
+            count, expected, score = self.score(phrase)
+            if score > 0:
+                topics.append({'topic': phrase, 'count': count, 'expected': expected, 'score': score})
+
+        topics.sort(key=lambda topic: topic['score'], reverse=True)
+        return topics[:top_n]
+
+    @property
+    def recent_documents(self):
+        """Number of documents in the recent window."""
+        return self._recent.documents
+
+    def __len__(self):
+        """Number of documents in the history."""
+        return self._history.documents
+
+# Streams kept in memory between updates, by state directory
+_streams = {}
+
+# Serializes updates of persisted streams within a process
+_stream_lock = threading.Lock()
+
+def update_topic_stream(key, documents, now=None, root=None, **settings):
+    """
+    Ingest documents into the stream persisted under a state key.
+
+    The stream is loaded from the state store on first use and then kept in
+    memory; each update only writes the buckets it changed (the current hour
+    and day) and removes expired ones, so it costs time proportional to the
+    new documents rather than to the stored history. A stream stored with
+    other settings is replaced by a new one. Across processes the last save
+    of a bucket wins.
+
+    Args:
+        key (str): State key of the stream
+        documents (iterable): (document ID, text or Document) pairs
+        now (float, optional): Ingestion time as a Unix timestamp
+        root (str, optional): State directory (see utils.state)
+        **settings: TopicStream parameters
+
+    Returns:
+        TopicStream: The updated stream
+    """
+    settings = TopicStream(**settings).settings
+    with _stream_lock:
+        store = BucketStore(key, root)
+        stream = _streams.get(store.directory)
+        if stream is None or stream.settings != settings:
+            stream = TopicStream.from_buckets(store.load(settings), **settings)
+            _streams[store.directory] = stream
+
+        added = stream.ingest(documents, now=now)
+        logger.debug(f"Ingested {added} new documents into {key}")
+        stream.save(store)
+    return stream
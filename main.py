@@ -4,8 +4,9 @@ import os
 import argparse
 import sys
 
-from app import app
+from app import app, data_processor
 from cli import cli_main
+from utils import http
 from utils.logger import setup_logger
 
 def parse_args():
@@ -14,6 +15,12 @@ def parse_args():
     parser.add_argument('--web', action='store_true', help='Run as a web application')
     parser.add_argument('--cli', action='store_true', help='Run as a CLI application')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    parser.add_argument('--workers', type=int, help='Number of report stages to compute in parallel')
+    upstream = parser.add_mutually_exclusive_group()
+    upstream.add_argument('--record', action='store_true', help='Archive every upstream response')
+    upstream.add_argument('--replay', nargs='?', const='latest', metavar='DATE',
+                          help='Serve upstream responses from the archive of a day (default: latest) '
+                               'instead of the network')
     return parser.parse_args()
 
 if __name__ == '__main__':
@@ -23,12 +30,20 @@ if __name__ == '__main__':
     log_level = logging.DEBUG if args.debug else logging.INFO
     setup_logger(log_level)
     
+    # Choose where upstream responses come from
+    if args.replay:
+        http.configure('replay', snapshot=args.replay)
+    elif args.record:
+        http.configure('record')
+    
     # Default to web if no mode specified
     if not (args.web or args.cli):
         args.web = True
     
     # Run in appropriate mode
     if args.web:
+        if args.workers:
+            data_processor.max_workers = args.workers
         app.run(host='0.0.0.0', port=5000, debug=args.debug)
     elif args.cli:
-        cli_main()
+        cli_main(max_workers=args.workers)
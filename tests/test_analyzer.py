@@ -0,0 +1,102 @@
+"""
+Unit tests for the chart render cache.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from data_processing.analyzer import DataAnalyzer
+from utils import cache
+from utils.config import config
+
+def popularity(python=90.0):
+    """Popularity scores of two technologies."""
+    return {
+        'python': {'overall_score': python,
+                   'platform_scores': {'github': python / 3, 'stackoverflow': python / 3, 'pytrends': python / 3}},
+        'rust': {'overall_score': 40.0,
+                 'platform_scores': {'github': 20.0, 'stackoverflow': 10.0, 'pytrends': 10.0}}
+    }
+
+class TestChartCache(unittest.TestCase):
+    """Test cases for reusing and pre-rendering charts."""
+
+    def setUp(self):
+        """Keep rendered charts in a scratch cache."""
+        self.cache_dir = cache.CACHE_DIR
+        cache.set_cache_dir(tempfile.mkdtemp())
+        self.analyzer = DataAnalyzer()
+        self.savefig = patch.object(plt, 'savefig', wraps=plt.savefig)
+        self.renders = self.savefig.start()
+
+    def tearDown(self):
+        """Restore the cache and settings."""
+        self.savefig.stop()
+        shutil.rmtree(cache.CACHE_DIR)
+        cache.set_cache_dir(self.cache_dir)
+        config.set('charts.cache', True)
+
+    def test_same_content_is_drawn_once(self):
+        """Test that equal data and parameters reuse the chart, and any change redraws it."""
+        chart = self.analyzer.create_technology_popularity_chart(popularity())
+        self.assertEqual(self.analyzer.create_technology_popularity_chart(popularity()), chart)
+        self.assertEqual(self.renders.call_count, 1)
+
+        # Another analyzer (e.g. in another worker) finds the chart too
+        self.assertEqual(DataAnalyzer().create_technology_popularity_chart(popularity()), chart)
+        self.assertEqual(self.renders.call_count, 1)
+
+        self.analyzer.create_technology_popularity_chart(popularity(), top_n=1)
+        self.analyzer.create_technology_popularity_chart(popularity(python=95.0))
+        self.assertEqual(self.renders.call_count, 3)
+
+    def test_style_is_part_of_the_key(self):
+        """Test that charts drawn in another style are not reused."""
+        self.analyzer.create_technology_popularity_chart(popularity())
+        DataAnalyzer(style='default').create_technology_popularity_chart(popularity())
+        self.assertEqual(self.renders.call_count, 2)
+
+    def test_prerender(self):
+        """Test that charts pre-rendered from a report are served without drawing."""
+        report = {
+            'popularity_ranking': popularity(),
+            'hot_discussions': [{'title': 'Why Rust?', 'source': 'stackoverflow', 'engagement_score': 12.0}],
+            'technology_clusters': []
+        }
+        self.analyzer.prerender(report)
+        drawn = self.renders.call_count
+        self.assertEqual(drawn, 2)
+
+        self.analyzer.create_technology_popularity_chart(popularity())
+        self.analyzer.create_hot_discussions_chart(report['hot_discussions'])
+        self.assertEqual(self.renders.call_count, drawn)
+
+    def test_disabled(self):
+        """Test that every chart is drawn when the cache is disabled."""
+        config.set('charts.cache', False)
+        self.analyzer.prerender({'popularity_ranking': popularity()})
+        self.analyzer.create_technology_popularity_chart(popularity())
+        self.analyzer.create_technology_popularity_chart(popularity())
+        self.assertEqual(self.renders.call_count, 2)
+
+    def test_trending_topics_follow_burst_score(self):
+        """Test that the trending topics chart ranks topics like the dashboard does."""
+        sources = [{'source_type': 'news'}]
+        topics = {
+            'steady topic': {'sources': sources * 5, 'source_count': 5, 'burst_score': 1.2},
+            'rising topic': {'sources': sources * 2, 'source_count': 2, 'burst_score': 4.0},
+            'unscored topic': {'sources': sources * 9, 'source_count': 9}
+        }
+        with patch.object(matplotlib.axes.Axes, 'set_yticklabels', autospec=True) as set_labels:
+            self.analyzer.create_trending_topics_chart(topics)
+        self.assertEqual(list(set_labels.call_args.args[1]), ['rising topic', 'steady topic', 'unscored topic'])
+
+if __name__ == '__main__':
+    unittest.main()
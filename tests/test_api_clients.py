@@ -5,18 +5,33 @@ import unittest
 from unittest.mock import patch, MagicMock
 import os,sys
 import json
+import shutil
+import tempfile
+import time
 import requests
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from api_clients.github_client import GitHubClient
 from api_clients.stackoverflow_client import StackOverflowClient
 from api_clients.hackernews_client import HackerNewsClient
 from api_clients.news_client import NewsClient
-from api_clients.reddit_client import RedditClient
+from api_clients.reddit_client import RedditClient, RedditTokenManager
 from api_clients.pytrends_client import PyTrendsClient
+from utils import cache
 import pandas as pd
+
+def use_scratch_cache(test):
+    """Cache client responses in a scratch directory for the rest of a test."""
+    cache_patch = patch.object(cache, 'CACHE_DIR', tempfile.mkdtemp())
+    test.addCleanup(shutil.rmtree, cache_patch.start())
+    test.addCleanup(cache_patch.stop)
+
 class TestGitHubClient(unittest.TestCase):
     """Tests for GitHub API client."""
     
+    def setUp(self):
+        """Keep cached responses out of the real cache."""
+        use_scratch_cache(self)
+    
     @patch('requests.get')
     def test_get_trending_repositories(self, mock_get):
         """Test fetching trending repositories."""
@@ -84,6 +99,7 @@ class TestGitHubClient(unittest.TestCase):
                 {"language": "JavaScript"}
             ]
         }
+        mock_response.links = {}
         mock_response.status_code = 200
         mock_get.return_value = mock_response
         
@@ -99,11 +115,77 @@ class TestGitHubClient(unittest.TestCase):
         self.assertEqual(stats.get("Python"), 3)
         self.assertEqual(stats.get("JavaScript"), 2)
         self.assertEqual(stats.get("Go"), 1)
+    
+    @patch('requests.get')
+    def test_get_language_stats_sample_fits_rate_limit(self, mock_get):
+        """Test that the default sample stays within the search rate limit."""
+        page = MagicMock(status_code=200)
+        page.json.return_value = {"items": [{"language": "Python"}] * 100}
+        page.links = {"next": {"url": "https://api.github.com/next"}}
+        mock_get.return_value = page
+        
+        # Unauthenticated: 10 searches per minute, most left for other requests
+        with patch.dict(os.environ, {"GITHUB_API_KEY": ""}):
+            stats = GitHubClient().get_language_stats()
+        self.assertEqual(stats, {"Python": 200})
+        self.assertEqual(mock_get.call_count, 2)
+        
+        # With a token the sample covers everything the search API serves
+        mock_get.reset_mock()
+        with patch.dict(os.environ, {"GITHUB_API_KEY": "token"}):
+            stats = GitHubClient().get_language_stats()
+        self.assertEqual(stats, {"Python": 1000})
+        self.assertEqual(mock_get.call_count, 10)
+    
+    @patch('requests.get')
+    def test_iter_repositories(self, mock_get):
+        """Test streaming repositories across pages via Link headers."""
+        def make_page(start, next_url):
+            response = MagicMock()
+            response.json.return_value = {
+                "items": [
+                    {
+                        "full_name": f"test/repo{i}",
+                        "html_url": f"https://github.com/test/repo{i}",
+                        "description": None,
+                        "language": "Python",
+                        "stargazers_count": 100 - i,
+                        "forks_count": 0,
+                        "created_at": "2023-01-01"
+                    }
+                    for i in range(start, start + 3)
+                ]
+            }
+            response.links = {"next": {"url": next_url}} if next_url else {}
+            return response
+        
+        pages = {
+            "https://api.github.com/search/repositories": make_page(0, "https://api.github.com/page2"),
+            "https://api.github.com/page2": make_page(3, "https://api.github.com/page3"),
+            "https://api.github.com/page3": make_page(6, None)
+        }
+        mock_get.side_effect = lambda url, **kwargs: pages[url]
+        
+        client = GitHubClient()
+        
+        # The full listing is followed to the last page
+        repos = list(client.iter_repositories("language:Python"))
+        self.assertEqual([repo['name'] for repo in repos], [f"test/repo{i}" for i in range(9)])
+        
+        # A sample size stops iteration without requesting the last page
+        mock_get.reset_mock()
+        repos = list(client.iter_repositories("language:Python", sample_size=4))
+        self.assertEqual(len(repos), 4)
+        self.assertEqual(mock_get.call_count, 2)
 
 
 class TestStackOverflowClient(unittest.TestCase):
     """Tests for Stack Overflow API client."""
     
+    def setUp(self):
+        """Keep cached responses out of the real cache."""
+        use_scratch_cache(self)
+    
     @patch('requests.get')
     def test_get_popular_questions(self, mock_get):
         """Test fetching popular questions."""
@@ -154,11 +236,110 @@ class TestStackOverflowClient(unittest.TestCase):
         args, kwargs = mock_get.call_args
         self.assertTrue('api.stackexchange.com' in args[0])
         self.assertEqual(kwargs['params']['tagged'], "python")
+        
+        # Questions are limited to the period, like the bulk pull
+        week_ago = time.time() - 7 * 24 * 3600
+        self.assertAlmostEqual(kwargs['params']['fromdate'], week_ago, delta=60)
+    
+    @patch('requests.get')
+    def test_get_questions_by_tag(self, mock_get):
+        """Test partitioning a bulk question pull by tag."""
+        filter_response = MagicMock()
+        filter_response.json.return_value = {"items": [{"filter": "!narrow"}]}
+        
+        questions_response = MagicMock()
+        questions_response.json.return_value = {
+            "items": [
+                {
+                    "title": f"Python question {i}",
+                    "link": f"https://stackoverflow.com/q/{i}",
+                    "score": 100 - i,
+                    "answer_count": 1,
+                    "view_count": 10,
+                    "tags": ["python", "pandas"] if i % 2 else ["python"],
+                    "creation_date": 1672531200,
+                    "is_answered": True
+                }
+                for i in range(4)
+            ],
+            "has_more": False
+        }
+        
+        def mock_get_side_effect(url, **kwargs):
+            if url.endswith('/filters/create'):
+                return filter_response
+            if 'tagged' in kwargs['params']:
+                return MagicMock(json=MagicMock(return_value={"items": []}))
+            return questions_response
+        
+        mock_get.side_effect = mock_get_side_effect
+        
+        client = StackOverflowClient()
+        result = client.get_questions_by_tag(["python", "pandas", "rust"], limit=2)
+        
+        # Python and pandas are answered from the bulk pull, sorted by votes
+        self.assertEqual([q['title'] for q in result["python"]], ["Python question 0", "Python question 1"])
+        self.assertEqual([q['title'] for q in result["pandas"]], ["Python question 1", "Python question 3"])
+        self.assertEqual(result["rust"], [])
+        
+        # One filter request, one bulk page, and a per-tag request only for the sparse tag
+        tagged = [kwargs['params']['tagged'] for _, kwargs in mock_get.call_args_list if 'tagged' in kwargs['params']]
+        self.assertEqual(tagged, ["rust"])
+        bulk_calls = [kwargs for args, kwargs in mock_get.call_args_list
+                      if args[0].endswith('/questions') and 'tagged' not in kwargs['params']]
+        self.assertEqual(len(bulk_calls), 1)
+        self.assertEqual(bulk_calls[0]['params']['filter'], "!narrow")
+    
+    @patch('requests.get')
+    def test_iter_questions(self, mock_get):
+        """Test following has_more through the pages of a question listing."""
+        def make_page(start, has_more):
+            response = MagicMock(status_code=200)
+            response.json.return_value = {
+                "items": [
+                    {
+                        "title": f"Question {i}",
+                        "link": f"https://stackoverflow.com/q/{i}",
+                        "score": 10,
+                        "answer_count": 1,
+                        "view_count": 100,
+                        "tags": ["python"],
+                        "creation_date": 1672531200,
+                        "is_answered": True
+                    }
+                    for i in range(start, start + 3)
+                ],
+                "has_more": has_more
+            }
+            return response
+        
+        pages = {1: make_page(0, True), 2: make_page(3, True), 3: make_page(6, False)}
+        mock_get.side_effect = lambda url, **kwargs: pages[kwargs['params']['page']]
+        
+        client = StackOverflowClient()
+        client._question_filter = "!narrow"
+        
+        # The full listing is followed to the last page, keeping the filters on every page
+        questions = list(client.iter_questions(tags=["python"], fromdate=1672531200))
+        self.assertEqual([q['title'] for q in questions], [f"Question {i}" for i in range(9)])
+        for _, kwargs in mock_get.call_args_list:
+            self.assertEqual(kwargs['params']['tagged'], "python")
+            self.assertEqual(kwargs['params']['fromdate'], 1672531200)
+        
+        # A sample size stops iteration without requesting the last page
+        mock_get.reset_mock()
+        questions = list(client.iter_questions(sample_size=4))
+        self.assertEqual(len(questions), 4)
+        self.assertEqual([kwargs['params']['page'] for _, kwargs in mock_get.call_args_list], [1, 2])
 
 
 class TestHackerNewsClient(unittest.TestCase):
     """Tests for HackerNews API client."""
     
+    def setUp(self):
+        """Keep cached responses out of the real cache."""
+        use_scratch_cache(self)
+    
     @patch('requests.get')
     def test_get_top_stories(self, mock_get):
         """Test fetching top stories."""
@@ -226,6 +407,10 @@ class TestHackerNewsClient(unittest.TestCase):
 class TestNewsClient(unittest.TestCase):
     """Tests for News API client."""
     
+    def setUp(self):
+        """Keep cached responses out of the real cache."""
+        use_scratch_cache(self)
+    
     @patch('requests.get')
     def test_get_tech_news(self, mock_get):
         """Test fetching technology news."""
@@ -282,6 +467,10 @@ class TestNewsClient(unittest.TestCase):
 class TestRedditClient(unittest.TestCase):
     """Tests for Reddit API client."""
     
+    def setUp(self):
+        """Keep cached responses out of the real cache."""
+        use_scratch_cache(self)
+    
     @patch('requests.get')
     def test_get_top_posts(self, mock_get):
         """Test fetching top posts."""
@@ -343,11 +532,92 @@ class TestRedditClient(unittest.TestCase):
         args, kwargs = mock_get.call_args
         self.assertTrue('reddit.com' in args[0])
         self.assertTrue('technology' in args[0])
+    
+    @patch('requests.get')
+    def test_iter_posts(self, mock_get):
+        """Test following after cursors through the pages of a subreddit listing."""
+        def make_page(start, after):
+            response = MagicMock(status_code=200)
+            response.json.return_value = {
+                "data": {
+                    "children": [
+                        {"data": {"title": f"Post {i}", "permalink": f"/r/python/comments/{i}"}}
+                        for i in range(start, start + 3)
+                    ],
+                    "after": after
+                }
+            }
+            return response
+        
+        pages = {None: make_page(0, "t3_2"), "t3_2": make_page(3, "t3_5"), "t3_5": make_page(6, None)}
+        mock_get.side_effect = lambda url, **kwargs: pages[kwargs['params'].get('after')]
+        
+        client = RedditClient()
+        client.token_manager = None
+        
+        # The full listing is followed to the last page
+        posts = list(client.iter_posts(subreddit="python"))
+        self.assertEqual([post['title'] for post in posts], [f"Post {i}" for i in range(9)])
+        self.assertEqual(posts[0]['subreddit'], "python")
+        
+        # A sample size stops iteration without requesting the last page
+        mock_get.reset_mock()
+        posts = list(client.iter_posts(subreddit="python", sample_size=4))
+        self.assertEqual(len(posts), 4)
+        self.assertEqual([kwargs['params'].get('after') for _, kwargs in mock_get.call_args_list], [None, "t3_2"])
+    
+    @patch('requests.post')
+    def test_token_manager_persists_and_refreshes(self, mock_post):
+        """Test that tokens are shared through the cache store and refreshed before expiry."""
+        store = {}
+        mock_post.side_effect = [
+            MagicMock(json=MagicMock(return_value={"access_token": "token1", "expires_in": 3600})),
+            MagicMock(json=MagicMock(return_value={"access_token": "token2", "expires_in": 3600}))
+        ]
+        
+        with patch('api_clients.reddit_client.get_cached_value', side_effect=lambda key: store.get(key)), \
+             patch('api_clients.reddit_client.set_cached_value', side_effect=store.__setitem__):
+            manager = RedditTokenManager("id", "secret", "agent")
+            self.assertEqual(manager.get_token(), "token1")
+            
+            # A second worker picks up the persisted token without authenticating
+            other_worker = RedditTokenManager("id", "secret", "agent")
+            self.assertEqual(other_worker.get_token(), "token1")
+            self.assertEqual(mock_post.call_count, 1)
+            
+            # Close to expiry, the token is refreshed proactively
+            almost_expired = time.time() + RedditTokenManager.REFRESH_MARGIN / 2
+            manager._token['expires_at'] = store[manager.cache_key]['expires_at'] = almost_expired
+            self.assertEqual(manager.get_token(), "token2")
+            self.assertEqual(store[manager.cache_key]['access_token'], "token2")
+    
+    @patch('requests.get')
+    def test_get_top_posts_reauthenticates_on_401(self, mock_get):
+        """Test that a rejected token is replaced and the request retried on the OAuth API."""
+        ok_response = MagicMock(status_code=200)
+        ok_response.json.return_value = {"data": {"children": [{"data": {"title": "Post"}}]}}
+        mock_get.side_effect = [MagicMock(status_code=401), ok_response]
+        
+        client = RedditClient()
+        client.token_manager = MagicMock()
+        client.token_manager.get_token.side_effect = ["stale", "fresh"]
+        
+        posts = client._fetch_post_page("technology", "week", None)[0]
+        
+        self.assertEqual([post['title'] for post in posts], ["Post"])
+        client.token_manager.invalidate.assert_called_once_with("stale")
+        for args, kwargs in mock_get.call_args_list:
+            self.assertTrue(args[0].startswith("https://oauth.reddit.com"))
+        self.assertEqual(mock_get.call_args[1]['headers']['Authorization'], "Bearer fresh")
 
 
 class TestPyTrendsClient(unittest.TestCase):
     """Tests for PyTrends API client."""
     
+    def setUp(self):
+        """Keep cached responses out of the real cache."""
+        use_scratch_cache(self)
+    
     @patch('pytrends.request.TrendReq')
     def test_get_tech_trends(self, mock_trend_req):
         """Test fetching technology trends."""
@@ -402,6 +672,46 @@ class TestPyTrendsClient(unittest.TestCase):
         
         # Verify build_payload was called correctly (for each keyword)
         self.assertEqual(mock_pytrends.build_payload.call_count, len(mock_pytrends.related_queries.return_value))
+    
+    @patch('time.sleep')
+    def test_get_interest_by_term(self, mock_sleep):
+        """Test anchor-normalized batching and per-term caching of interest."""
+        store = {}
+        mock_pytrends = MagicMock()
+        
+        # Each term has a fixed interest relative to the anchor, scaled by request
+        relative = {'Python': 1.0, 'Rust': 0.5, 'Go': 0.25, 'Zig': 0.1, 'Java': 0.8, 'Ruby': 0.3, 'Elixir': 0.2}
+        def interest_over_time():
+            payload = mock_pytrends.build_payload.call_args[0][0]
+            scale = 100 / max(relative[term] for term in payload)
+            index = pd.date_range('2024-01-01', periods=3, freq='W')
+            return pd.DataFrame({term: [relative[term] * scale] * 3 for term in payload}, index=index)
+        mock_pytrends.interest_over_time.side_effect = interest_over_time
+        
+        client = PyTrendsClient()
+        client.pytrends = mock_pytrends
+        
+        with patch('api_clients.pytrends_client.get_cached_value', side_effect=lambda key, max_age: store.get(key)), \
+             patch('api_clients.pytrends_client.set_cached_value', side_effect=store.__setitem__):
+            terms = ['Python', 'Rust', 'Go', 'Java', 'Ruby', 'Elixir']
+            interest = client.get_interest_by_term(terms)
+            
+            # Two batches, each led by the anchor term
+            payloads = [args[0] for args, _ in mock_pytrends.build_payload.call_args_list]
+            self.assertEqual(payloads, [['Python', 'Rust', 'Go', 'Java', 'Ruby'], ['Python', 'Elixir']])
+            
+            # Scores are comparable across batches
+            self.assertAlmostEqual(interest['Python']['popularity'], 100)
+            self.assertAlmostEqual(interest['Rust']['popularity'], 50)
+            self.assertAlmostEqual(interest['Elixir']['popularity'], 20)
+            
+            # Adding a term only fetches that term
+            mock_pytrends.build_payload.reset_mock()
+            interest = client.get_interest_by_term(terms + ['Zig'])
+            payloads = [args[0] for args, _ in mock_pytrends.build_payload.call_args_list]
+            self.assertEqual(payloads, [['Python', 'Zig']])
+            self.assertAlmostEqual(interest['Zig']['popularity'], 10)
+            self.assertEqual(len(interest), 7)
 
         
 if __name__ == '__main__':
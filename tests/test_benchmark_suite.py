@@ -0,0 +1,61 @@
+"""
+Unit tests for the benchmark suite.
+"""
+import os
+import unittest
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.suite import CASES, ISOLATED_SETTINGS, compare, measure, scaling_exponent
+from data_processing.analyzer import DataAnalyzer
+from utils.config import config
+
+def result(case, size, median, peak=1000):
+    return {'case': case, 'size': size, 'median': median, 'peak_memory': peak}
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Test cases for measuring, fitting and comparing benchmark runs."""
+
+    def setUp(self):
+        """Keep the runs away from persisted state."""
+        self.settings = {key: config.get(key) for key in ISOLATED_SETTINGS}
+        for key, value in ISOLATED_SETTINGS.items():
+            config.set(key, value)
+
+    def tearDown(self):
+        """Restore the settings."""
+        for key, value in self.settings.items():
+            config.set(key, value)
+
+    def test_every_chart_has_a_case(self):
+        """Test that a new DataAnalyzer chart is benchmarked without changes."""
+        charts = {name[len('create_'):] for name in dir(DataAnalyzer) if name.startswith('create_')}
+        self.assertEqual({case.name[len('chart:'):] for case in CASES if case.name.startswith('chart:')}, charts)
+
+    def test_cases_run_at_smallest_size(self):
+        """Test that the processor cases run on their synthetic inputs."""
+        for case in CASES:
+            if case.name.startswith('chart:'):
+                continue
+            with self.subTest(case=case.name):
+                measured = measure(case, case.sizes[0], repeat=1)
+                self.assertEqual(measured['runs'], 1)
+                self.assertGreater(measured['peak_memory'], 0)
+
+    def test_scaling_exponent(self):
+        """Test fitting linear and quadratic growth."""
+        linear = [result('a', size, size * 1e-6) for size in (100, 10000, 1000000)]
+        quadratic = [result('a', size, size ** 2 * 1e-9) for size in (30, 300, 5000)]
+        self.assertAlmostEqual(scaling_exponent(linear), 1.0)
+        self.assertAlmostEqual(scaling_exponent(quadratic), 2.0)
+        self.assertIsNone(scaling_exponent(linear[:1]))
+
+    def test_compare(self):
+        """Test that slower or larger runs are flagged as regressions."""
+        baseline = {'results': [result('a', 100, 1.0), result('b', 100, 1.0), result('c', 100, 1.0)]}
+        rows = compare([result('a', 100, 1.1), result('b', 100, 2.0), result('c', 100, 1.0, peak=3000),
+                        result('d', 100, 1.0)], baseline, threshold=1.25)
+        self.assertEqual([(row['case'], row['regressed']) for row in rows], [('a', False), ('b', True), ('c', True)])
+        self.assertAlmostEqual(rows[1]['time_ratio'], 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Unit tests for the technology clustering module.
+"""
+import unittest
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.clustering import TechnologyClusterer, name_cluster
+
+class TestTechnologyClusterer(unittest.TestCase):
+    """Tests for the TechnologyClusterer class."""
+
+    def setUp(self):
+        """Two groups joined by one weak link, plus an isolated pair below the threshold."""
+        self.correlations = {
+            'react': {'javascript': 0.8, 'typescript': 0.6},
+            'javascript': {'react': 0.8, 'typescript': 0.7, 'python': 0.35},
+            'typescript': {'react': 0.6, 'javascript': 0.7},
+            'python': {'javascript': 0.35, 'django': 0.9, 'flask': 0.8},
+            'django': {'python': 0.9, 'flask': 0.5},
+            'flask': {'python': 0.8, 'django': 0.5},
+            'rust': {'go': 0.1},
+            'go': {'rust': 0.1}
+        }
+
+    def test_components(self):
+        """Test that linked technologies form one component and weak pairs are dropped."""
+        clusters = TechnologyClusterer(threshold=0.3).cluster(self.correlations)
+        self.assertEqual(clusters, [['react', 'javascript', 'typescript', 'python', 'django', 'flask']])
+
+        clusters = TechnologyClusterer(threshold=0.4).cluster(self.correlations)
+        self.assertEqual(clusters, [['react', 'javascript', 'typescript'], ['python', 'django', 'flask']])
+
+    def test_label_propagation(self):
+        """Test that communities split a component along its weak link."""
+        clusterer = TechnologyClusterer(threshold=0.3, mode='label_propagation')
+        clusters = clusterer.cluster(self.correlations)
+        self.assertEqual(clusters, [['react', 'javascript', 'typescript'], ['python', 'django', 'flask']])
+
+        # Deterministic across runs
+        self.assertEqual(clusterer.cluster(self.correlations), clusters)
+
+    def test_unknown_mode(self):
+        """Test that unknown modes are rejected."""
+        with self.assertRaises(ValueError):
+            TechnologyClusterer(mode='kmeans')
+
+    def test_name_cluster(self):
+        """Test naming clusters by their best matching category."""
+        self.assertEqual(name_cluster(['react', 'javascript', 'typescript']), 'Web Development')
+        self.assertEqual(name_cluster(['Node.js', 'react-native', 'vue']), 'Web Development')
+        self.assertEqual(name_cluster(['aws', 'kubernetes']), 'Cloud & Devops')
+        self.assertEqual(name_cluster(['cobol', 'fortran']), 'Related Technologies (2)')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Unit tests for the correlation engine.
+"""
+import math
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing import correlation
+from data_processing.correlation import CooccurrenceAccumulator, CorrelationEngine, find_technologies, update_cooccurrence
+from data_processing.trends import DAY
+from utils.lexicon import Lexicon
+from utils.state import BucketStore
+
+# A fixed start time, at midnight UTC
+START = 20000 * DAY
+
+class TestCorrelationEngine(unittest.TestCase):
+    """Tests for the CorrelationEngine class."""
+
+    def setUp(self):
+        """Add documents with known overlaps."""
+        self.engine = CorrelationEngine(['python', 'django', 'rust', 'go'])
+        self.engine.add_document(['python', 'django'])
+        self.engine.add_document(['python', 'django', 'python'])
+        self.engine.add_document(['python', 'rust'])
+        self.engine.add_document(['rust', 'unknown'])
+
+    def test_co_occurrence(self):
+        """Test shared document counts and document frequencies."""
+        counts = self.engine.co_occurrence().toarray()
+        self.assertEqual(list(counts.diagonal()), [3, 2, 2, 0])
+        self.assertEqual(counts[0, 1], 2)
+        self.assertEqual(counts[0, 2], 1)
+        self.assertEqual(counts[1, 2], 0)
+
+    def test_metrics(self):
+        """Test each metric against hand-computed values."""
+        jaccard = self.engine.to_dict('jaccard')
+        self.assertAlmostEqual(jaccard['python']['django'], 2 / 3)
+        self.assertAlmostEqual(jaccard['rust']['python'], 1 / 4)
+        self.assertNotIn('go', jaccard)
+        self.assertNotIn('rust', jaccard['django'])
+
+        self.assertAlmostEqual(self.engine.to_dict('cosine')['python']['django'], 2 / math.sqrt(6))
+        self.assertAlmostEqual(self.engine.to_dict('pmi')['python']['django'], math.log(2 * 4 / 6))
+        self.assertAlmostEqual(self.engine.to_dict('npmi')['django']['python'],
+                               math.log(2 * 4 / 6) / -math.log(2 / 4))
+
+    def test_min_count(self):
+        """Test that rare pairs can be left out."""
+        self.assertEqual(self.engine.to_dict(min_count=2), {'python': {'django': 2 / 3}, 'django': {'python': 2 / 3}})
+
+    def test_unknown_metric(self):
+        """Test that unknown metrics are rejected."""
+        with self.assertRaises(ValueError):
+            self.engine.similarity('dice')
+
+class TestCooccurrenceAccumulator(unittest.TestCase):
+    """Tests for the CooccurrenceAccumulator class."""
+
+    TECHNOLOGIES = ['python', 'django', 'rust', 'go']
+    DOCUMENTS = [('a', ['Python web apps', 'django']), ('b', ['python', 'django', 'python']),
+                 ('c', ['python', 'rust']), ('d', ['rust', 'unknown']), ('e', [])]
+
+    def test_matches_engine(self):
+        """Test that similarities equal those of the engine over the same documents."""
+        lexicon = Lexicon(self.TECHNOLOGIES)
+        engine = CorrelationEngine(self.TECHNOLOGIES)
+        for _, texts in self.DOCUMENTS:
+            engine.add_document(find_technologies(lexicon, texts))
+
+        accumulator = CooccurrenceAccumulator()
+        accumulator.add_documents(self.DOCUMENTS, self.TECHNOLOGIES, now=START)
+
+        for metric in CorrelationEngine.METRICS:
+            expected = engine.to_dict(metric)
+            result = accumulator.to_dict(self.TECHNOLOGIES, metric)
+            self.assertEqual(list(result), list(expected))
+            for tech, partners in expected.items():
+                self.assertEqual(list(result[tech]), list(partners))
+                for other, score in partners.items():
+                    self.assertAlmostEqual(result[tech][other], score)
+
+    def test_documents_counted_once(self):
+        """Test that documents already added are skipped."""
+        accumulator = CooccurrenceAccumulator()
+        self.assertEqual(accumulator.add_documents(self.DOCUMENTS, self.TECHNOLOGIES, now=START), 5)
+        self.assertEqual(accumulator.add_documents(self.DOCUMENTS[:2] + [('f', ['go', 'rust'])], now=START), 1)
+
+        self.assertEqual(len(accumulator), 6)
+        self.assertEqual(accumulator.pair_counts['django', 'python'], 2)
+        self.assertEqual(accumulator.technology_counts['rust'], 3)
+
+    def test_new_technologies_cover_the_window(self):
+        """Test that a technology tracked later is matched in documents seen before."""
+        accumulator = CooccurrenceAccumulator()
+        accumulator.add_documents(self.DOCUMENTS[:3], ['python', 'django'], now=START)
+        accumulator.add_documents(self.DOCUMENTS[3:], ['python', 'django', 'rust'], now=START + DAY)
+
+        self.assertEqual(accumulator.technology_counts['rust'], 2)
+        self.assertEqual(accumulator.pair_counts['python', 'rust'], 1)
+        self.assertEqual(len(accumulator), 5)
+
+        # The same counts as tracking every technology from the start
+        expected = CooccurrenceAccumulator()
+        expected.add_documents(self.DOCUMENTS, self.TECHNOLOGIES, now=START)
+        self.assertEqual(accumulator.to_dict(self.TECHNOLOGIES, 'npmi'), expected.to_dict(self.TECHNOLOGIES, 'npmi'))
+
+    def test_documents_expire(self):
+        """Test that documents leave the counts after the history window."""
+        accumulator = CooccurrenceAccumulator(history_days=2)
+        accumulator.add_documents(self.DOCUMENTS[:2], self.TECHNOLOGIES, now=START)
+        accumulator.add_documents(self.DOCUMENTS[2:], now=START + DAY)
+
+        accumulator.expire(now=START + 2 * DAY)
+        self.assertEqual(len(accumulator), 3)
+        self.assertNotIn(('django', 'python'), accumulator.pair_counts)
+        self.assertNotIn('django', accumulator.technology_counts)
+        self.assertEqual(accumulator.to_dict(['python', 'rust']), {'python': {'rust': 1 / 2}, 'rust': {'python': 1 / 2}})
+
+        # An expired document is counted again if it is seen again
+        self.assertEqual(accumulator.add_documents(self.DOCUMENTS[:1], now=START + 2 * DAY), 1)
+
+class TestPersistedCooccurrence(unittest.TestCase):
+    """Tests for accumulators persisted in the state store."""
+
+    KEY = 'tests:cooccurrence'
+    DOCUMENTS = TestCooccurrenceAccumulator.DOCUMENTS
+    TECHNOLOGIES = TestCooccurrenceAccumulator.TECHNOLOGIES
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.addCleanup(correlation._accumulators.clear)
+
+    def update(self, documents, technologies, now):
+        return update_cooccurrence(self.KEY, documents, technologies, now=now, root=self.root)
+
+    def test_persisted_updates(self):
+        """Test that updates continue from the stored accumulator, also in a new process."""
+        self.update(self.DOCUMENTS[:2], ['python', 'django'], now=START)
+        self.assertEqual(len(self.update(self.DOCUMENTS, ['python', 'django'], now=START)), 5)
+
+        # A process starting later loads the counts, and rematches stored documents
+        correlation._accumulators.clear()
+        accumulator = self.update([], self.TECHNOLOGIES, now=START + DAY)
+        self.assertEqual(len(accumulator), 5)
+        self.assertEqual(accumulator.pair_counts['django', 'python'], 2)
+        self.assertEqual(accumulator.technology_counts['rust'], 2)
+
+        correlation._accumulators.clear()
+        self.assertEqual(self.update([], [], now=START + DAY).technology_counts['rust'], 2)
+
+    def test_updates_write_only_changed_buckets(self):
+        """Test that a refresh without new documents or technologies writes nothing."""
+        self.update(self.DOCUMENTS, self.TECHNOLOGIES, now=START)
+
+        with patch.object(BucketStore, 'save') as save:
+            self.update(self.DOCUMENTS, self.TECHNOLOGIES, now=START + DAY)
+        save.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
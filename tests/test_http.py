@@ -0,0 +1,186 @@
+"""
+Unit tests for recording and replaying upstream responses.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import requests
+from api_clients.github_client import GitHubClient
+from api_clients.stackoverflow_client import StackOverflowClient
+from utils import cache, http, state
+
+class TestRequestKey(unittest.TestCase):
+    """Test cases for matching requests to archived responses."""
+
+    def test_secrets_and_host_are_ignored(self):
+        """Test that API keys and the host don't change the key."""
+        first = http.request_key('GET', 'https://newsapi.org/v2/everything', {'q': 'python', 'apiKey': 'one'})
+        second = http.request_key('GET', 'http://localhost:5001/v2/everything', {'apiKey': 'two', 'q': 'python'})
+        self.assertEqual(first, second)
+        self.assertNotIn('one', first)
+
+    def test_dates_are_normalised(self):
+        """Test that a query recorded on another day matches."""
+        first = http.request_key('GET', 'https://api.github.com/search/repositories', {'q': 'created:>2026-01-01'})
+        second = http.request_key('GET', 'https://api.github.com/search/repositories', {'q': 'created:>2026-03-15'})
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, http.request_key('GET', 'https://api.github.com/search/repositories',
+                                                    {'q': 'created:>2026-01-01 language:go'}))
+
+    def test_epoch_dates_are_normalised(self):
+        """Test that Stack Exchange timestamps recorded at another time match."""
+        first = http.request_key('GET', 'https://api.stackexchange.com/2.3/questions', {'fromdate': 1767225600})
+        second = http.request_key('GET', 'https://api.stackexchange.com/2.3/questions', {'fromdate': 1767312001})
+        self.assertEqual(first, second)
+        self.assertNotEqual(http.request_key('GET', 'https://api.stackexchange.com/2.3/questions', {'page': 1}),
+                            http.request_key('GET', 'https://api.stackexchange.com/2.3/questions', {'page': 2}))
+
+    def test_url_query_is_kept(self):
+        """Test that parameters in the URL itself (e.g. a Link next URL) are part of the key."""
+        linked = http.request_key('GET', 'https://api.github.com/search/repositories?q=python&page=2')
+        self.assertEqual(linked, http.request_key('GET', 'https://api.github.com/search/repositories',
+                                                  {'page': 2, 'q': 'python'}))
+        self.assertNotEqual(linked, http.request_key('GET', 'https://api.github.com/search/repositories?q=go&page=2'))
+
+class TestRecordReplay(unittest.TestCase):
+    """Test cases for the record and replay modes."""
+
+    def setUp(self):
+        """Set up a temporary archive and cache."""
+        self.archive_dir = tempfile.mkdtemp()
+        self.cache_dir = cache.CACHE_DIR
+        self.state_dir = state.STATE_DIR
+        cache.set_cache_dir(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, cache.CACHE_DIR)
+
+    def tearDown(self):
+        """Return to live requests and the usual cache and state."""
+        http.configure('live')
+        cache.set_cache_dir(self.cache_dir)
+        state.STATE_DIR = self.state_dir
+        shutil.rmtree(self.archive_dir)
+
+    @patch('requests.get')
+    def test_round_trip(self, mock_get):
+        """Test that a recorded response is replayed without a request."""
+        mock_get.return_value = MagicMock(status_code=200, text='{"items": [1, 2]}',
+                                          headers={'Link': '<https://api.github.com/x?page=2>; rel="next"',
+                                                   'Set-Cookie': 'session=secret'})
+        http.configure('record', archive_dir=self.archive_dir)
+        http.get('https://api.github.com/search/repositories', params={'q': 'created:>2026-01-01'})
+        self.assertEqual(len(http.ResponseArchive(self.archive_dir).snapshots()), 1)
+
+        mock_get.reset_mock()
+        http.configure('replay', archive_dir=self.archive_dir)
+        response = http.get('https://api.github.com/search/repositories', params={'q': 'created:>2026-02-01'})
+
+        mock_get.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'items': [1, 2]})
+        self.assertEqual(response.links['next']['url'], 'https://api.github.com/x?page=2')
+        self.assertNotIn('Set-Cookie', response.headers)
+        self.assertNotEqual(cache.CACHE_DIR, self.cache_dir)
+        self.assertNotEqual(state.STATE_DIR, self.state_dir)
+
+    @patch('requests.get')
+    def test_replay_miss(self, mock_get):
+        """Test that an unarchived request fails like a network error."""
+        mock_get.return_value = MagicMock(status_code=200, text='{}', headers={})
+        http.configure('record', archive_dir=self.archive_dir)
+        http.get('https://hacker-news.firebaseio.com/v0/topstories.json')
+
+        http.configure('replay', archive_dir=self.archive_dir)
+        with self.assertRaises(requests.exceptions.RequestException):
+            http.get('https://hacker-news.firebaseio.com/v0/item/1.json')
+        with self.assertRaises(http.ReplayMissError):
+            http.post('https://www.reddit.com/api/v1/access_token')
+        mock_get.assert_called_once()
+
+    @patch('requests.get')
+    def test_top_questions_replay_later(self, mock_get):
+        """Test that the bulk Stack Overflow pull replays after its fromdate has moved on."""
+        def respond(url, params=None, **kwargs):
+            if url.endswith('/filters/create'):
+                body = '{"items": [{"filter": "!narrow"}]}'
+            else:
+                body = ('{"items": [{"title": "Question", "link": "https://stackoverflow.com/q/1", "score": 5, '
+                        '"answer_count": 1, "view_count": 10, "tags": ["python"], "creation_date": 1, '
+                        '"is_answered": true}], "has_more": false}')
+            return MagicMock(status_code=200, text=body, headers={}, json=lambda: json.loads(body))
+        mock_get.side_effect = respond
+
+        http.configure('record', archive_dir=self.archive_dir)
+        recorded = StackOverflowClient().get_top_questions(period="week", pages=1)
+
+        mock_get.reset_mock()
+        http.configure('replay', archive_dir=self.archive_dir)
+        with patch('time.time', return_value=time.time() + 3600):
+            replayed = StackOverflowClient().get_top_questions(period="week", pages=1)
+
+        mock_get.assert_not_called()
+        self.assertEqual([question['title'] for question in replayed], ["Question"])
+        self.assertEqual(replayed, recorded)
+
+    @patch('requests.get')
+    def test_linked_pages_replay_in_order(self, mock_get):
+        """Test that each page followed through a Link header replays its own response."""
+        def respond(url, params=None, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            page = int(url.rpartition('page=')[2]) if 'page=' in url else 1
+            response._content = json.dumps({"items": [{"full_name": f"repo/{page}"}]}).encode()
+            if page < 3:
+                response.headers['Link'] = f'<https://api.github.com/search/repositories?q=go&page={page + 1}>; rel="next"'
+            return response
+        mock_get.side_effect = respond
+        client = GitHubClient()
+
+        http.configure('record', archive_dir=self.archive_dir)
+        recorded = [repo['full_name'] for repo in client._iter_search_results('go', sample_size=10)]
+
+        mock_get.reset_mock()
+        http.configure('replay', archive_dir=self.archive_dir)
+        replayed = [repo['full_name'] for repo in client._iter_search_results('go', sample_size=10)]
+
+        mock_get.assert_not_called()
+        self.assertEqual(recorded, ['repo/1', 'repo/2', 'repo/3'])
+        self.assertEqual(replayed, recorded)
+
+    @patch('requests.get')
+    def test_record_bypasses_warm_cache(self, mock_get):
+        """Test that results cached before recording are fetched and archived again."""
+        mock_get.return_value = MagicMock(status_code=200, text='{"items": []}', headers={},
+                                          json=MagicMock(return_value={"items": []}))
+        client = StackOverflowClient()
+        client.get_popular_tags(limit=5)
+
+        http.configure('record', archive_dir=self.archive_dir)
+        client.get_popular_tags(limit=5)
+        self.assertEqual(mock_get.call_count, 2)
+
+        http.configure('replay', archive_dir=self.archive_dir)
+        self.assertEqual(StackOverflowClient().get_popular_tags(limit=5), [])
+
+    def test_archived_call(self):
+        """Test that library calls are recorded and replayed."""
+        fetch = MagicMock(return_value={'python': [1, 2, 3]})
+        http.configure('record', archive_dir=self.archive_dir)
+        self.assertEqual(http.archived('pytrends', 'python|today 3-m', fetch), {'python': [1, 2, 3]})
+
+        http.configure('replay', archive_dir=self.archive_dir)
+        self.assertEqual(http.archived('pytrends', 'python|today 3-m', fetch), {'python': [1, 2, 3]})
+        fetch.assert_called_once()
+
+    def test_missing_snapshot(self):
+        """Test that replaying an empty archive is refused."""
+        with self.assertRaises(ValueError):
+            http.configure('replay', archive_dir=self.archive_dir)
+
+if __name__ == '__main__':
+    unittest.main()
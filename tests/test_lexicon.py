@@ -0,0 +1,47 @@
+"""
+Unit tests for the technology lexicon.
+"""
+import unittest
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.lexicon import Lexicon
+
+class TestLexicon(unittest.TestCase):
+    """Tests for the Lexicon class."""
+
+    def setUp(self):
+        """Build a lexicon with single- and multi-word terms."""
+        self.lexicon = Lexicon(['go', 'r', 'javascript', 'node.js', 'machine learning', 'learning', 'c++'])
+
+    def test_whole_words_only(self):
+        """Test that terms don't match inside other words."""
+        self.assertEqual(self.lexicon.find("Google ranks Rust programs"), [])
+        self.assertFalse(self.lexicon.matches("category theory"))
+        self.assertEqual(self.lexicon.find("Why Go? (and R)"), ['go', 'r'])
+
+    def test_aliases_resolve_to_canonical_names(self):
+        """Test that aliases report their canonical term."""
+        self.assertEqual(self.lexicon.find("Golang, JS and nodejs"), ['go', 'javascript', 'node.js'])
+        self.assertEqual(self.lexicon.find("Node.js with C++"), ['node.js', 'c++'])
+
+    def test_overlapping_phrases(self):
+        """Test that every phrase is found, including ones inside longer phrases."""
+        self.assertEqual(list(self.lexicon.finditer("deep machine-learning")),
+                         [('machine learning', 1, 3), ('learning', 2, 3)])
+
+    def test_dotted_names(self):
+        """Test that a name with a leading dot doesn't match the plain word."""
+        lexicon = Lexicon(['.NET'])
+        self.assertEqual(lexicon.find("Cast a wide net"), [])
+        self.assertEqual(lexicon.find("Porting to .NET 8 (and dotnet tools)"), ['.NET'])
+        self.assertEqual(lexicon.find("Built on .NET."), ['.NET'])
+        self.assertEqual(lexicon.find("...net"), [])
+
+    def test_term_takes_precedence_over_alias(self):
+        """Test that a term isn't reported under another term's alias."""
+        lexicon = Lexicon(['node', 'node.js'])
+        self.assertEqual(lexicon.find("node"), ['node'])
+
+
+if __name__ == '__main__':
+    unittest.main()
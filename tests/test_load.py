@@ -0,0 +1,70 @@
+"""
+Unit tests for the HTTP load test harness.
+"""
+import os
+import threading
+import time
+import unittest
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from flask import Flask
+from werkzeug.serving import make_server
+
+from benchmarks.load import POLLING_REQUESTS, Recorder, percentile, run_polling, summarize
+
+class TestLoadTest(unittest.TestCase):
+    """Test cases for driving load and summarizing its latencies."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([3, 1, 2], 50), 2)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summarize(self):
+        """Test per-endpoint and overall figures, leaving page loads out of the overall ones."""
+        samples = [('/a', 0.1, True), ('/a', 0.3, False), ('/b', 0.2, True), ('page load', 1.0, True)]
+        summary = summarize(samples, duration=2.0)
+
+        self.assertEqual(summary['overall']['requests'], 3)
+        self.assertEqual(summary['overall']['errors'], 1)
+        self.assertAlmostEqual(summary['overall']['throughput'], 1.5)
+        self.assertEqual(summary['overall']['max'], 0.3)
+        self.assertEqual(summary['endpoints']['/a']['error_rate'], 0.5)
+        self.assertEqual(summary['endpoints']['page load']['p50'], 1.0)
+
+    def test_polling_is_open_loop(self):
+        """Test that polling keeps its rate when responses are slow, and counts the queueing."""
+        app = Flask(__name__)
+        lock = threading.Lock()
+
+        def slow():
+            # One response at a time, slower than the request rate
+            with lock:
+                time.sleep(0.1)
+            return 'ok'
+
+        for path in POLLING_REQUESTS:
+            app.add_url_rule(path, path, slow)
+
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            recorder = Recorder(f"http://127.0.0.1:{server.server_port}")
+            run_polling(recorder, rate=40, duration=0.25)
+        finally:
+            server.shutdown()
+            thread.join()
+
+        latencies = sorted(latency for _, latency, _ in recorder.samples)
+        self.assertEqual(len(latencies), 10)
+        self.assertTrue(all(ok for _, _, ok in recorder.samples))
+        # The last request waited behind the others instead of being delayed
+        self.assertGreater(latencies[-1], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Unit tests for the mock upstream server, run against the real clients.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import requests
+from werkzeug.serving import make_server
+from api_clients.github_client import GitHubClient
+from api_clients.hackernews_client import HackerNewsClient
+from api_clients.news_client import NewsClient
+from api_clients.pytrends_client import PyTrendsClient
+from api_clients.reddit_client import RedditClient
+from api_clients.stackoverflow_client import StackOverflowClient
+from benchmarks.mock_upstream import MockUpstream, create_app, sample_latency
+from utils import cache
+
+class TestMockUpstream(unittest.TestCase):
+    """Test cases for serving the clients from the mock upstream server."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the server and point the clients at it."""
+        cls.upstream = MockUpstream({'latency_distribution': 'none'})
+        cls.server = make_server('127.0.0.1', 0, create_app(cls.upstream), threaded=True)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+        # Fresh cache, so results cached from real APIs are not used
+        cls.cache_dir = cache.CACHE_DIR
+        cache.set_cache_dir(tempfile.mkdtemp())
+        cls.environment = patch.dict(os.environ, {'UPSTREAM_BASE_URL': cls.base_url, 'NEWS_API_KEY': 'mock',
+                                                  'REDDIT_CLIENT_ID': '', 'REDDIT_CLIENT_SECRET': ''})
+        cls.environment.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the server and restore the cache."""
+        cls.environment.stop()
+        cls.server.shutdown()
+        shutil.rmtree(cache.CACHE_DIR)
+        cache.set_cache_dir(cls.cache_dir)
+
+    def setUp(self):
+        """Reset counters and settings between tests."""
+        self.upstream.configure({'error_rate': 0.0, 'rate_limit': 5000})
+        self.upstream.reset_stats()
+
+    def test_github(self):
+        """Test repository search with filters and Link pagination."""
+        client = GitHubClient()
+        repos = client.get_trending_repositories(language='Python', limit=5)
+        self.assertEqual(len(repos), 5)
+        self.assertTrue(all(repo['language'] == 'Python' for repo in repos))
+        self.assertEqual([repo['stars'] for repo in repos], sorted((repo['stars'] for repo in repos), reverse=True))
+
+        self.assertEqual(len(list(client.iter_repositories('created:>2000-01-01', sample_size=250))), 250)
+        self.assertEqual(self.upstream.stats['github']['requests'], 4)
+
+    def test_stackoverflow(self):
+        """Test tags and questions, fetched in bulk and per tag."""
+        client = StackOverflowClient()
+        self.assertEqual(len(client.get_popular_tags(limit=10)), 10)
+        questions = client.get_questions_by_tag(['python', 'go'], limit=3)
+        self.assertEqual({tag: len(tag_questions) for tag, tag_questions in questions.items()}, {'python': 3, 'go': 3})
+
+    def test_hackernews_reddit_news(self):
+        """Test stories, subreddit listings and articles."""
+        self.assertEqual(len(HackerNewsClient().get_top_stories(limit=3)), 3)
+        self.assertEqual(len(list(RedditClient().iter_posts('Python', sample_size=150))), 150)
+        self.assertEqual(len(NewsClient().get_tech_news(limit=5)), 5)
+
+    def test_pytrends(self):
+        """Test interest over time through pytrends."""
+        interest = PyTrendsClient().get_interest_by_term(['Go', 'Rust'])
+        self.assertLessEqual({'Go', 'Rust'}, set(interest))
+        self.assertGreater(interest['Go']['popularity'], 0)
+        self.assertEqual(self.upstream.stats['trends']['requests'], 2)
+
+    def test_errors_and_rate_limits(self):
+        """Test simulated failures and exhausted request budgets."""
+        self.upstream.configure({'hackernews': {'error_rate': 1.0}, 'github': {'rate_limit': 1}})
+        self.assertEqual(HackerNewsClient().get_top_stories(limit=3), [])
+        self.assertEqual(self.upstream.stats['hackernews']['errors'], 1)
+
+        url = f"{self.base_url}/github/search/repositories"
+        self.assertEqual(requests.get(url, params={'q': 'language:go'}).headers['X-RateLimit-Remaining'], '0')
+        response = requests.get(url, params={'q': 'language:go'})
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('Retry-After', response.headers)
+        self.assertEqual(self.upstream.stats['github']['rate_limited'], 1)
+
+    def test_latency_distributions(self):
+        """Test that sampled latencies have the requested mean."""
+        import random
+        rng = random.Random(0)
+        for distribution in ('fixed', 'uniform', 'exponential', 'lognormal'):
+            samples = [sample_latency(rng, distribution, 100) for _ in range(5000)]
+            self.assertAlmostEqual(sum(samples) / len(samples), 0.1, delta=0.01, msg=distribution)
+        self.assertEqual(sample_latency(rng, 'none', 100), 0.0)
+        with self.assertRaises(ValueError):
+            sample_latency(rng, 'gaussian', 100)
+
+if __name__ == '__main__':
+    unittest.main()
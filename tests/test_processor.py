@@ -4,15 +4,26 @@ Unit tests for the data processor module.
 import unittest
 from unittest.mock import patch, MagicMock
 import json
+import shutil
+import tempfile
 import os , sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from api_clients.records import Repo
 from data_processing.processor import DataProcessor
+from utils import cache, state
 
 class TestDataProcessor(unittest.TestCase):
     """Tests for the DataProcessor class."""
     
     def setUp(self):
         """Set up the test case."""
+        # Cached responses and rolling topic and correlation counts go to
+        # scratch directories
+        for module, name in ((cache, 'CACHE_DIR'), (state, 'STATE_DIR')):
+            directory_patch = patch.object(module, name, tempfile.mkdtemp())
+            self.addCleanup(shutil.rmtree, directory_patch.start())
+            self.addCleanup(directory_patch.stop)
+        
         # Create a processor with mocked API clients
         self.processor = DataProcessor()
         
@@ -23,6 +34,7 @@ class TestDataProcessor(unittest.TestCase):
         self.processor.news_client = MagicMock()
         self.processor.reddit_client = MagicMock()
         self.processor.pytrends_client = MagicMock()
+        self.processor.snapshot_store = MagicMock()
     
     def test_get_technology_popularity(self):
         """Test getting technology popularity data."""
@@ -195,6 +207,23 @@ class TestDataProcessor(unittest.TestCase):
             self.assertIn("topics", repo)
             self.assertIn("related_technology", repo)
     
+    def test_get_emerging_repositories_leaves_client_results_unchanged(self):
+        """Test that repositories shared with other callers are not modified."""
+        self.processor.get_technology_popularity = MagicMock(return_value={
+            "python": {"overall_score": 90, "platform_scores": {}},
+            "go": {"overall_score": 80, "platform_scores": {}}
+        })
+        
+        # The same repository is found for both technologies
+        shared = [Repo(name="user/tool", url="https://github.com/user/tool", description="A tool",
+                       language="Go", stars=10, forks=1, created_at="2023-01-01", topics=[])]
+        self.processor.github_client.get_trending_repositories.return_value = shared
+        
+        result = self.processor.get_emerging_repositories()
+        
+        self.assertEqual([repo['related_technology'] for repo in result], ["python", "go"])
+        self.assertNotIn("related_technology", shared[0])
+    
     def test_get_hot_discussions(self):
         """Test getting hot discussions data."""
         # Setup mock data
@@ -222,6 +251,9 @@ class TestDataProcessor(unittest.TestCase):
                 "tags": [tags[0], "best-practices"]
             }
         ] if tags else []
+        self.processor.stackoverflow_client.get_questions_by_tag.side_effect = lambda tags, **kwargs: {
+            tag: self.processor.stackoverflow_client.get_popular_questions(tags=[tag]) for tag in tags
+        }
         
         self.processor.reddit_client.get_top_posts.side_effect = lambda subreddit, **kwargs: [
             {
@@ -307,6 +339,9 @@ class TestDataProcessor(unittest.TestCase):
                 "tags": [tags[0], "aws"] if tags[0] != "aws" else [tags[0], "python"]
             }
         ] if tags else []
+        self.processor.stackoverflow_client.get_questions_by_tag.side_effect = lambda tags, **kwargs: {
+            tag: self.processor.stackoverflow_client.get_popular_questions(tags=[tag]) for tag in tags
+        }
         
         # Call the method
         result = self.processor.get_technology_correlations()
@@ -389,6 +424,59 @@ class TestDataProcessor(unittest.TestCase):
         
         # Check for technology clusters
         self.assertIn("technology_clusters", result)
+        
+        # Check per-stage timings
+        self.assertIn("metadata", result)
+        self.assertEqual(set(result["metadata"]["stage_timings"]), {
+            "popularity_ranking", "trending_topics", "emerging_repositories",
+            "hot_discussions", "tech_correlations", "technology_clusters"
+        })
+        
+        # Check that the run was stored for historical queries
+        self.processor.snapshot_store.append.assert_called_once_with(result)
+    
+    def test_run_stages_computes_only_dependencies(self):
+        """Test that running a stage computes only the stages it depends on."""
+        self.processor.get_technology_popularity = MagicMock(return_value={})
+        self.processor.get_trending_topics = MagicMock(return_value={})
+        self.processor.get_hot_discussions = MagicMock(return_value=[])
+        self.processor.get_technology_correlations = MagicMock(return_value={})
+        
+        results, timings = self.processor.run_stages(["technology_clusters"])
+        
+        self.assertEqual(list(results), ["popularity_ranking", "tech_correlations", "technology_clusters"])
+        self.assertEqual(set(timings), set(results))
+        self.processor.get_trending_topics.assert_not_called()
+        self.processor.get_hot_discussions.assert_not_called()
+
+    
+    def test_insights_report_computes_popularity_once(self):
+        """Test that stages shared by report sections are computed once per report."""
+        self.processor.github_client.get_language_stats.return_value = {"Python": 100, "Rust": 40}
+        self.processor.stackoverflow_client.get_popular_tags.return_value = [{"name": "python", "count": 50000}]
+        self.processor.pytrends_client.get_trending_technologies.return_value = []
+        self.processor.stackoverflow_client.get_questions_by_tag.side_effect = lambda tags, **kwargs: {}
+        self.processor.github_client.get_trending_repositories.return_value = []
+        self.processor.news_client.get_tech_news.return_value = []
+        self.processor.reddit_client.get_tech_subreddit_posts.return_value = {}
+        self.processor.reddit_client.get_top_posts.return_value = []
+        self.processor.hackernews_client.get_tech_stories.return_value = []
+        
+        result = self.processor.get_technology_insights_report()
+        
+        self.assertEqual(list(result["popularity_ranking"]), ["python", "rust"])
+        self.assertEqual(self.processor.github_client.get_language_stats.call_count, 1)
+        self.assertEqual(self.processor.stackoverflow_client.get_popular_tags.call_count, 1)
+        
+        # Hot discussions and correlations share one bulk Stack Overflow pull
+        self.processor.stackoverflow_client.get_top_questions.assert_called_once()
+        top_questions = self.processor.stackoverflow_client.get_top_questions.return_value
+        for call in self.processor.stackoverflow_client.get_questions_by_tag.call_args_list:
+            self.assertIs(call.kwargs["top_questions"], top_questions)
+        
+        # Outside of a report, every call recomputes
+        self.processor.get_technology_popularity()
+        self.assertEqual(self.processor.github_client.get_language_stats.call_count, 2)
 
 
 if __name__ == '__main__':
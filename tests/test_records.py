@@ -0,0 +1,78 @@
+"""
+Unit tests for the API client record types.
+"""
+import json
+import pickle
+import unittest
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from api_clients.records import Article, RecordBatch, Repo, json_default
+
+class TestRecords(unittest.TestCase):
+    """Tests for Record subclasses and RecordBatch."""
+
+    def setUp(self):
+        """Create a sample repository record."""
+        self.repo = Repo(name="user/project", url="https://github.com/user/project", description="A project",
+                         language="Python", stars=42, forks=3, created_at="2026-10-01T00:00:00Z", topics=["web"])
+
+    def test_mapping_access(self):
+        """Test that records behave like the dictionaries clients used to return."""
+        self.assertEqual(self.repo['stars'], 42)
+        self.assertEqual(self.repo.stars, 42)
+        self.assertEqual(self.repo.get('missing', 'default'), 'default')
+        self.assertIn('topics', self.repo)
+        self.assertEqual(self.repo, dict(self.repo))
+        self.assertFalse(hasattr(self.repo, '__dict__'))
+        with self.assertRaises(KeyError):
+            self.repo['missing']
+
+    def test_extra_keys(self):
+        """Test setting keys that aren't fields."""
+        self.repo['related_technology'] = 'python'
+        self.assertEqual(self.repo['related_technology'], 'python')
+        self.assertEqual(list(self.repo)[-1], 'related_technology')
+        self.assertEqual(len(self.repo), len(Repo.FIELDS) + 1)
+
+        del self.repo['related_technology']
+        self.assertNotIn('related_technology', self.repo)
+        with self.assertRaises(TypeError):
+            del self.repo['stars']
+
+    def test_defaults(self):
+        """Test that missing fields take their defaults."""
+        article = Article(title="Title", url="https://example.com")
+        self.assertEqual(article['content'], '')
+        self.assertIsNone(article['description'])
+
+    def test_pickle_round_trip(self):
+        """Test that records, including extra keys, survive the cache."""
+        self.repo['related_technology'] = 'python'
+        restored = pickle.loads(pickle.dumps(self.repo))
+        self.assertIsInstance(restored, Repo)
+        self.assertEqual(restored.to_dict(), self.repo.to_dict())
+
+    def test_json(self):
+        """Test JSON conversion at the API edge."""
+        data = json.loads(json.dumps({'repos': [self.repo]}, default=json_default))
+        self.assertEqual(data['repos'][0]['name'], "user/project")
+        with self.assertRaises(TypeError):
+            json_default(object())
+
+    def test_record_batch(self):
+        """Test the columnar form of records."""
+        other = {'name': "user/other", 'stars': 7, 'language': "Rust"}
+        batch = RecordBatch.from_records(Repo, [self.repo, other])
+
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(batch.column('stars'), [42, 7])
+        self.assertEqual(batch[1]['language'], "Rust")
+        self.assertEqual(batch.to_records()[0], self.repo)
+        self.assertEqual(list(batch.to_frame().columns), list(Repo.FIELDS))
+
+        with self.assertRaises(ValueError):
+            RecordBatch(Repo, {'name': ['a'], 'stars': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
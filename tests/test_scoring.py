@@ -0,0 +1,73 @@
+"""
+Unit tests for the popularity scoring module.
+"""
+import unittest
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.scoring import PopularityScorer
+
+class TestPopularityScorer(unittest.TestCase):
+    """Tests for the PopularityScorer class."""
+
+    def setUp(self):
+        """Set up sample platform data."""
+        self.platform_values = {
+            'github': {'Python': 100, 'JavaScript': 80, 'Rust': 40},
+            'stackoverflow': {'python': 50000, 'javascript': 40000, 'java': 30000},
+            'pytrends': {'Python': 80, 'JavaScript': 70, 'React': 60}
+        }
+
+    def test_max_normalization(self):
+        """Test the default scores against hand-computed values."""
+        result = PopularityScorer().score(self.platform_values)
+
+        self.assertEqual(list(result), ['python', 'javascript', 'java', 'rust', 'react'])
+
+        python = result['python']
+        self.assertAlmostEqual(python['overall_score'], 100.0)
+        self.assertEqual(python['platform_scores'], {'github': 100.0, 'stackoverflow': 100.0, 'pytrends': 100.0})
+
+        javascript = result['javascript']['platform_scores']
+        self.assertAlmostEqual(javascript['github'], 80.0)
+        self.assertAlmostEqual(javascript['stackoverflow'], 80.0)
+        self.assertAlmostEqual(javascript['pytrends'], 87.5)
+        self.assertAlmostEqual(result['javascript']['overall_score'], 0.4 * 80 + 0.4 * 80 + 0.2 * 87.5)
+
+        # Technologies missing from a platform score zero there
+        self.assertEqual(result['react']['platform_scores']['github'], 0.0)
+        self.assertAlmostEqual(result['react']['overall_score'], 0.2 * 60 / 80 * 100)
+
+    def test_weights_and_methods(self):
+        """Test custom weights and per-platform normalization methods."""
+        scorer = PopularityScorer(weights={'github': 1.0, 'stackoverflow': 0.0},
+                                  normalization={'github': 'rank', 'stackoverflow': 'log'})
+        result = scorer.score(self.platform_values)
+
+        # Only GitHub contributes, as percentile ranks
+        self.assertEqual(list(result), ['python', 'javascript', 'rust'])
+        self.assertAlmostEqual(result['rust']['overall_score'], 100 / 3)
+        self.assertNotIn('pytrends', result['python']['platform_scores'])
+
+    def test_zscore_normalization(self):
+        """Test that z-scores are centred on 50 and bounded to 0-100."""
+        scorer = PopularityScorer(weights={'github': 1.0}, normalization='zscore')
+        result = scorer.score({'github': {'a': 1, 'b': 2, 'c': 3, 'd': 1000}})
+
+        scores = {tech: data['overall_score'] for tech, data in result.items()}
+        self.assertEqual(list(scores)[0], 'd')
+        for score in scores.values():
+            self.assertGreaterEqual(score, 0)
+            self.assertLessEqual(score, 100)
+
+    def test_unknown_normalization(self):
+        """Test that unknown normalization methods are rejected."""
+        with self.assertRaises(ValueError):
+            PopularityScorer(normalization='median')
+
+    def test_empty_input(self):
+        """Test scoring without any platform data."""
+        self.assertEqual(PopularityScorer().score({}), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
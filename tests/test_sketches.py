@@ -0,0 +1,79 @@
+"""
+Unit tests for the approximate counting sketches.
+"""
+import random
+import unittest
+from collections import Counter
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.sketches import SpaceSaving
+from data_processing.topics import extract_topics
+
+class TestSpaceSaving(unittest.TestCase):
+    """Tests for the Space-Saving heavy-hitters summary."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        # Skewed stream: a few heavy items and a long tail
+        self.stream = [f"item{min(int(rng.paretovariate(1.2)), 500)}" for _ in range(20000)]
+        self.exact = Counter(self.stream)
+
+    def test_error_bounds(self):
+        """Test that counts stay within the documented error bounds."""
+        summary = SpaceSaving(50)
+        summary.update(self.stream)
+
+        self.assertLessEqual(len(summary), 50)
+        self.assertEqual(summary.total, len(self.stream))
+        for item, count in summary.items():
+            self.assertLessEqual(self.exact[item], count)
+            self.assertLessEqual(count - summary.error(item), self.exact[item])
+            self.assertLessEqual(summary.error(item), summary.max_error)
+
+    def test_heavy_hitters_tracked(self):
+        """Test that every item above total / capacity is tracked."""
+        summary = SpaceSaving(50)
+        summary.update(self.stream)
+
+        heavy = [item for item, count in self.exact.items() if count > summary.max_error]
+        self.assertTrue(heavy)
+        for item in heavy:
+            self.assertIn(item, summary)
+
+    def test_exact_below_capacity(self):
+        """Test that counts are exact while there are fewer items than the capacity."""
+        summary = SpaceSaving(1000)
+        summary.update(self.stream)
+        summary.update({'item1': 5})
+
+        expected = self.exact + Counter({'item1': 5})
+        self.assertEqual(dict(summary.items()), dict(expected))
+        self.assertEqual(summary.most_common(3), expected.most_common(3))
+        self.assertEqual(summary['missing'], 0)
+
+    def test_invalid_capacity(self):
+        """Test that a summary needs room for at least one item."""
+        with self.assertRaises(ValueError):
+            SpaceSaving(0)
+
+class TestApproximateTopics(unittest.TestCase):
+    """Tests for approximate counting in topic extraction."""
+
+    def test_approximate_matches_exact_top_topics(self):
+        """Test that approximate counting finds the same clear top topics."""
+        rng = random.Random(3)
+        texts = ["Rust compiler release notes"] * 50 + ["Kubernetes operator patterns"] * 30
+        texts += [f"note {rng.randrange(10 ** 6)} {rng.randrange(10 ** 6)} misc" for _ in range(500)]
+        rng.shuffle(texts)
+
+        exact = extract_topics(texts, top_n=5)
+        approximate = extract_topics(texts, top_n=5, counting='approximate', capacity=100)
+        self.assertEqual(approximate[:3], exact[:3])
+
+    def test_unknown_counting_mode(self):
+        """Test that an unknown counting mode is rejected."""
+        with self.assertRaises(ValueError):
+            extract_topics(["Some text"], counting='sampled')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Unit tests for the report snapshot store.
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.snapshots import COMPACT_LOCK, STALE_LOCK_AGE, SnapshotStore
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+def make_report(day):
+    """A report whose scores and stars grow with the day."""
+    return {
+        'popularity_ranking': {
+            'python': {'overall_score': 50.0 + day, 'platform_scores': {'github': 40.0, 'stackoverflow': 60.0}},
+            'go': {'overall_score': 20.0, 'platform_scores': {}}
+        },
+        'trending_topics': {'rust compiler': {'source_count': 2 + day, 'sources': [], 'burst_score': 1.5}},
+        'emerging_repositories': [
+            {'name': 'user/fast', 'url': 'https://github.com/user/fast', 'language': 'Go',
+             'stars': 100 + 50 * day, 'forks': 3, 'related_technology': 'go'},
+            {'name': 'user/slow', 'url': 'https://github.com/user/slow', 'language': None,
+             'stars': 500 + day, 'forks': None},
+            {'name': 'user/flat', 'url': 'https://github.com/user/flat', 'language': 'Python',
+             'stars': 900, 'forks': 1}
+        ],
+        'hot_discussions': [
+            {'title': 'Rust in production', 'url': '/r/programming/1', 'source': 'reddit/r/programming',
+             'score': 10, 'comment_count': 4, 'engagement_score': 30, 'related_technology': 'rust'}
+        ]
+    }
+
+class TestSnapshotStore(unittest.TestCase):
+    """Tests for the SnapshotStore class."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.store = SnapshotStore(self.root)
+        for day in range(10):
+            self.store.append(make_report(day), run_at=START + timedelta(days=day))
+
+    def test_append_partitions_by_day(self):
+        """Test that each run adds a file to its day's partition of every table."""
+        written = self.store.append(make_report(0), run_at=START + timedelta(hours=12))
+
+        self.assertEqual(written, {'popularity': 2, 'topics': 1, 'repositories': 3, 'discussions': 1})
+        self.assertEqual(len(os.listdir(os.path.join(self.root, 'popularity', 'date=2026-01-01'))), 2)
+        self.assertEqual(len(self.store.scan('topics')), 11)
+
+    def test_technology_history(self):
+        """Test a range scan of one technology's scores."""
+        history = self.store.technology_history('python', days=3, now=START + timedelta(days=9))
+
+        self.assertEqual(list(history['overall_score']), [56.0, 57.0, 58.0, 59.0])
+        self.assertTrue(history['run_at'].is_monotonic_increasing)
+        self.assertTrue(history['pytrends_score'].isna().all())
+
+    def test_rising_repositories(self):
+        """Test that repositories are ranked by stars gained within the range."""
+        rising = self.store.rising_repositories(days=7, now=START + timedelta(days=9))
+
+        self.assertEqual(list(rising['name']), ['user/fast', 'user/slow'])
+        self.assertEqual(list(rising['star_gain']), [350, 7])
+
+    def test_compact(self):
+        """Test that compacting a partition keeps its rows."""
+        self.store.append(make_report(1), run_at=START + timedelta(hours=12))
+        before = self.store.scan('repositories', end=START + timedelta(hours=23))
+
+        self.assertEqual(self.store.compact('repositories', '2026-01-01'), 2)
+        self.assertEqual(len(os.listdir(os.path.join(self.root, 'repositories', 'date=2026-01-01'))), 1)
+        after = self.store.scan('repositories', end=START + timedelta(hours=23))
+        self.assertTrue(before.equals(after))
+
+    def test_compact_skips_locked_partition(self):
+        """Test that a partition another process is compacting is left alone."""
+        self.store.append(make_report(1), run_at=START + timedelta(hours=12))
+        directory = os.path.join(self.root, 'repositories', 'date=2026-01-01')
+        open(os.path.join(directory, COMPACT_LOCK), 'w').close()
+
+        self.assertEqual(self.store.compact('repositories', '2026-01-01'), 0)
+        self.assertEqual(len([name for name in os.listdir(directory) if name.endswith('.parquet')]), 2)
+
+        # A lock left by a dead process expires
+        stale = time.time() - STALE_LOCK_AGE - 1
+        os.utime(os.path.join(directory, COMPACT_LOCK), (stale, stale))
+        self.assertEqual(self.store.compact('repositories', '2026-01-01'), 2)
+        self.assertEqual(os.listdir(directory), ['20260101T000000000000-compacted.parquet'])
+
+    def test_empty_store(self):
+        """Test queries before any report is stored."""
+        store = SnapshotStore(os.path.join(self.root, 'empty'))
+        self.assertTrue(store.technology_history('python').empty)
+        self.assertTrue(store.rising_repositories().empty)
+
+    def test_unknown_table(self):
+        """Test that unknown tables are rejected."""
+        with self.assertRaises(ValueError):
+            self.store.scan('comments')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Startup-time benchmark for the web application.
+"""
+import unittest
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Boot budget for importing the app and serving the first page
+MAX_STARTUP_SECONDS = 1.0
+
+STARTUP_SCRIPT = """
+import socket
+import sys
+import time
+
+def unreachable(*args, **kwargs):
+    raise OSError("network is unreachable")
+
+# Any attempt to reach the network fails immediately
+socket.socket.connect = unreachable
+socket.socket.connect_ex = unreachable
+socket.create_connection = unreachable
+socket.getaddrinfo = unreachable
+
+start = time.perf_counter()
+import app
+response = app.app.test_client().get('/')
+elapsed = time.perf_counter() - start
+
+clients = [name for name in vars(app.data_processor) if name.endswith('_client')]
+print(response.status_code, elapsed, len(clients), 'matplotlib' in sys.modules)
+"""
+
+class TestStartup(unittest.TestCase):
+    """Tests that the web app boots quickly and without network I/O."""
+
+    def test_app_boots_without_network(self):
+        """Test importing the app and serving the first page with the network unreachable."""
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        status_code, elapsed, clients_created, matplotlib_loaded = result.stdout.split()[-4:]
+
+        self.assertEqual(status_code, "200")
+        self.assertEqual(clients_created, "0", "API clients should not be created at startup")
+        self.assertEqual(matplotlib_loaded, "False", "Chart rendering should not be loaded at startup")
+        self.assertLess(float(elapsed), MAX_STARTUP_SECONDS,
+                        f"App took {float(elapsed):.2f}s to boot (budget {MAX_STARTUP_SECONDS}s)")
+
+
+if __name__ == '__main__':
+    unittest.main()
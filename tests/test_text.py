@@ -0,0 +1,51 @@
+"""
+Unit tests for the text normalization helpers.
+"""
+import unittest
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.lexicon import Lexicon
+from utils.text import Document, TextPipeline, tokenize
+
+class TestTextPipeline(unittest.TestCase):
+    """Tests for Document and TextPipeline."""
+
+    def test_document(self):
+        """Test HTML decoding, lowercasing, punctuation stripping and parts."""
+        document = Document("How do I use &quot;async&quot; in Node.js &amp; TypeScript-ESLint?")
+        self.assertEqual(document.text, 'how do i use "async" in node.js & typescript-eslint?')
+        self.assertEqual(document.tokens, ('how', 'do', 'i', 'use', 'async', 'in', 'node.js', '&', 'typescript-eslint'))
+        self.assertEqual(document.parts[-2:], ('typescript', 'eslint'))
+        self.assertEqual(tokenize("(Hello), World!"), ['hello', 'world'])
+        self.assertEqual(tokenize("Moving to .NET... (.NET 8)"), ['moving', 'to', '.net', '.net', '8'])
+
+    def test_pipeline_caches_by_id(self):
+        """Test that a document is processed once per ID and text."""
+        pipeline = TextPipeline()
+        first = pipeline.document(('hackernews', 1, 'title'), "Rust 2.0")
+        self.assertIs(pipeline.document(('hackernews', 1, 'title'), "Rust 2.0"), first)
+
+        # Changed text is reprocessed
+        changed = pipeline.document(('hackernews', 1, 'title'), "Rust 2.1")
+        self.assertIsNot(changed, first)
+        self.assertEqual(changed.tokens, ('rust', '2.1'))
+        self.assertEqual(len(pipeline), 1)
+
+    def test_pipeline_eviction(self):
+        """Test that the least recently used documents are evicted."""
+        pipeline = TextPipeline(max_documents=2)
+        pipeline.document('a', "A")
+        pipeline.document('b', "B")
+        pipeline.document('a', "A")
+        pipeline.document('c', "C")
+        self.assertEqual(list(pipeline._documents), ['a', 'c'])
+
+    def test_consumers_accept_documents(self):
+        """Test that the lexicon matches processed documents like raw text."""
+        lexicon = Lexicon(['machine learning', 'c#'])
+        document = Document("Machine-Learning in C&#35;")
+        self.assertEqual(lexicon.find(document), ['machine learning', 'c#'])
+
+
+if __name__ == '__main__':
+    unittest.main()
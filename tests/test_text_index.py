@@ -0,0 +1,39 @@
+"""
+Unit tests for the document index.
+"""
+import unittest
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.text_index import DocumentIndex
+
+class TestDocumentIndex(unittest.TestCase):
+    """Tests for phrase lookups in the DocumentIndex class."""
+
+    def setUp(self):
+        """Index a few documents with one or two text fields."""
+        self.index = DocumentIndex()
+        self.index.add('a', "Rust 2.0 released: faster builds!", "Cargo gets async support")
+        self.index.add('b', "Why (Rust) async runtimes differ")
+        self.index.add('c', "Building a compiler", None)
+
+    def test_find_words_and_phrases(self):
+        """Test case-insensitive word and phrase matches, in insertion order."""
+        self.assertEqual(self.index.find("rust"), ['a', 'b'])
+        self.assertEqual(self.index.find("ASYNC"), ['a', 'b'])
+        self.assertEqual(self.index.find("async support"), ['a'])
+        self.assertEqual(self.index.find("rust async runtimes"), ['b'])
+
+    def test_no_partial_or_cross_field_matches(self):
+        """Test that phrases match whole, adjacent words within one field."""
+        self.assertEqual(self.index.find("build"), [])
+        self.assertEqual(self.index.find("runtimes async"), [])
+        self.assertEqual(self.index.find("builds cargo"), [])
+        self.assertEqual(self.index.find(""), [])
+
+    def test_len(self):
+        """Test the number of indexed documents."""
+        self.assertEqual(len(self.index), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Unit tests for the topic extraction module.
+"""
+import random
+import unittest
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.topics import (count_ngrams, count_ngrams_parallel, extract_topics, find_tech_terms,
+                                    get_process_pool, merge_counts, shutdown_process_pools)
+
+class TestTopicExtraction(unittest.TestCase):
+    """Tests for n-gram counting and topic ranking."""
+
+    def test_find_tech_terms_whole_words(self):
+        """Test that terms match whole words or aliases, not parts of words."""
+        found = find_tech_terms("golang and js on aws serverless, not google or java-like hardware")
+        self.assertEqual(found, {'go', 'javascript', 'aws', 'serverless', 'java'})
+        self.assertEqual(find_tech_terms("javascript hardware"), {'javascript'})
+        self.assertNotIn('python', found)
+
+    def test_count_ngrams(self):
+        """Test word, bigram and trigram counts, including tech term weights."""
+        words, bigrams, trigrams = count_ngrams(["Deploying Serverless functions!", "The serverless world"])
+
+        # Listed twice in the tech terms, so weighted twice per text
+        self.assertEqual(words['serverless'], 2 + 2 * 2 * 3)
+        self.assertEqual(words['deploying'], 1)
+        self.assertNotIn('the', words)
+        self.assertEqual(bigrams['deploying serverless'], 1)
+        self.assertEqual(trigrams['deploying serverless functions'], 1)
+
+    def test_extract_topics_prefers_longer_phrases(self):
+        """Test that words and bigrams covered by frequent longer phrases are skipped."""
+        texts = ["Lunch menu tonight plans"] * 5 + ["Menu basics"]
+        topics = extract_topics(texts)
+
+        self.assertEqual(topics[0], 'lunch menu tonight')
+        self.assertNotIn('menu', topics)
+        self.assertNotIn('lunch menu', topics)
+
+    def test_merge_counts_keeps_serial_order(self):
+        """Test that merged shard counts equal, and are ordered like, serial counts."""
+        texts = ["Rust compiler speed", "Python packaging tools", "Rust packaging tools", "Compiler tools"]
+        serial = count_ngrams(texts)
+        merged = merge_counts([count_ngrams(texts[i:i + 1]) for i in range(len(texts))])
+
+        for serial_counts, merged_counts in zip(serial, merged):
+            self.assertEqual(list(serial_counts.items()), list(merged_counts.items()))
+
+    def test_parallel_extraction_matches_serial(self):
+        """Test that the multi-process mode returns exactly the serial topics."""
+        rng = random.Random(0)
+        vocabulary = ['rust', 'python', 'compiler', 'release', 'kubernetes', 'cluster', 'performance',
+                      'golang', 'guide', 'database', 'migration', 'async', 'runtime', 'the', 'for']
+        texts = [' '.join(rng.choices(vocabulary, k=rng.randint(3, 9))) for _ in range(400)]
+
+        self.assertEqual(extract_topics(texts, processes=2, min_parallel_texts=0), extract_topics(texts))
+
+    def test_process_pool_is_reused(self):
+        """Test that parallel counts share one spawned pool per process count."""
+        self.addCleanup(shutdown_process_pools)
+        pool = get_process_pool(2)
+
+        self.assertIs(get_process_pool(2), pool)
+        self.assertEqual(pool._mp_context.get_start_method(), 'spawn')
+        count_ngrams_parallel(["Rust compiler speed", "Python packaging tools"], processes=2)
+        self.assertIs(get_process_pool(2), pool)
+
+    def test_extract_topics_empty(self):
+        """Test extraction without any texts."""
+        self.assertEqual(extract_topics([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
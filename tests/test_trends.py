@@ -0,0 +1,169 @@
+"""
+Unit tests for the rolling topic stream.
+"""
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing import trends
+from data_processing.trends import DAY, HOUR, TopicStream, update_topic_stream
+from utils.cache import clear_cache, clear_expired_cache
+from utils.state import BucketStore
+
+# A fixed start time, at midnight UTC
+START = 20000 * DAY
+
+def steady_documents(day, count=20):
+    """Documents about the same topics every day."""
+    return [((day, i), f"Python packaging tips part {i}") for i in range(count)]
+
+class TestTopicStream(unittest.TestCase):
+    """Tests for rolling counts and burst scoring."""
+
+    def test_documents_counted_once(self):
+        """Test that documents seen before are skipped."""
+        stream = TopicStream()
+        documents = [('a', "Rust compiler release"), ('b', "Rust compiler bugs")]
+
+        self.assertEqual(stream.ingest(documents, now=START), 2)
+        self.assertEqual(stream.ingest(documents, now=START + HOUR), 0)
+        self.assertEqual(stream.score('rust compiler')[0], 2)
+
+    def test_buckets_expire(self):
+        """Test that old documents leave the recent window, then the history."""
+        stream = TopicStream(recent_hours=24, history_days=3)
+        stream.ingest([('a', "Rust compiler release")], now=START)
+        stream.ingest([('b', "Go generics")], now=START + 25 * HOUR)
+
+        self.assertEqual(stream.recent_documents, 1)
+        self.assertEqual(len(stream), 2)
+        self.assertEqual(stream.score('rust')[0], 0)
+
+        # Past the history the document is forgotten and counted again if seen
+        stream.ingest([], now=START + 3 * DAY)
+        self.assertEqual(len(stream), 1)
+        self.assertEqual(stream.ingest([('a', "Rust compiler release")], now=START + 3 * DAY), 1)
+
+    def test_rising_topics_beat_frequent_ones(self):
+        """Test that topics are ranked by how much they rise over the baseline."""
+        stream = TopicStream(recent_hours=24, history_days=10)
+        for day in range(7):
+            stream.ingest(steady_documents(day), now=START + day * DAY)
+
+        # Today: the usual topics, and a new one in fewer documents
+        today = steady_documents(7)
+        today += [(('new', i), f"Rust compiler speedups {i}") for i in range(5)]
+        stream.ingest(today, now=START + 7 * DAY)
+
+        topics = [topic['topic'] for topic in stream.trending()]
+        self.assertEqual(topics[0], 'rust compiler speedups')
+        self.assertNotIn('python packaging tips', topics)
+
+        # Covered by the trigram in every document
+        self.assertNotIn('rust', topics)
+        self.assertNotIn('rust compiler', topics)
+
+    def test_cold_start_ranks_by_count(self):
+        """Test that without a baseline topics are ranked by recent count."""
+        stream = TopicStream()
+        stream.ingest([(i, text) for i, text in enumerate(
+            ["Kubernetes operators", "Kubernetes operators", "Kubernetes operators", "Serverless costs", "Serverless costs"])],
+            now=START)
+
+        self.assertEqual([topic['topic'] for topic in stream.trending()], ['kubernetes operators', 'serverless costs'])
+
+    def test_past_days_keep_frequent_phrases(self):
+        """Test that a past day's bucket is trimmed to its most frequent phrases."""
+        stream = TopicStream(recent_hours=24, history_days=10, max_daily_phrases=3)
+        stream.ingest([('a', "Rust compiler"), ('b', "Rust compiler"), ('c', "Kotlin")], now=START)
+        self.assertEqual(stream.score('kotlin')[0], 1)
+
+        # The next day the first day keeps 'rust', 'compiler' and 'rust compiler'
+        stream.ingest([('d', "Kotlin")], now=START + DAY + 2 * HOUR)
+        self.assertEqual(len(stream._daily[START // DAY].counts), 3)
+        self.assertEqual(stream._history.counts['kotlin'], 1)
+        self.assertEqual(stream._history.counts['rust compiler'], 2)
+
+    def test_invalid_windows(self):
+        """Test that the history must be longer than the recent window."""
+        with self.assertRaises(ValueError):
+            TopicStream(recent_hours=48, history_days=2)
+
+class TestPersistedTopicStream(unittest.TestCase):
+    """Tests for streams persisted in the state store."""
+
+    KEY = 'tests:topic_stream'
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.addCleanup(trends._streams.clear)
+
+    def update(self, documents, now, **settings):
+        return update_topic_stream(self.KEY, documents, now=now, root=self.root, **settings)
+
+    def test_updates_are_persisted(self):
+        """Test that each update continues from the stored stream, also in a new process."""
+        self.update([('a', "Rust compiler release")], now=START)
+        stream = self.update([('a', "Rust compiler release"), ('b', "Rust compiler bugs")], now=START + HOUR)
+
+        self.assertEqual(len(stream), 2)
+        self.assertEqual(stream.score('rust compiler')[0], 2)
+
+        # A process starting later loads the stream from its buckets
+        trends._streams.clear()
+        stream = self.update([('b', "Rust compiler bugs"), ('c', "Go generics")], now=START + 2 * HOUR)
+        self.assertEqual(len(stream), 3)
+        self.assertEqual(stream.recent_documents, 3)
+        self.assertEqual(stream.score('rust compiler')[0], 2)
+
+    def test_updates_write_only_changed_buckets(self):
+        """Test that a refresh without new documents writes nothing."""
+        for day in range(5):
+            self.update(steady_documents(day), now=START + day * DAY)
+
+        with patch.object(BucketStore, 'save') as save, patch.object(BucketStore, 'delete') as delete:
+            self.update(steady_documents(4), now=START + 4 * DAY + HOUR)
+        save.assert_not_called()
+        delete.assert_not_called()
+
+        # New documents rewrite the current hour and day only
+        with patch.object(BucketStore, 'save') as save:
+            self.update([('new', "Rust compiler release")], now=START + 4 * DAY + HOUR)
+        self.assertEqual(sorted(call.args[0] for call in save.call_args_list),
+                         [f"day-{START // DAY + 4}", f"hour-{(START + 4 * DAY) // HOUR + 1}"])
+
+    def test_history_survives_cache_clearing(self):
+        """Test that clearing the cache, even next to the state, keeps the stream."""
+        self.update([('a', "Rust compiler release")], now=START)
+        with patch('utils.cache.CACHE_DIR', self.root):
+            clear_cache()
+            clear_expired_cache(max_age=0)
+        trends._streams.clear()
+
+        self.assertEqual(len(self.update([], now=START + HOUR)), 1)
+
+    def test_expired_buckets_are_removed(self):
+        """Test that buckets leaving the history are deleted from the store."""
+        self.update([('a', "Rust compiler release")], now=START, recent_hours=24, history_days=2)
+        self.update([('b', "Go generics")], now=START + 2 * DAY, recent_hours=24, history_days=2)
+
+        directory = BucketStore(self.KEY, self.root).directory
+        self.assertEqual(sorted(name for name in os.listdir(directory) if name.endswith('.bucket')),
+                         [f"day-{START // DAY + 2}.bucket", f"hour-{(START + 2 * DAY) // HOUR}.bucket"])
+
+    def test_settings_change_starts_over(self):
+        """Test that a stream stored with other settings is replaced."""
+        self.update([('a', "Rust compiler release")], now=START)
+        stream = self.update([('b', "Go generics")], now=START, recent_hours=12)
+
+        self.assertEqual(len(stream), 1)
+        self.assertEqual(stream.recent_hours, 12)
+
+        trends._streams.clear()
+        self.assertEqual(len(self.update([], now=START, recent_hours=12)), 1)
+
+if __name__ == '__main__':
+    unittest.main()
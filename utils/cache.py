@@ -13,6 +13,18 @@ logger = logging.getLogger(__name__)
 CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache')
 os.makedirs(CACHE_DIR, exist_ok=True)
 
+def set_cache_dir(path):
+    """
+    Keep cached values in another directory from now on (e.g. a scratch
+    directory for replayed runs).
+    
+    Args:
+        path (str): Cache directory, created if missing
+    """
+    global CACHE_DIR
+    os.makedirs(path, exist_ok=True)
+    CACHE_DIR = path
+
 def cache_response(expires=3600):
 
     def decorator(func):
@@ -74,6 +86,68 @@ def cache_response(expires=3600):
         return wrapper
     return decorator
 
+def _value_path(key):
+    """Path of the cache file backing an explicitly keyed value."""
+    return os.path.join(CACHE_DIR, f"{hashlib.md5(key.encode()).hexdigest()}.cache")
+
+def get_cached_value(key, max_age=None):
+    """
+    Read a value stored with ``set_cached_value``.
+    
+    Unlike ``cache_response`` keys, explicit keys are the same in every
+    process, so values stored this way are shared between workers.
+    
+    Args:
+        key (str): Cache key
+        max_age (float, optional): Ignore the value if it is older than this many seconds
+        
+    Returns:
+        The cached value, or None if it is missing, expired or unreadable
+    """
+    cache_path = _value_path(key)
+    if not os.path.exists(cache_path):
+        return None
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            cache_time, value = pickle.load(f)
+    except Exception as e:
+        logger.error(f"Error reading cache value {key}: {e}")
+        return None
+    
+    if max_age is not None and time.time() - cache_time >= max_age:
+        return None
+    return value
+
+def set_cached_value(key, value):
+    """
+    Store a value under an explicit key (see ``get_cached_value``).
+    
+    The file is written to a temporary path and renamed into place, so
+    concurrent readers never see a partially written value.
+    
+    Args:
+        key (str): Cache key
+        value: Picklable value
+    """
+    cache_path = _value_path(key)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((time.time(), value), f)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.error(f"Error writing cache value {key}: {e}")
+
+def delete_cached_value(key):
+    """Remove a value stored with ``set_cached_value`` if it exists."""
+    try:
+        os.remove(_value_path(key))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Error deleting cache value {key}: {e}")
+
 def clear_cache():
    
     try:
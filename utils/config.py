@@ -24,6 +24,55 @@ class Config:
             "news": 500,           # Depends on API key tier
             "reddit": 60,          # 60 requests per minute
             "pytrends": 1200       # Google can be restrictive, go slow
+        },
+        "stackoverflow_bulk": {
+            "enabled": True,       # Fetch top questions once and partition by tag
+            "pages": 5             # Number of 100-question pages per bulk pull
+        },
+        "report": {
+            "max_workers": 4       # Report stages computed in parallel
+        },
+        "popularity": {
+            "weights": {"github": 0.4, "stackoverflow": 0.4, "pytrends": 0.2},
+            "normalization": "max" # max, rank, log or zscore (or a dict by platform)
+        },
+        "correlations": {
+            "metric": "jaccard",   # jaccard, pmi, npmi or cosine
+            "accumulate": True,    # Correlate over a persisted rolling window of documents
+            "state_key": "correlations:cooccurrence",  # Name of the counts in the state store (state/)
+            "history_days": 30     # Days each repository or question is counted for
+        },
+        "clustering": {
+            "threshold": 0.3,      # Minimum correlation linking two technologies
+            "mode": "components"   # components or label_propagation
+        },
+        "topics": {
+            "processes": 0,        # Worker processes for topic extraction (0 = serial)
+            "min_parallel_texts": 5000,  # Smallest corpus counted in parallel
+            "counting": "auto",    # exact, approximate, or auto (approximate above a size)
+            "capacity": 20000,     # N-grams of each kind kept when approximating
+            "approximate_above": 50000  # Corpus size above which auto approximates
+        },
+        "trends": {
+            "enabled": True,       # Rank topics by burstiness in a persisted rolling window
+            "state_key": "trends:topic_stream",  # Name of the stream in the state store (state/)
+            "recent_hours": 24,    # Length of the recent window
+            "history_days": 30,    # Days of history forming the baseline
+            "smoothing": 1.0,      # Smallest expected count of a topic
+            "max_daily_phrases": 20000,  # Phrases kept for each past day
+            "min_count": 2         # Fewest recent documents a topic must appear in
+        },
+        "snapshots": {
+            "enabled": True,       # Store every insights report for historical queries
+            "path": None           # Directory of the store (defaults to snapshots/)
+        },
+        "charts": {
+            "cache": True          # Reuse charts drawn from identical data and parameters
+        },
+        "http": {
+            "mode": "live",        # live, record (archive every response) or replay (archive only)
+            "snapshot": "latest",  # Archived day replayed, YYYY-MM-DD or latest
+            "archive_path": None   # Directory of the response archive (defaults to archive/)
         }
     }
     
@@ -0,0 +1,376 @@
+"""
+Upstream HTTP access with recording to, and offline replay from, an archive
+of raw responses.
+
+In 'live' mode (the default) requests go to the network. In 'record' mode
+every GET response is also appended to a gzipped JSON lines archive,
+partitioned by day under ``archive/date=YYYY-MM-DD/``. In 'replay' mode
+responses are served from one day of the archive and nothing is sent
+upstream: a request missing from the archive raises ReplayMissError, a
+RequestException the clients already handle like a network failure.
+
+Request headers and POST requests (Reddit's token requests, which carry
+credentials) are never archived, nor are response headers other than the
+pagination ``Link`` header, and secret query parameters such as API
+keys are left out of the archive. Dates in query parameters (e.g. GitHub's
+``created:>2024-01-01`` or Stack Exchange's ``fromdate`` timestamps) are
+ignored when matching, so an archive recorded yesterday replays today.
+"""
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+from utils.cache import set_cache_dir
+from utils.config import config
+from utils.state import set_state_dir
+
+logger = logging.getLogger(__name__)
+
+# Default location of the archive
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'archive')
+
+MODES = ('live', 'record', 'replay')
+
+# Query parameters never written to the archive or used to match requests
+SECRET_PARAMS = frozenset(['apikey', 'api_key', 'key', 'access_token', 'client_secret', 'token'])
+
+# Response headers kept in the archive (GitHub pages through Link headers)
+ARCHIVED_HEADERS = ('Link',)
+
+# Dates (with an optional time) in query parameters
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}(T[\d:.]+Z?)?')
+
+# Query parameters holding dates as Unix timestamps (Stack Exchange)
+EPOCH_PARAMS = frozenset(['fromdate', 'todate'])
+
+class ReplayMissError(requests.exceptions.ConnectionError):
+    """A request has no response in the replayed archive."""
+
+def request_key(method, url, params=None):
+    """
+    Key matching a request to its archived response.
+
+    The key is the method, the URL path (the host is left out, so Reddit's
+    public and OAuth hosts match) and the sorted query parameters, from the
+    URL's own query string (e.g. a Link ``next`` URL) and ``params``, without
+    secrets, with dates (and timestamps in EPOCH_PARAMS) replaced by a
+    placeholder.
+
+    Args:
+        method (str): HTTP method, or 'CALL' for archived function results
+        url (str): Request URL
+        params (dict, optional): Query parameters
+
+    Returns:
+        str: Request key
+    """
+    parts = urlsplit(url)
+    merged = dict(parse_qsl(parts.query, keep_blank_values=True))
+    merged.update(params or {})
+    query = sorted((name, _normalize_param(name, value))
+                   for name, value in merged.items()
+                   if value is not None and name.lower() not in SECRET_PARAMS)
+    path = parts.path if parts.scheme else url
+    return f"{method} {path}?{urlencode(query)}" if query else f"{method} {path}"
+
+def _normalize_param(name, value):
+    """Query parameter value with dates replaced by a placeholder."""
+    value = str(value)
+    if name.lower() in EPOCH_PARAMS and value.isdigit():
+        return '<date>'
+    return DATE_PATTERN.sub('<date>', value)
+
+class ResponseArchive:
+    """
+    Date-partitioned archive of raw upstream responses.
+
+    Each process appends to its own gzipped JSON lines file in the
+    partition of the current day; every record is a separate gzip member,
+    so a file stays readable if the process stops mid-run.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR):
+        """
+        Args:
+            root (str): Directory holding one subdirectory per day
+        """
+        self.root = root
+        self._lock = threading.Lock()
+
+    def snapshots(self):
+        """
+        List the days with archived responses.
+
+        Returns:
+            list: Dates as YYYY-MM-DD, oldest first
+        """
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[len('date='):] for name in os.listdir(self.root) if name.startswith('date='))
+
+    def record(self, method, url, params=None, status=200, body='', headers=None, recorded_at=None):
+        """
+        Append a response to today's partition.
+
+        Args:
+            method (str): HTTP method, or 'CALL' for archived function results
+            url (str): Request URL
+            params (dict, optional): Query parameters (secrets are dropped)
+            status (int): HTTP status code
+            body (str): Response body
+            headers (dict, optional): Response headers to keep
+            recorded_at (float, optional): Unix timestamp (defaults to now)
+        """
+        recorded_at = time.time() if recorded_at is None else recorded_at
+        entry = {
+            'key': request_key(method, url, params),
+            'method': method,
+            'url': url,
+            'params': {name: value for name, value in (params or {}).items()
+                       if name.lower() not in SECRET_PARAMS},
+            'status': status,
+            'body': body,
+            'headers': headers or {},
+            'recorded_at': recorded_at
+        }
+
+        day = datetime.fromtimestamp(recorded_at, timezone.utc).date().isoformat()
+        directory = os.path.join(self.root, f"date={day}")
+        line = json.dumps(entry, default=str) + '\n'
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            with gzip.open(os.path.join(directory, f"responses-{os.getpid()}.jsonl.gz"), 'at', encoding='utf-8') as f:
+                f.write(line)
+
+    def load(self, snapshot='latest'):
+        """
+        Read the responses archived on one day.
+
+        Args:
+            snapshot (str): Date as YYYY-MM-DD, or 'latest'
+
+        Returns:
+            dict: Archived entries by request key; the last response recorded
+                  for a request wins
+
+        Raises:
+            ValueError: If the archive has no such day
+        """
+        snapshots = self.snapshots()
+        if snapshot == 'latest':
+            if not snapshots:
+                raise ValueError(f"No archived responses in {self.root}")
+            snapshot = snapshots[-1]
+        elif snapshot not in snapshots:
+            raise ValueError(f"No archived responses for {snapshot} in {self.root}")
+
+        directory = os.path.join(self.root, f"date={snapshot}")
+        entries = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith('.jsonl.gz'):
+                continue
+            try:
+                with gzip.open(os.path.join(directory, name), 'rt', encoding='utf-8') as f:
+                    for line in f:
+                        entries.append(json.loads(line))
+            except (EOFError, OSError, ValueError) as e:
+                # A file cut short keeps the records before the damage
+                logger.warning(f"Archive file {name} is truncated: {e}")
+
+        entries.sort(key=lambda entry: entry['recorded_at'])
+        return {entry['key']: entry for entry in entries}
+
+class _State:
+    """Mode of the module, set by ``configure``."""
+
+    def __init__(self):
+        self.mode = None
+        self.archive = None
+        self.snapshot = None
+        self.responses = {}
+        self.lock = threading.Lock()
+
+_state = _State()
+
+def configure(mode=None, snapshot=None, archive_dir=None):
+    """
+    Set how upstream requests are made.
+
+    Replay also moves the cache and the state store to fresh temporary
+    directories, so cached client results and persisted state from live
+    runs are neither used nor modified, and every replay starts from the
+    archive alone. Record moves the cache to a fresh temporary directory
+    too, so no client result is served from a cache warmed before
+    recording started, and every request of the run reaches the archive.
+
+    Args:
+        mode (str, optional): One of MODES (defaults to the 'http.mode' setting)
+        snapshot (str, optional): Day to replay, YYYY-MM-DD or 'latest'
+            (defaults to the 'http.snapshot' setting)
+        archive_dir (str, optional): Archive location (defaults to the
+            'http.archive_path' setting, or archive/)
+
+    Raises:
+        ValueError: If the mode is unknown, or the snapshot isn't archived
+    """
+    mode = mode or config.get('http.mode', 'live')
+    if mode not in MODES:
+        raise ValueError(f"Unknown HTTP mode '{mode}'; expected one of {', '.join(MODES)}")
+
+    archive = ResponseArchive(archive_dir or config.get('http.archive_path') or ARCHIVE_DIR)
+    responses = {}
+    if mode == 'replay':
+        snapshot = snapshot or config.get('http.snapshot', 'latest')
+        responses = archive.load(snapshot)
+        set_cache_dir(tempfile.mkdtemp(prefix='replay-cache-'))
+        set_state_dir(tempfile.mkdtemp(prefix='replay-state-'))
+        logger.info(f"Replaying {len(responses)} archived responses from {snapshot}")
+    elif mode == 'record':
+        set_cache_dir(tempfile.mkdtemp(prefix='record-cache-'))
+
+    with _state.lock:
+        _state.mode, _state.archive, _state.snapshot, _state.responses = mode, archive, snapshot, responses
+
+def _current():
+    """Return the module state, configured from the settings on first use."""
+    if _state.mode is None:
+        configure()
+    return _state
+
+def mode():
+    """Return the current mode."""
+    return _current().mode
+
+def replaying():
+    """Return whether responses are served from the archive."""
+    return mode() == 'replay'
+
+def base_url(name, default):
+    """
+    Base URL of an upstream API, overridable from the environment to point
+    the clients at another server, such as the mock upstream used by load
+    tests (benchmarks/mock_upstream.py).
+
+    ``<NAME>_BASE_URL`` (e.g. ``GITHUB_BASE_URL``) overrides one upstream;
+    ``UPSTREAM_BASE_URL`` serves every upstream from ``<UPSTREAM_BASE_URL>/<name>``.
+
+    Args:
+        name (str): Upstream name: github, stackexchange, hackernews,
+            reddit, newsapi or trends
+        default (str): URL used without an override
+
+    Returns:
+        str: Base URL, without a trailing slash
+    """
+    override = os.getenv(f"{name.upper()}_BASE_URL")
+    if override:
+        return override.rstrip('/')
+
+    upstream = os.getenv("UPSTREAM_BASE_URL")
+    if upstream:
+        return f"{upstream.rstrip('/')}/{name}"
+    return default
+
+def _replayed_response(entry):
+    """Rebuild a requests.Response from an archived entry."""
+    response = requests.Response()
+    response.status_code = entry['status']
+    response._content = entry['body'].encode('utf-8')
+    response.encoding = 'utf-8'
+    response.url = entry['url']
+    response.headers.update(entry.get('headers', {}))
+    response.headers['Content-Type'] = 'application/json'
+    return response
+
+def get(url, params=None, **kwargs):
+    """
+    Send a GET request (see ``requests.get``), or replay its archived response.
+
+    Args:
+        url (str): Request URL
+        params (dict, optional): Query parameters
+        **kwargs: Other ``requests.get`` arguments (headers, timeout, ...)
+
+    Returns:
+        requests.Response: The response
+
+    Raises:
+        requests.exceptions.RequestException: On network errors, or
+            ReplayMissError when replaying a request that wasn't archived
+    """
+    state = _current()
+    if state.mode == 'replay':
+        entry = state.responses.get(request_key('GET', url, params))
+        if entry is None:
+            raise ReplayMissError(f"No archived response for GET {url} in {state.snapshot}")
+        return _replayed_response(entry)
+
+    response = requests.get(url, params=params, **kwargs)
+    if state.mode == 'record':
+        try:
+            headers = {name: response.headers[name] for name in ARCHIVED_HEADERS if name in response.headers}
+            state.archive.record('GET', url, params, status=response.status_code, body=response.text,
+                                 headers=headers)
+        except Exception as e:
+            logger.error(f"Error archiving response of {url}: {e}")
+    return response
+
+def post(url, **kwargs):
+    """
+    Send a POST request (see ``requests.post``). POST requests are not
+    archived, and fail with ReplayMissError when replaying.
+
+    Args:
+        url (str): Request URL
+        **kwargs: ``requests.post`` arguments
+
+    Returns:
+        requests.Response: The response
+    """
+    if replaying():
+        raise ReplayMissError(f"POST {url} is not sent while replaying")
+    return requests.post(url, **kwargs)
+
+def archived(source, key, fetch, encode=None, decode=None):
+    """
+    Record or replay the result of an upstream call made by a library
+    rather than through this module (e.g. pytrends).
+
+    Args:
+        source (str): Name of the upstream, e.g. 'pytrends'
+        key (str): Identifies the call's arguments
+        fetch (callable): Makes the call and returns its result
+        encode (callable, optional): Converts the result to a string
+            (JSON by default)
+        decode (callable, optional): Converts the string back (JSON by default)
+
+    Returns:
+        The result of ``fetch()``, or the archived result when replaying
+
+    Raises:
+        ReplayMissError: When replaying a call that wasn't archived
+    """
+    state = _current()
+    url = f"{source}:{key}"
+    if state.mode == 'replay':
+        entry = state.responses.get(request_key('CALL', url))
+        if entry is None:
+            raise ReplayMissError(f"No archived result for {url} in {state.snapshot}")
+        return (decode or json.loads)(entry['body'])
+
+    result = fetch()
+    if state.mode == 'record':
+        try:
+            state.archive.record('CALL', url, body=(encode or json.dumps)(result))
+        except Exception as e:
+            logger.error(f"Error archiving result of {url}: {e}")
+    return result
@@ -0,0 +1,30 @@
+"""
+Helpers for deferring expensive object construction until first use.
+"""
+import threading
+
+class LazyAttribute:
+    """
+    Class attribute whose value is built by ``factory()`` on first access.
+
+    The value is stored on the instance, so later lookups are plain attribute
+    reads and assigning the attribute (e.g. a mock in tests) replaces it.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.lock = threading.Lock()
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        with self.lock:
+            # Another thread may have built the value while we waited
+            if self.name not in instance.__dict__:
+                instance.__dict__[self.name] = self.factory()
+        return instance.__dict__[self.name]
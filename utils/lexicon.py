@@ -0,0 +1,173 @@
+"""
+Technology lexicon: finds known terms and their aliases in text in one pass.
+"""
+from collections import deque
+
+from utils.text import Document, split_parts, tokenize
+
+# Alternative spellings of technologies, by canonical name
+TECHNOLOGY_ALIASES = {
+    'javascript': ['js', 'ecmascript'],
+    'typescript': ['ts'],
+    'go': ['golang'],
+    'node.js': ['node', 'nodejs'],
+    'python': ['python3'],
+    'c++': ['cpp'],
+    'c#': ['csharp', 'c sharp'],
+    '.net': ['dotnet'],
+    'react': ['reactjs', 'react.js'],
+    'vue': ['vuejs', 'vue.js'],
+    'angular': ['angularjs'],
+    'next.js': ['nextjs'],
+    'rust': ['rustlang'],
+    'kubernetes': ['k8s'],
+    'postgresql': ['postgres'],
+    'aws': ['amazon web services'],
+    'google cloud': ['gcp', 'google cloud platform'],
+    'machine learning': ['ml'],
+    'cicd': ['ci/cd', 'ci cd'],
+    'ruby on rails': ['rails']
+}
+
+def lexicon_tokenize(text):
+    """
+    Split a text, or take a processed Document's parts, into the tokens
+    lexicon phrases are matched on.
+
+    Args:
+        text (str or Document): Text to tokenize
+
+    Returns:
+        sequence: Lowercased tokens, also split on dashes, slashes and underscores
+    """
+    if isinstance(text, Document):
+        return text.parts
+    return split_parts(tokenize(text))
+
+class Lexicon:
+    """
+    Set of terms matched on whole tokens, each with a canonical name.
+
+    Phrases are compiled into an Aho-Corasick automaton over tokens, so a
+    text is scanned once however many terms there are, and a term only
+    matches whole words ("go" does not match "google").
+    """
+
+    def __init__(self, terms=(), aliases=None):
+        """
+        Args:
+            terms (iterable): Canonical names to look for
+            aliases (dict, optional): Alternative phrases by canonical name
+                (TECHNOLOGY_ALIASES by default). Aliases of names that aren't
+                terms are ignored, and a term always takes precedence over
+                an alias with the same phrase.
+        """
+        self._goto = [{}]
+        self._terminal = [None]
+        self._fail = None
+        self._output = None
+
+        terms = list(terms)
+        aliases = TECHNOLOGY_ALIASES if aliases is None else aliases
+        for term in terms:
+            self.add(term)
+        for term in terms:
+            for alias in aliases.get(term.lower(), ()):
+                self.add(term, alias)
+
+    def add(self, canonical, phrase=None):
+        """
+        Add a phrase for a term, unless the phrase is already known.
+
+        Args:
+            canonical (str): Name reported when the phrase is found
+            phrase (str, optional): Phrase to look for (the canonical name by default)
+
+        Returns:
+            bool: Whether the phrase was added
+        """
+        tokens = lexicon_tokenize(canonical if phrase is None else phrase)
+        if not tokens:
+            return False
+
+        node = 0
+        for token in tokens:
+            if token not in self._goto[node]:
+                self._goto.append({})
+                self._terminal.append(None)
+                self._goto[node][token] = len(self._goto) - 1
+            node = self._goto[node][token]
+
+        if self._terminal[node] is not None:
+            return False
+
+        self._terminal[node] = (canonical, len(tokens))
+        self._fail = self._output = None
+        return True
+
+    def _compile(self):
+        """Compute failure links breadth-first and the phrases ending at each node."""
+        # Built aside and published at the end, so concurrent readers never
+        # see a partially compiled automaton
+        fail = [0] * len(self._goto)
+        output = [[terminal] if terminal else [] for terminal in self._terminal]
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                state = fail[node]
+                while state and token not in self._goto[state]:
+                    state = fail[state]
+                fail[child] = self._goto[state].get(token, 0)
+                output[child] = output[child] + output[fail[child]]
+                queue.append(child)
+
+        self._fail = fail
+        self._output = output
+
+    def finditer(self, text):
+        """
+        Find every occurrence of every phrase, including overlapping ones.
+
+        Args:
+            text (str or Document): Text to search
+
+        Yields:
+            tuple: Canonical name, and start and end token positions
+        """
+        if self._output is None:
+            self._compile()
+        goto, fail, output = self._goto, self._fail, self._output
+
+        node = 0
+        for position, token in enumerate(lexicon_tokenize(text)):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            for canonical, length in output[node]:
+                yield canonical, position - length + 1, position + 1
+
+    def find(self, text):
+        """
+        Find the terms mentioned in a text.
+
+        Args:
+            text (str or Document): Text to search
+
+        Returns:
+            list: Canonical names found, in order of first occurrence
+        """
+        return list(dict.fromkeys(canonical for canonical, _, _ in self.finditer(text)))
+
+    def matches(self, text):
+        """
+        Check whether a text mentions any term.
+
+        Args:
+            text (str or Document): Text to search
+
+        Returns:
+            bool: Whether some term was found
+        """
+        return next(self.finditer(text), None) is not None
@@ -0,0 +1,55 @@
+"""
+Helpers for streaming records out of paginated upstream listings.
+"""
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+def paginate(fetch_page, cursor=None, sample_size=None, deadline=None):
+    """
+    Lazily yield records from a paginated listing.
+
+    While the records of one page are being consumed, the next page is
+    already being fetched on a background thread. Iteration stops at the
+    last page, once ``sample_size`` records have been yielded, or once
+    ``deadline`` seconds have passed (no new page is requested after that).
+
+    Args:
+        fetch_page (callable): Called with a cursor; returns a tuple of
+            (records, next_cursor) where next_cursor is None on the last page
+        cursor: Cursor for the first page
+        sample_size (int, optional): Maximum number of records to yield
+        deadline (float, optional): Time budget in seconds
+
+    Yields:
+        Records from each page, in order
+    """
+    started = time.monotonic()
+    yielded = 0
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(fetch_page, cursor)
+    try:
+        while future is not None:
+            records, next_cursor = future.result()
+            future = None
+
+            # Prefetch the next page while the caller consumes this one
+            out_of_time = deadline is not None and time.monotonic() - started >= deadline
+            needs_more = sample_size is None or yielded + len(records) < sample_size
+            if next_cursor is not None and needs_more and not out_of_time:
+                future = executor.submit(fetch_page, next_cursor)
+            elif out_of_time:
+                logger.debug(f"Pagination deadline of {deadline}s reached after {yielded + len(records)} records")
+
+            for record in records:
+                if sample_size is not None and yielded >= sample_size:
+                    return
+                yield record
+                yielded += 1
+    finally:
+        if future is not None:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,128 @@
+"""
+Persistent state of long-running rolling counters, kept apart from the cache.
+
+A counter's state is a set of named buckets (e.g. one per day) stored as
+separate files under ``<root>/<key>/``, so saving after an update only
+rewrites the buckets it changed. Unlike cache entries, state files never
+expire and are not removed by clearing the cache.
+"""
+import json
+import logging
+import os
+import pickle
+import re
+
+logger = logging.getLogger(__name__)
+
+# Default location of persisted state
+STATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'state')
+
+BUCKET_SUFFIX = '.bucket'
+SETTINGS_FILE = 'settings.json'
+
+def set_state_dir(path):
+    """
+    Keep state in another directory from now on (e.g. a scratch directory
+    for replayed runs).
+
+    Args:
+        path (str): State directory, created if missing
+    """
+    global STATE_DIR
+    os.makedirs(path, exist_ok=True)
+    STATE_DIR = path
+
+class BucketStore:
+    """
+    Buckets of one rolling counter, each in its own file, with the settings
+    the counter was created with.
+    """
+
+    def __init__(self, key, root=None):
+        """
+        Args:
+            key (str): Name of the counter, e.g. 'trends:topic_stream'
+            root (str, optional): State directory (STATE_DIR by default)
+        """
+        self.key = key
+        self.directory = os.path.join(root or STATE_DIR, re.sub(r'[^\w.-]+', '_', key))
+
+    def load(self, settings):
+        """
+        Read the stored buckets of a counter created with some settings.
+
+        Buckets stored with other settings are discarded.
+
+        Args:
+            settings (dict): JSON-serializable parameters of the counter
+
+        Returns:
+            dict: Bucket values by name
+        """
+        if self._read_settings() != settings:
+            if os.path.isdir(self.directory):
+                logger.info(f"Discarding the state of {self.key} stored with other settings")
+            self.reset(settings)
+            return {}
+
+        buckets = {}
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.endswith(BUCKET_SUFFIX):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), 'rb') as f:
+                    buckets[filename[:-len(BUCKET_SUFFIX)]] = pickle.load(f)
+            except Exception as e:
+                logger.error(f"Error reading state bucket {filename} of {self.key}: {e}")
+        return buckets
+
+    def save(self, name, value):
+        """
+        Store a bucket, written to a temporary path and renamed into place.
+
+        Args:
+            name (str): Bucket name
+            value: Picklable value
+        """
+        path = os.path.join(self.directory, f"{name}{BUCKET_SUFFIX}")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Error writing state bucket {name} of {self.key}: {e}")
+
+    def delete(self, name):
+        """Remove a bucket if it exists."""
+        try:
+            os.remove(os.path.join(self.directory, f"{name}{BUCKET_SUFFIX}"))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error deleting state bucket {name} of {self.key}: {e}")
+
+    def reset(self, settings):
+        """
+        Remove every bucket and record new settings.
+
+        Args:
+            settings (dict): JSON-serializable parameters of the counter
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        for filename in os.listdir(self.directory):
+            if filename.endswith(BUCKET_SUFFIX):
+                self.delete(filename[:-len(BUCKET_SUFFIX)])
+
+        path = os.path.join(self.directory, SETTINGS_FILE)
+        with open(f"{path}.{os.getpid()}.tmp", 'w') as f:
+            json.dump(settings, f)
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+    def _read_settings(self):
+        """Return the stored settings, or None if there are none."""
+        try:
+            with open(os.path.join(self.directory, SETTINGS_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,159 @@
+"""
+Text normalization helpers shared by topic extraction, technology matching
+and document search.
+"""
+import html
+import re
+import threading
+from collections import OrderedDict
+
+# Characters stripped from both ends of each word
+PUNCTUATION = '.,!?()[]{}:;"\''
+
+# Separators inside tokens that also split words (e.g. 'machine-learning' tags)
+PART_SEPARATORS = re.compile(r'[-/_]+')
+
+def normalize(text):
+    """
+    Decode HTML entities (as in Stack Overflow titles) and lowercase a text.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Normalized text
+    """
+    return html.unescape(text).lower() if '&' in text else text.lower()
+
+def _strip_word(word):
+    """
+    Strip surrounding punctuation from a word, keeping a single leading dot
+    that starts a name (so '.NET' stays '.net' rather than the word 'net').
+    """
+    token = word.strip(PUNCTUATION)
+    if token and word[0] in PUNCTUATION and token[0].isalnum():
+        lead = word[:len(word) - len(word.lstrip(PUNCTUATION))]
+        if lead.endswith('.') and not lead.endswith('..'):
+            return '.' + token
+    return token
+
+def tokenize(text):
+    """
+    Split a text into lowercased words stripped of surrounding punctuation.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: Non-empty tokens in order
+    """
+    tokens = [_strip_word(word) for word in text.lower().split()]
+    return [token for token in tokens if token]
+
+def split_parts(tokens):
+    """
+    Split tokens further on dashes, slashes and underscores.
+
+    Args:
+        tokens (iterable): Tokens
+
+    Returns:
+        list: Non-empty parts in order
+    """
+    parts = []
+    for token in tokens:
+        if PART_SEPARATORS.search(token):
+            parts.extend(part for part in PART_SEPARATORS.split(token) if part)
+        else:
+            parts.append(token)
+    return parts
+
+class Document:
+    """
+    A text normalized and tokenized once for every analysis that reads it.
+
+    Attributes:
+        raw (str): Original text
+        text (str): Text with HTML entities decoded, lowercased
+        tokens (tuple): Words of ``text`` stripped of surrounding punctuation
+        parts (tuple): ``tokens`` split further on dashes, slashes and underscores
+    """
+
+    __slots__ = ('raw', 'text', 'tokens', 'parts')
+
+    def __init__(self, raw):
+        self.raw = raw or ''
+        self.text = normalize(self.raw)
+        self.tokens = tuple(tokenize(self.text))
+        self.parts = tuple(split_parts(self.tokens))
+
+    def __repr__(self):
+        return f"Document({self.raw!r})"
+
+def as_document(text):
+    """
+    Return a Document for a text, or the argument itself if it already is one.
+
+    Args:
+        text (str or Document): Text to process
+
+    Returns:
+        Document: Processed text (not cached)
+    """
+    return text if isinstance(text, Document) else Document(text)
+
+class TextPipeline:
+    """
+    Cache of processed documents keyed by document ID.
+
+    The same titles reach several stages (topic extraction, attribution,
+    technology matching); the pipeline processes each of them once. An ID is
+    reprocessed if its text changes, and the least recently used documents
+    are evicted beyond ``max_documents``.
+    """
+
+    def __init__(self, max_documents=50000):
+        """
+        Args:
+            max_documents (int): Maximum number of cached documents
+        """
+        self.max_documents = max_documents
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def document(self, doc_id, text):
+        """
+        Return the processed document for an ID, processing it on first use.
+
+        Args:
+            doc_id: Hashable identifier, e.g. ('hackernews', story id, 'title')
+            text (str): Raw text of the document
+
+        Returns:
+            Document: Processed text
+        """
+        text = text or ''
+        with self._lock:
+            document = self._documents.get(doc_id)
+            if document is not None and document.raw == text:
+                self._documents.move_to_end(doc_id)
+                return document
+
+        document = Document(text)
+        with self._lock:
+            self._documents[doc_id] = document
+            self._documents.move_to_end(doc_id)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+        return document
+
+    def clear(self):
+        """Forget all cached documents."""
+        with self._lock:
+            self._documents.clear()
+
+    def __len__(self):
+        return len(self._documents)
+
+# Create a singleton instance
+text_pipeline = TextPipeline()